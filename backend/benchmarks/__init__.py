@@ -0,0 +1,17 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+
+def private_evaluation_ring() -> None:
+    """
+    Point the shared evaluation ring at a temporary file for this process.
+
+    Benchmarks score thousands of synthetic flights; on a deployed host the
+    default ring is the one ``/history`` and the stats serve. The ring opens
+    on first use, so calling this at import time is early enough.
+    """
+    directory = tempfile.mkdtemp(prefix="clearsky-bench-")
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    os.environ["EVALUATION_RING_PATH"] = os.path.join(directory, "evaluations.ring")
@@ -0,0 +1,69 @@
+"""
+Scaling of sortie catalog ingestion with the number of worker processes.
+
+Writes a directory of synthetic sortie CSVs, then ingests it from scratch
+(CSV parse, Arrow sidecar, metadata) with 1, 2, 4, … workers up to the core
+count. Ingestion of independent files should scale close to linearly until
+the disk saturates. Run from the backend directory::
+
+    uv run python -m benchmarks.bench_catalog_ingest [files] [rows_per_file]
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from backend.services.telemetry_catalog import SortieCatalog
+from backend.testing import make_sortie_frame
+
+_FILES = 200
+_ROWS = 20_000
+
+
+def _worker_counts() -> list[int]:
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def main() -> None:
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else _FILES
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else _ROWS
+    root = Path(tempfile.mkdtemp(prefix="sortie-catalog-bench-"))
+    try:
+        frame = make_sortie_frame(rows)
+        for index in range(files):
+            airframe = root / f"F16-{index % 10:04d}"
+            airframe.mkdir(exist_ok=True)
+            frame.write_csv(airframe / f"2024-05-{index % 28 + 1:02d}_{index}.csv")
+        print(f"{files} files x {rows} rows, {os.cpu_count()} cores")
+
+        baseline = None
+        for workers in _worker_counts():
+            shutil.rmtree(root / ".telemetry-cache", ignore_errors=True)
+            for cache in root.glob("*/.telemetry-cache"):
+                shutil.rmtree(cache)
+            start = time.perf_counter()
+            sorties = SortieCatalog(root).refresh(workers=workers)
+            elapsed = time.perf_counter() - start
+            assert len(sorties) == files
+            baseline = baseline or elapsed
+            print(
+                f"{workers:3d} workers  {elapsed:7.2f} s  "
+                f"{baseline / elapsed:5.2f}x speedup"
+            )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Per-call time and allocations of ``compute_risk`` vs. the ``assess_risk`` fast path.
+
+"Pydantic path" is how every evaluation used to be scored and recorded: a
+``RiskResult`` (with its factor list) is built for each call and handed to the
+history sinks. "Fast path" scores into an interned ``RiskAssessment`` and only
+converts to Pydantic at the API boundary, shown separately. Every route needs
+that conversion (``compute_risk`` is "fast path + to_result"), so on request
+paths the two cost about the same; only the bare fast path is cheaper. Run
+from the backend directory::
+
+    uv run python -m benchmarks.bench_fast_path
+"""
+
+from __future__ import annotations
+
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from backend.schemas import FlightContext, RiskResult
+from backend.services import assess_risk
+from backend.services.risk_engine import add_recent_evaluation, tier_for_score
+from backend.services.risk_rules import get_active_ruleset
+from backend.testing import base_context, random_contexts
+from benchmarks import private_evaluation_ring
+
+private_evaluation_ring()
+
+_CONTEXTS = 5_000
+_REPEATS = 5
+
+
+def _pydantic_path(context: FlightContext) -> RiskResult:
+    rules = get_active_ruleset()
+    score, fired = rules.evaluate(context)
+    score = max(0, min(100, score))
+    risk = RiskResult(
+        score=score,
+        tier=tier_for_score(score),
+        factors=list(rules.factors_for(fired)),
+        ruleset_version=rules.version,
+    )
+    add_recent_evaluation(datetime.now(UTC), context, risk)
+    return risk
+
+
+def _per_call_us(func: Callable[[FlightContext], object], contexts) -> float:
+    timer = timeit.Timer(lambda: [func(context) for context in contexts])
+    return min(timer.repeat(repeat=_REPEATS, number=1)) / len(contexts) * 1e6
+
+
+def _allocations(func: Callable[[FlightContext], object], contexts) -> tuple:
+    """Blocks still held per call (results kept alive) and mean peak bytes per call."""
+    func(contexts[0])
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_size, _ = tracemalloc.get_traced_memory()
+        peak = 0
+        results = []
+        for context in contexts:
+            results.append(func(context))
+            peak += tracemalloc.get_traced_memory()[1] - start_size
+            tracemalloc.reset_peak()
+            start_size = tracemalloc.get_traced_memory()[0]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return blocks / len(contexts), peak / len(contexts)
+
+
+def main() -> None:
+    contexts = random_contexts(base_context(), _CONTEXTS)
+
+    paths: list[tuple[str, Callable[[FlightContext], object]]] = [
+        ("pydantic path", _pydantic_path),
+        ("fast path", assess_risk),
+        ("fast path + to_result", lambda context: assess_risk(context).to_result()),
+    ]
+    baseline = None
+    for name, func in paths:
+        per_call = _per_call_us(func, contexts)
+        blocks, peak = _allocations(func, contexts[:1_000])
+        baseline = baseline or per_call
+        print(
+            f"{name:22s} {per_call:7.2f} µs/call ({baseline / per_call:.2f}x)"
+            f"  {blocks:5.1f} blocks held/call  {peak:6.0f} B peak/call"
+        )
+
+
+if __name__ == "__main__":
+    main()
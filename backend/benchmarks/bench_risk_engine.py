@@ -0,0 +1,96 @@
+"""
+Micro-benchmark for the deterministic risk engine.
+
+Compares the compiled rule table behind ``compute_risk`` with the hand-written
+rules it replaced, plus the columnar ``compute_risk_batch`` and ``sweep_risk``
+paths. Run from the
+backend directory::
+
+    uv run python -m benchmarks.bench_risk_engine
+"""
+
+from __future__ import annotations
+
+import timeit
+from datetime import UTC, datetime
+
+from backend.schemas import FlightContext, RiskResult, SweepRequest
+from backend.services import compute_risk, compute_risk_batch, sweep_risk
+from backend.services.risk_engine import add_recent_evaluation, tier_for_score
+from backend.testing import base_context, legacy_compute_risk, random_contexts
+from benchmarks import private_evaluation_ring
+
+private_evaluation_ring()
+
+_CONTEXTS = 5_000
+_REPEATS = 5
+
+
+def _legacy(context: FlightContext) -> RiskResult:
+    score, factors = legacy_compute_risk(context)
+    risk = RiskResult(
+        score=score,
+        tier=tier_for_score(score),
+        factors=factors,
+        ruleset_version="legacy",
+    )
+    add_recent_evaluation(datetime.now(UTC), context, risk)
+    return risk
+
+
+def _per_call_us(func, contexts: list[FlightContext]) -> float:
+    timer = timeit.Timer(lambda: [func(context) for context in contexts])
+    best = min(timer.repeat(repeat=_REPEATS, number=1))
+    return best / len(contexts) * 1e6
+
+
+def main() -> None:
+    contexts = random_contexts(base_context(), _CONTEXTS)
+
+    legacy = _per_call_us(_legacy, contexts)
+    compiled = _per_call_us(compute_risk, contexts)
+    batch_timer = timeit.Timer(lambda: compute_risk_batch(contexts))
+    batch = min(batch_timer.repeat(repeat=_REPEATS, number=1)) / _CONTEXTS * 1e6
+
+    print(f"hand-written rules   {legacy:8.2f} µs/call")
+    print(f"compiled rule table  {compiled:8.2f} µs/call ({legacy / compiled:.2f}x)")
+    print(f"columnar batch       {batch:8.2f} µs/leg  ({legacy / batch:.2f}x)")
+
+    sweep = SweepRequest.model_validate(
+        {
+            "base": contexts[0],
+            "axes": [
+                {
+                    "values": {
+                        "max_crosswind_knots": {"start": 0, "stop": 39, "step": 1}
+                    }
+                },
+                {
+                    "values": {
+                        "departure_visibility_sm": {
+                            "start": 0,
+                            "stop": 9.9,
+                            "step": 0.2,
+                        }
+                    }
+                },
+                {
+                    "values": {
+                        "planned_takeoff_weight_kg": {
+                            "start": 800,
+                            "stop": 1245,
+                            "step": 9,
+                        }
+                    }
+                },
+            ],
+        }
+    )
+    points = len(sweep_risk(sweep).scores)
+    sweep_timer = timeit.Timer(lambda: sweep_risk(sweep))
+    sweep_ms = min(sweep_timer.repeat(repeat=_REPEATS, number=1)) * 1e3
+    print(f"what-if sweep        {sweep_ms:8.2f} ms for {points} grid points")
+
+
+if __name__ == "__main__":
+    main()
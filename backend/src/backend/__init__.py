@@ -1,15 +1,20 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from piccolo.apps.user.tables import BaseUser
 from piccolo_admin.endpoints import create_admin
 from strawberry.fastapi import GraphQLRouter
 
 from .apps.should_you_fly.rest.routes import router as should_you_fly_router
+from .apps.telemetry.rest.routes import router as telemetry_router
 from .apps.users.rest.routes import router as users_router
 from .db import close_database_connection_pool, open_database_connection_pool
 from .schema import schema
+from .services import EVALUATION_JOBS, HISTORY_WRITER
+from .services.telemetry_catalog import TELEMETRY_CATALOG
+from .services.telemetry_warmup import TELEMETRY_WARMUP
+from .services.you_com_client import YOU_COM_CACHE, YOU_COM_HTTP
 
 
 @asynccontextmanager
@@ -17,7 +22,18 @@ async def lifespan(app: FastAPI):
     await open_database_connection_pool()
     admin = create_admin(tables=[BaseUser])
     app.mount("/admin/", admin)
+    HISTORY_WRITER.start()
+    YOU_COM_HTTP.start()
+    EVALUATION_JOBS.start()
+    TELEMETRY_CATALOG.start()
+    await TELEMETRY_WARMUP.start()
     yield
+    await EVALUATION_JOBS.stop()
+    await TELEMETRY_WARMUP.stop()
+    await TELEMETRY_CATALOG.stop()
+    await YOU_COM_CACHE.stop()
+    await YOU_COM_HTTP.stop()
+    await HISTORY_WRITER.stop()
     await close_database_connection_pool()
 
 
@@ -37,8 +53,23 @@ graphql_app = GraphQLRouter(schema, path="/graphql")
 app.include_router(graphql_app)
 app.include_router(users_router)
 app.include_router(should_you_fly_router)
+app.include_router(telemetry_router)
 
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/ready")
+def readiness_check(response: Response):
+    """
+    503 while the startup telemetry warm-up is still running, so traffic can
+    be held back until the first evaluation no longer pays for the load.
+    """
+
+    telemetry = TELEMETRY_WARMUP.state
+    if telemetry == "warming":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming", "telemetry": telemetry}
+    return {"status": "ready", "telemetry": telemetry}
@@ -0,0 +1,16 @@
+import os
+
+from piccolo.conf.apps import AppConfig
+
+from .tables import EvaluationJobRecord, EvaluationRecord
+
+CURRENT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+APP_CONFIG = AppConfig(
+    app_name="should_you_fly",
+    migrations_folder_path=os.path.join(CURRENT_DIRECTORY, "piccolo_migrations"),
+    table_classes=[EvaluationRecord, EvaluationJobRecord],
+    migration_dependencies=[],
+    commands=[],
+)
@@ -1,32 +1,366 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query, status
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+from uuid import UUID
 
-from backend.schemas import AgentPreference, FlightContext, FlightEvaluation
+from fastapi import APIRouter, Body, HTTPException, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from loguru import logger
+from pydantic import BaseModel
+
+from backend.schemas import (
+    MAX_BATCH_LEGS,
+    MAX_JOB_PRIORITY,
+    MIN_JOB_PRIORITY,
+    AgentExplanation,
+    AgentPreference,
+    BatchFlightEvaluation,
+    EvaluationJob,
+    ExplanationProgress,
+    FlightContext,
+    FlightEvaluation,
+    HistoryPage,
+    HistoryStatsSummary,
+    RiskResult,
+    SweepRequest,
+    SweepResult,
+)
 from backend.services import (
-    RECENT_EVALUATIONS,
+    HISTORY_STATS,
+    InvalidCursorError,
+    JobQueueFullError,
+    RuleSet,
+    cancel_job,
     compute_risk,
+    compute_risk_batch,
+    fetch_history,
+    fetch_history_buckets,
+    fetch_job,
     generate_agent_explanation,
+    get_active_ruleset,
+    recent_history,
+    submit_evaluation_job,
+    sweep_risk,
+    watch_job,
 )
 
 router = APIRouter(prefix="/api/should-you-fly", tags=["should-you-fly"])
 
+# Upper bound on provider calls in flight while explaining a batch.
+_BATCH_EXPLANATION_CONCURRENCY = 8
 
-@router.post("/evaluate", response_model=FlightEvaluation)
+
+@router.post(
+    "/evaluate",
+    response_model=FlightEvaluation,
+    responses={status.HTTP_202_ACCEPTED: {"model": EvaluationJob}},
+)
 async def evaluate_flight(
     context: FlightContext,
     agent_source: AgentPreference = Query(
         "auto",
         description="auto → prefer You.com then Gemini; or force a provider.",
     ),
-) -> FlightEvaluation:
+    background: bool = Query(
+        False,
+        description="Answer 202 with an evaluation job at once and explain later.",
+    ),
+    priority: int = Query(
+        0,
+        ge=MIN_JOB_PRIORITY,
+        le=MAX_JOB_PRIORITY,
+        description="Background jobs of higher priority are explained first.",
+    ),
+) -> FlightEvaluation | JSONResponse:
     """
     Run the deterministic risk engine plus the AI explanation layer.
+
+    With ``background``, the explanation is queued instead: the response is
+    the job (already holding the risk result), to poll at ``/jobs/{id}`` or
+    follow at ``/jobs/{id}/events``.
     """
 
     risk = compute_risk(context)
+    if background:
+        try:
+            job = await submit_evaluation_job(context, risk, agent_source, priority)
+        except JobQueueFullError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(exc),
+            ) from exc
+        return JSONResponse(
+            job.model_dump(mode="json"),
+            status_code=status.HTTP_202_ACCEPTED,
+            headers={"Location": f"{router.prefix}/jobs/{job.id}"},
+        )
+    explanation = await _explain(context, risk, agent_source)
+    return FlightEvaluation(risk=risk, explanation=explanation)
+
+
+@router.post(
+    "/evaluate/stream",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"text/event-stream": {}}}},
+)
+async def evaluate_flight_stream(
+    context: FlightContext,
+    agent_source: AgentPreference = Query(
+        "auto",
+        description="auto → prefer You.com then Gemini; or force a provider.",
+    ),
+) -> StreamingResponse:
+    """
+    ``/evaluate`` as server-sent events, so the score shows up before the AI
+    explanation is done.
+
+    Events: ``risk`` (the ``RiskResult``, sent at once), any number of
+    ``progress`` (``ExplanationProgress``: providers starting or failing, the
+    Gemini agent's text chunks and tool calls), then ``explanation`` (the
+    final ``AgentExplanation``) or ``error`` (``{"detail": ...}``).
+    """
+
+    risk = compute_risk(context)
+    return StreamingResponse(
+        _evaluation_events(context, risk, agent_source),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/evaluate/batch", response_model=list[BatchFlightEvaluation])
+async def evaluate_flight_batch(
+    contexts: list[FlightContext] = Body(max_length=MAX_BATCH_LEGS),
+    explain: bool = Query(
+        False,
+        description="Also generate an AI explanation for every leg.",
+    ),
+    agent_source: AgentPreference = Query(
+        "auto",
+        description="auto → prefer You.com then Gemini; or force a provider.",
+    ),
+) -> list[BatchFlightEvaluation]:
+    """
+    Score a whole dispatch board with the vectorized risk engine.
+
+    Results are returned in request order, for at most ``MAX_BATCH_LEGS``
+    legs. AI explanations are opt-in because they cost one provider call per
+    leg; a leg whose explanation fails reports its ``error`` and the others
+    are still explained.
+    """
+
+    risks = compute_risk_batch(contexts)
+    if not explain:
+        return [BatchFlightEvaluation(risk=risk) for risk in risks]
+
+    semaphore = asyncio.Semaphore(_BATCH_EXPLANATION_CONCURRENCY)
+
+    async def explain_leg(
+        context: FlightContext, risk: RiskResult
+    ) -> BatchFlightEvaluation:
+        try:
+            async with semaphore:
+                explanation = await _explain(context, risk, agent_source)
+        except HTTPException as exc:
+            return BatchFlightEvaluation(risk=risk, error=exc.detail)
+        return BatchFlightEvaluation(risk=risk, explanation=explanation)
+
+    return list(
+        await asyncio.gather(
+            *(
+                explain_leg(context, risk)
+                for context, risk in zip(contexts, risks, strict=True)
+            )
+        )
+    )
+
+
+@router.post("/evaluate/sweep", response_model=SweepResult)
+async def evaluate_flight_sweep(request: SweepRequest) -> SweepResult:
+    """
+    Score a what-if grid around one flight and surface the lowest-risk points.
+
+    Each axis varies one or more ``FlightContext`` fields together (e.g. an
+    hourly forecast or a takeoff-weight range); axes are combined as a
+    cartesian product and scored in a single vectorized pass.
+    """
+
+    return sweep_risk(request)
+
+
+@router.get("/history", response_model=HistoryPage)
+async def get_recent_history(
+    start: datetime | None = Query(None, description="Inclusive lower bound."),
+    end: datetime | None = Query(None, description="Exclusive upper bound."),
+    cursor: str | None = Query(
+        None, description="`next_cursor` of the previous page, to page back."
+    ),
+    limit: int = Query(12, ge=1, le=1000),
+    bucket_seconds: int | None = Query(
+        None,
+        ge=1,
+        description="Downsample into buckets of this width (mean/min/max/count).",
+    ),
+) -> HistoryPage:
+    """
+    Return deterministic scores, most recent page first.
+
+    Points within a page are chronological. The unfiltered first page is
+    served from the ring shared by all workers on the host, so it is the same
+    whichever worker answers and includes the very latest evaluations. Other
+    pages come from the database, which evaluations reach through a
+    write-behind queue, so their newest second or so may lag.
+    """
+
+    if start is None and end is None and cursor is None and bucket_seconds is None:
+        page = await recent_history(limit)
+        if page is not None:
+            return page
+    try:
+        if bucket_seconds is not None:
+            return await fetch_history_buckets(
+                bucket_seconds, start=start, end=end, cursor=cursor, limit=limit
+            )
+        return await fetch_history(start=start, end=end, cursor=cursor, limit=limit)
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+@router.get("/history/stats", response_model=HistoryStatsSummary)
+async def get_history_stats(
+    top_factors: int = Query(10, ge=1, le=32),
+) -> HistoryStatsSummary:
+    """
+    Live score percentiles, hourly tier mix and most frequent risk factors.
+
+    Served from incremental sketches updated on every evaluation, so the cost
+    does not grow with the number of evaluations recorded. The sketches are
+    kept per worker process: with several workers, each answers with the
+    evaluations it scored itself.
+    """
+
+    return HISTORY_STATS.summary(top_factors=top_factors)
+
+
+@router.get("/jobs/{job_id}", response_model=EvaluationJob)
+async def get_evaluation_job(job_id: UUID) -> EvaluationJob:
+    """
+    Return a background evaluation job; its explanation once it is done.
+    """
+
+    return _job_or_404(await fetch_job(job_id))
+
+
+@router.delete("/jobs/{job_id}", response_model=EvaluationJob)
+async def cancel_evaluation_job(job_id: UUID) -> EvaluationJob:
+    """
+    Cancel a queued or running evaluation job. Finished jobs are returned
+    unchanged.
+    """
+
+    return _job_or_404(await cancel_job(job_id))
+
+
+@router.get(
+    "/jobs/{job_id}/events",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {"text/event-stream": {}}}},
+)
+async def follow_evaluation_job(job_id: UUID) -> StreamingResponse:
+    """
+    A background evaluation job as server-sent events: a ``job`` event
+    (``EvaluationJob``) on every change, until it is done, failed or
+    cancelled.
+    """
+
+    _job_or_404(await fetch_job(job_id))
+    return StreamingResponse(
+        (_sse_event("job", job) async for job in watch_job(job_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/rules", response_model=RuleSet)
+async def get_risk_rules() -> RuleSet:
+    """
+    Return the rule table currently used for scoring, including its version.
+    """
+
+    return get_active_ruleset().ruleset
+
+
+async def _evaluation_events(
+    context: FlightContext,
+    risk: RiskResult,
+    agent_source: AgentPreference,
+) -> AsyncIterator[str]:
+    yield _sse_event("risk", risk)
+    updates: asyncio.Queue[ExplanationProgress] = asyncio.Queue()
+    explaining = asyncio.create_task(
+        generate_agent_explanation(
+            context, risk, agent_source, progress=updates.put_nowait
+        )
+    )
+    update: asyncio.Future[ExplanationProgress] | None = None
     try:
-        explanation = await generate_agent_explanation(context, risk, agent_source)
+        while True:
+            update = asyncio.ensure_future(updates.get())
+            await asyncio.wait(
+                {update, explaining}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not update.done():
+                update.cancel()
+                break
+            yield _sse_event("progress", update.result())
+        while not updates.empty():
+            yield _sse_event("progress", updates.get_nowait())
+        explanation = explaining.result()
+    except RuntimeError as exc:
+        yield _sse_event("error", {"detail": str(exc)})
+        return
+    except Exception:
+        logger.exception("Streamed AI explanation failed")
+        yield _sse_event("error", {"detail": "Failed to generate AI explanation."})
+        return
+    finally:
+        # The client went away (or the explanation failed) mid-stream.
+        explaining.cancel()
+        if update is not None:
+            update.cancel()
+    yield _sse_event("explanation", explanation)
+
+
+def _sse_event(event: str, data: BaseModel | dict) -> str:
+    payload = (
+        data.model_dump_json() if isinstance(data, BaseModel) else json.dumps(data)
+    )
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def _job_or_404(job: EvaluationJob | None) -> EvaluationJob:
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Evaluation job not found.",
+        )
+    return job
+
+
+async def _explain(
+    context: FlightContext,
+    risk: RiskResult,
+    agent_source: AgentPreference,
+) -> AgentExplanation:
+    try:
+        return await generate_agent_explanation(context, risk, agent_source)
     except RuntimeError as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -37,17 +371,3 @@ async def evaluate_flight(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate AI explanation.",
         ) from exc
-
-    return FlightEvaluation(risk=risk, explanation=explanation)
-
-
-@router.get("/history")
-async def get_recent_history() -> list[dict[str, str | int]]:
-    """
-    Return the last few deterministic scores (UTC timestamp + score).
-    """
-
-    return [
-        {"timestamp": ts.isoformat(), "score": score}
-        for ts, score in list(RECENT_EVALUATIONS)
-    ]
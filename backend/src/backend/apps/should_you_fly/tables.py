@@ -0,0 +1,39 @@
+from piccolo.columns import JSONB, UUID, SmallInt, Text, Timestamptz, Varchar
+from piccolo.columns.indexes import IndexMethod
+from piccolo.table import Table
+
+
+class EvaluationRecord(Table):
+    """One deterministic risk evaluation, persisted for the history trend."""
+
+    created_at = Timestamptz(index=True, index_method=IndexMethod.btree)
+    score = SmallInt()
+    tier = Varchar(length=8)
+    factors = JSONB()
+    context_hash = Varchar(length=32, index=True)
+    ruleset_version = Varchar(length=64)
+
+
+class EvaluationJobRecord(Table):
+    """
+    An evaluation whose AI explanation is generated in the background; the
+    queue the evaluation job workers claim from.
+    """
+
+    id = UUID(primary_key=True)
+    created_at = Timestamptz()
+    updated_at = Timestamptz()
+    # queued, running, done, failed or cancelled.
+    status = Varchar(length=16, index=True)
+    # Higher first; jobs of equal priority in submission order.
+    priority = SmallInt()
+    agent_source = Varchar(length=16)
+    context = JSONB()
+    risk = JSONB()
+    explanation = JSONB(null=True, default=None)
+    error = Text(null=True, default=None)
+    # Times a worker claimed the job.
+    attempts = SmallInt()
+    worker = Varchar(length=64, null=True, default=None)
+    # A running job whose worker stopped renewing this is claimed again.
+    lease_expires_at = Timestamptz(null=True, default=None)
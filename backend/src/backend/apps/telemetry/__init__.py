@@ -0,0 +1 @@
+# Package marker for the sortie telemetry REST API.
@@ -0,0 +1 @@
+# Rest router package for the sortie telemetry feature.
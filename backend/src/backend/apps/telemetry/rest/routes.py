@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from backend.schemas import FlightContext, SimilarSegments, TelemetryChart
+from backend.services import telemetry_catalog
+from backend.services.telemetry_catalog import SortieInfo, UnknownSortieError
+from backend.services.telemetry_episodes import (
+    DEFAULT_EPISODE_LIMIT,
+    EpisodeQueryResult,
+    ExcursionChannel,
+    InvalidEpisodeQueryError,
+    find_episodes,
+)
+from backend.services.telemetry_export import (
+    EXPORT_MEDIA_TYPES,
+    ExportFormat,
+    InvalidExportRequestError,
+    export_telemetry,
+    telemetry_slice,
+)
+from backend.services.telemetry_pyramid import (
+    DEFAULT_CHART_WIDTH,
+    InvalidChartRequestError,
+    telemetry_chart,
+)
+from backend.services.telemetry_similarity import (
+    DEFAULT_NEIGHBOURS,
+    InvalidSimilarityQueryError,
+    find_similar_segments,
+    flight_conditions,
+)
+from backend.services.telemetry_tools import (
+    TelemetryMemoryReport,
+    telemetry_memory_report,
+)
+
+router = APIRouter(prefix="/api/telemetry", tags=["telemetry"])
+
+
+@router.get("/sorties", response_model=list[SortieInfo])
+def list_sorties() -> list[SortieInfo]:
+    """
+    Every sortie in the telemetry directory, with its airframe, date and size.
+    """
+
+    return telemetry_catalog.TELEMETRY_CATALOG.sorties()
+
+
+@router.get("/memory", response_model=TelemetryMemoryReport)
+def get_memory_report(
+    sortie: str | None = Query(
+        None, description="Sortie id from /sorties; the default data file if unset."
+    ),
+) -> TelemetryMemoryReport:
+    """
+    Bytes per column of one sortie as held in memory, in the configured
+    ``TELEMETRY_LOAD_MODE``.
+    """
+
+    try:
+        return telemetry_memory_report(sortie)
+    except (FileNotFoundError, UnknownSortieError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+
+
+@router.get("/series", response_model=TelemetryChart)
+def get_telemetry_series(
+    channels: list[str] = Query(..., description="Channels to chart, e.g. AOA."),
+    sortie: str | None = Query(
+        None, description="Sortie id from /sorties; the default data file if unset."
+    ),
+    start: float | None = Query(None, description="Inclusive, in `time_basis`."),
+    end: float | None = Query(None, description="Inclusive, in `time_basis`."),
+    width: int = Query(
+        DEFAULT_CHART_WIDTH,
+        ge=1,
+        le=10_000,
+        description="Chart width in pixels; at most this many points per channel.",
+    ),
+) -> TelemetryChart:
+    """
+    Min-max decimated channels of one sortie, ready to plot at ``width``.
+
+    Served from a multi-resolution pyramid built the first time the sortie is
+    charted, so zooming and panning cost a few milliseconds whatever the
+    length of the sortie.
+    """
+
+    try:
+        return telemetry_chart(channels, sortie, start=start, end=end, width=width)
+    except (FileNotFoundError, UnknownSortieError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+    except InvalidChartRequestError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+@router.get("/episodes", response_model=EpisodeQueryResult)
+def get_excursion_episodes(
+    channel: ExcursionChannel = Query(..., description="aoa or sideslip."),
+    threshold: float | None = Query(
+        None, description="Degrees; 12 for AOA and 10 for sideslip if unset."
+    ),
+    sortie: str | None = Query(
+        None, description="Sortie id from /sorties; the default data file if unset."
+    ),
+    start: float | None = Query(None, description="Inclusive, in `time_basis`."),
+    end: float | None = Query(None, description="Inclusive, in `time_basis`."),
+    limit: int = Query(DEFAULT_EPISODE_LIMIT, ge=0, le=10_000),
+) -> EpisodeQueryResult:
+    """
+    Contiguous high-AOA or high-sideslip excursions, with their peak and EVENT
+    code, overlapping ``[start, end]``.
+
+    Answered from an episode index built once per sortie file version.
+    """
+
+    try:
+        return find_episodes(
+            channel, threshold, start, end, sorties=sortie, limit=limit
+        )
+    except (FileNotFoundError, UnknownSortieError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+    except InvalidEpisodeQueryError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+@router.post("/similar", response_model=SimilarSegments)
+def find_similar_telemetry(
+    context: FlightContext,
+    k: int = Query(DEFAULT_NEIGHBOURS, ge=1, le=100),
+    sortie: str | None = Query(
+        None,
+        description="Sortie id, or * for the whole catalog; the default data "
+        "file if unset.",
+    ),
+) -> SimilarSegments:
+    """
+    The ``k`` historical telemetry windows flown in the conditions closest to
+    a planned flight's crosswind, gusts and temperature.
+    """
+
+    try:
+        return find_similar_segments(flight_conditions(context), k, sorties=sortie)
+    except (FileNotFoundError, UnknownSortieError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+    except InvalidSimilarityQueryError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}
+        }
+    },
+)
+def export_telemetry_slice(
+    columns: list[str] | None = Query(None, description="Columns; all if unset."),
+    sortie: str | None = Query(
+        None, description="Sortie id from /sorties; the default data file if unset."
+    ),
+    start_row: int = Query(0, ge=0, description="First row, inclusive."),
+    end_row: int | None = Query(None, ge=0, description="Last row, exclusive."),
+    format: ExportFormat = Query("arrow", description="arrow (IPC stream) or ndjson."),
+) -> StreamingResponse:
+    """
+    Stream raw telemetry rows as Arrow IPC record batches, or as NDJSON.
+
+    Batches are written straight from the loaded (usually memory-mapped)
+    frame, so the export runs in constant memory however many rows it spans.
+    """
+
+    try:
+        frame = telemetry_slice(columns, sortie, start_row=start_row, end_row=end_row)
+    except (FileNotFoundError, UnknownSortieError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+    except InvalidExportRequestError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+    return StreamingResponse(
+        export_telemetry(frame, format), media_type=EXPORT_MEDIA_TYPES[format]
+    )
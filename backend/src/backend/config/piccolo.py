@@ -13,4 +13,9 @@ DB = PostgresEngine(
     }
 )
 
-APP_REGISTRY = AppRegistry(apps=["piccolo_admin.piccolo_app"])
+APP_REGISTRY = AppRegistry(
+    apps=[
+        "piccolo_admin.piccolo_app",
+        "backend.apps.should_you_fly.piccolo_app",
+    ]
+)
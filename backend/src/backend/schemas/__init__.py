@@ -1,8 +1,42 @@
 from .flight import (
+    MAX_BATCH_LEGS,
     AgentExplanation,
     AgentPreference,
+    BatchFlightEvaluation,
+    ExplanationCacheStatus,
+    ExplanationProgress,
+    ExplanationSource,
     FlightContext,
     FlightEvaluation,
+    ProviderAttempt,
     RiskFactor,
     RiskResult,
 )
+from .history import (
+    FactorFrequency,
+    HistoryPage,
+    HistoryPoint,
+    HistoryStatsSummary,
+    TierMixPoint,
+)
+from .jobs import (
+    MAX_JOB_PRIORITY,
+    MIN_JOB_PRIORITY,
+    EvaluationJob,
+    EvaluationJobStatus,
+)
+from .sweep import (
+    MAX_SWEEP_POINTS,
+    SweepAxis,
+    SweepPoint,
+    SweepRange,
+    SweepRequest,
+    SweepResult,
+)
+from .telemetry import (
+    ChannelSeries,
+    SimilarSegment,
+    SimilarSegments,
+    TelemetryChart,
+    TelemetryConditions,
+)
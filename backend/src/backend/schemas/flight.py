@@ -50,7 +50,9 @@ class FlightContext(BaseModel):
 
 
 class RiskFactor(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    # Frozen: the risk engine shares one instance between every result with
+    # the same fired rules.
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     label: str
     impact: int
@@ -62,12 +64,31 @@ class RiskResult(BaseModel):
     score: int
     tier: Literal["GO", "CAUTION", "NO-GO"]
     factors: list[RiskFactor]
+    ruleset_version: str
 
 
 ExplanationSource = Literal["You.com", "Gemini"]
 
 
 AgentPreference = Literal["auto", "you_com", "gemini"]
+# miss: generated for this request; hit: an earlier request's explanation;
+# shared: generated by a concurrent identical request this one waited for.
+ExplanationCacheStatus = Literal["miss", "hit", "shared"]
+
+
+class ProviderAttempt(BaseModel):
+    """
+    One provider call made for an explanation: the winner, a failure, or a
+    call cancelled because another provider answered first.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    provider: ExplanationSource
+    outcome: Literal["won", "failed", "cancelled"]
+    # From the start of the call until it answered, failed or was cancelled.
+    duration_ms: float
+    error: str | None = None
 
 
 class AgentExplanation(BaseModel):
@@ -77,6 +98,39 @@ class AgentExplanation(BaseModel):
     recommendations: list[str]
     telemetry_findings: list[str] | None = None
     source: ExplanationSource = "Gemini"
+    # Provider calls made by the agent router, in start order.
+    attempts: list[ProviderAttempt] | None = None
+    # How the agent router's explanation cache answered the request.
+    cache: ExplanationCacheStatus | None = None
+
+
+class ExplanationProgress(BaseModel):
+    """
+    Progress of an explanation being generated, streamed by the
+    ``/evaluate/stream`` endpoint before the final explanation.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    # provider_started/provider_failed: the agent router started a provider or
+    # saw it fail; text: a chunk of the model's text; tool_call/tool_result:
+    # the Gemini agent called a telemetry tool or got its answer; cached/shared:
+    # the explanation comes from the cache or from a concurrent request's run,
+    # so no other progress follows.
+    kind: Literal[
+        "provider_started",
+        "provider_failed",
+        "text",
+        "tool_call",
+        "tool_result",
+        "cached",
+        "shared",
+    ]
+    # None for cached and shared explanations.
+    provider: ExplanationSource | None = None
+    # The text chunk, or the error of a failed provider.
+    text: str | None = None
+    tool: str | None = None
 
 
 class FlightEvaluation(BaseModel):
@@ -84,3 +138,16 @@ class FlightEvaluation(BaseModel):
 
     risk: RiskResult
     explanation: AgentExplanation
+
+
+# Most legs one /evaluate/batch request may score.
+MAX_BATCH_LEGS = 500
+
+
+class BatchFlightEvaluation(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    risk: RiskResult
+    explanation: AgentExplanation | None = None
+    # Why this leg's explanation failed; the other legs are still explained.
+    error: str | None = None
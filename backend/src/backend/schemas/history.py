@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class HistoryPoint(BaseModel):
+    """
+    One point of the risk trend.
+
+    Raw evaluations carry their ``tier``; downsampled buckets report the mean
+    ``score`` of the bucket together with ``min_score``, ``max_score`` and
+    ``count``.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    timestamp: datetime
+    score: float
+    tier: Literal["GO", "CAUTION", "NO-GO"] | None = None
+    min_score: int | None = None
+    max_score: int | None = None
+    count: int | None = None
+
+
+class HistoryPage(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    points: list[HistoryPoint]
+    next_cursor: str | None = None
+
+
+class TierMixPoint(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    hour: datetime
+    counts: dict[str, int]
+
+
+class FactorFrequency(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    label: str
+    count: int
+    # Upper bound on how much ``count`` may over-estimate the true frequency.
+    max_overcount: int
+
+
+class HistoryStatsSummary(BaseModel):
+    """
+    Live distribution of the evaluations the answering worker process scored
+    since it started.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    count: int
+    mean_score: float | None
+    percentiles: dict[str, int]
+    tier_mix_by_hour: list[TierMixPoint]
+    top_factors: list[FactorFrequency]
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from .flight import AgentExplanation, AgentPreference, RiskResult
+
+EvaluationJobStatus = Literal["queued", "running", "done", "failed", "cancelled"]
+# Highest priority first; jobs of equal priority in submission order.
+MIN_JOB_PRIORITY = -10
+MAX_JOB_PRIORITY = 10
+
+
+class EvaluationJob(BaseModel):
+    """
+    An evaluation whose AI explanation is generated in the background.
+
+    The deterministic ``risk`` is there from the start; ``explanation`` once
+    the job is done, ``error`` if it failed.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    id: UUID
+    status: EvaluationJobStatus
+    priority: int
+    agent_source: AgentPreference
+    created_at: datetime
+    updated_at: datetime
+    risk: RiskResult
+    explanation: AgentExplanation | None = None
+    error: str | None = None
+    # Times a worker started on the job; above 1 after a worker went away.
+    attempts: int = 0
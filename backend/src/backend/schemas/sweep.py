@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
+
+from .flight import FlightContext, RiskResult
+
+# Largest grid a single sweep may score.
+MAX_SWEEP_POINTS = 1_000_000
+
+SweepField = Literal[
+    "departure_time_utc",
+    "pilot_total_hours",
+    "pilot_hours_last_90_days",
+    "pilot_instrument_rating",
+    "pilot_night_current",
+    "aircraft_mtow_kg",
+    "planned_takeoff_weight_kg",
+    "conditions_ifr_expected",
+    "conditions_night",
+    "terrain_mountainous",
+    "departure_visibility_sm",
+    "destination_visibility_sm",
+    "departure_ceiling_ft",
+    "destination_ceiling_ft",
+    "max_crosswind_knots",
+    "gusts_knots",
+    "icing_risk_0_1",
+    "turbulence_risk_0_1",
+]
+
+SweepValue = datetime | bool | int | float
+
+
+class SweepRange(BaseModel):
+    """Evenly spaced values from ``start`` to ``stop`` (inclusive)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    start: float = Field(allow_inf_nan=False)
+    stop: float = Field(allow_inf_nan=False)
+    step: float = Field(gt=0, allow_inf_nan=False)
+
+    @model_validator(mode="after")
+    def _validate_points(self) -> SweepRange:
+        # Counted, not expanded: a huge range must not be built to be refused.
+        if not (self.stop - self.start) / self.step < MAX_SWEEP_POINTS:
+            raise ValueError(f"Sweep grids are limited to {MAX_SWEEP_POINTS} points.")
+        return self
+
+    def __len__(self) -> int:
+        return max(math.floor((self.stop - self.start) / self.step + 1e-9) + 1, 0)
+
+    def expand(self) -> list[float]:
+        return [self.start + index * self.step for index in range(len(self))]
+
+
+class SweepAxis(BaseModel):
+    """
+    One dimension of the what-if grid.
+
+    Every field listed in ``values`` varies together along the axis, so an
+    hourly forecast is a single axis carrying visibility, ceiling and crosswind
+    side by side. Separate axes are combined as a cartesian product.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str | None = None
+    values: dict[SweepField, list[Any] | SweepRange] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def _validate_lengths(self) -> SweepAxis:
+        lengths = {len(values) for values in self.values.values()}
+        if len(lengths) != 1:
+            raise ValueError("All fields of a sweep axis need the same length.")
+        if 0 in lengths:
+            raise ValueError("Sweep axes need at least one value.")
+        return self
+
+    def expand(self) -> None:
+        """
+        Replace ranges with their values and type every value like its
+        ``FlightContext`` field.
+        """
+
+        expanded: dict[SweepField, list[Any] | SweepRange] = {}
+        for field, values in self.values.items():
+            if isinstance(values, SweepRange):
+                values = values.expand()
+            annotation = FlightContext.model_fields[field].annotation
+            expanded[field] = TypeAdapter(list[annotation]).validate_python(values)
+        self.values = expanded
+
+    @property
+    def label(self) -> str:
+        return self.name or "+".join(self.values)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.values.values())))
+
+
+class SweepRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    base: FlightContext
+    axes: list[SweepAxis] = Field(min_length=1, max_length=6)
+    top_k: int = Field(10, ge=1, le=100)
+
+    @model_validator(mode="after")
+    def _validate_grid(self) -> SweepRequest:
+        fields = [field for axis in self.axes for field in axis.values]
+        if len(fields) != len(set(fields)):
+            raise ValueError("A field may appear in only one sweep axis.")
+        # Checked before any range is expanded.
+        if math.prod(len(axis) for axis in self.axes) > MAX_SWEEP_POINTS:
+            raise ValueError(f"Sweep grids are limited to {MAX_SWEEP_POINTS} points.")
+        for axis in self.axes:
+            axis.expand()
+        return self
+
+
+class SweepPoint(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    index: int
+    coordinates: list[int]
+    values: dict[str, SweepValue]
+    risk: RiskResult
+
+
+class SweepResult(BaseModel):
+    """
+    Score surface of a sweep.
+
+    ``scores`` and ``tiers`` are flattened in row-major order over ``shape``
+    (the last axis varies fastest).
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    axes: list[str]
+    shape: list[int]
+    scores: list[int]
+    tiers: list[Literal["GO", "CAUTION", "NO-GO"]]
+    best: list[SweepPoint]
+    ruleset_version: str
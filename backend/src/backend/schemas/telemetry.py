@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ChannelSeries(BaseModel):
+    """
+    One channel of a chart, aligned with ``TelemetryChart.time``.
+
+    Every point covers one pixel column: the extremes of the samples in it
+    (draw them as a band or a vertical line to keep every spike visible) and
+    their mean. Points built from raw samples have ``min == max == mean``.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    min: list[float | None]
+    max: list[float | None]
+    mean: list[float | None]
+
+
+class TelemetryChart(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    sortie: str
+    # Unit of ``time``, ``start`` and ``end``: the time column's name, or "row".
+    time_basis: str
+    start: float
+    end: float
+    # Raw samples per pyramid bucket the points were built from; 1 means the
+    # points are (or were binned from) raw samples.
+    bucket_rows: int
+    time: list[float]
+    channels: dict[str, ChannelSeries]
+
+
+class TelemetryConditions(BaseModel):
+    """
+    Conditions to look up in historical telemetry. Unset fields are ignored
+    when comparing, so a query can match on just the conditions it knows.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    airspeed_kt: float | None = None
+    altitude_ft: float | None = None
+    # Mean |sideslip|, the telemetry's proxy for crosswind.
+    abs_aoss_deg: float | None = None
+    # Standard deviation of sideslip, a proxy for gusts and turbulence.
+    aoss_std_deg: float | None = None
+    temperature_c: float | None = None
+    # Total fuel flow of both engines.
+    fuel_flow: float | None = None
+
+
+class SimilarSegment(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    sortie: str
+    start: float
+    end: float
+    # Distance to the query over the compared conditions, in standard
+    # deviations of each condition across the indexed windows.
+    distance: float
+    ground_fraction: float
+    conditions: TelemetryConditions
+
+
+class SimilarSegments(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    # Unit of ``start`` and ``end``: the time column's name, or "row".
+    time_basis: str
+    query: TelemetryConditions
+    segments: list[SimilarSegment]
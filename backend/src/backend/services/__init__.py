@@ -1,8 +1,33 @@
 # Re-export key helpers for convenience.
 from .ai_agent import generate_agent_explanation  # noqa: F401
+from .evaluation_jobs import (
+    EVALUATION_JOBS,  # noqa: F401
+    JobQueueFullError,  # noqa: F401
+    cancel_job,  # noqa: F401
+    fetch_job,  # noqa: F401
+    submit_evaluation_job,  # noqa: F401
+    watch_job,  # noqa: F401
+)
+from .history_stats import HISTORY_STATS, HistoryStats  # noqa: F401
+from .history_store import (
+    HISTORY_WRITER,  # noqa: F401
+    InvalidCursorError,  # noqa: F401
+    fetch_history,  # noqa: F401
+    fetch_history_buckets,  # noqa: F401
+    recent_history,  # noqa: F401
+)
 from .risk_engine import (
     RECENT_EVALUATIONS,  # noqa: F401
+    RiskAssessment,  # noqa: F401
     add_recent_evaluation,  # noqa: F401
+    assess_risk,  # noqa: F401
     compute_risk,  # noqa: F401
+    compute_risk_batch,  # noqa: F401
+)
+from .risk_rules import (
+    RuleSet,  # noqa: F401
+    activate_ruleset,  # noqa: F401
+    get_active_ruleset,  # noqa: F401
 )
-
+from .risk_sweep import sweep_risk  # noqa: F401
+from .shared_history import SharedRingBuffer  # noqa: F401
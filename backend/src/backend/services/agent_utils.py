@@ -39,9 +39,11 @@ def try_parse_agent_output(value: Any) -> AgentExplanation | None:
 
 
 def coerce_agent_result(result: Any) -> AgentExplanation:
-    parsed = try_parse_agent_output(getattr(result, "data", None))
-    if parsed:
-        return parsed
+    # ``output`` on pydantic-ai 1.x run results, ``data`` on earlier versions.
+    for attribute in ("output", "data"):
+        parsed = try_parse_agent_output(getattr(result, attribute, None))
+        if parsed:
+            return parsed
 
     raw_text = getattr(result, "text", None)
     if raw_text is None:
@@ -1,15 +1,54 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
 import os
+import time
+from collections.abc import AsyncIterable, Callable
+from functools import partial
 from textwrap import dedent
-from typing import Any
+from typing import Any, Literal
 
-from pydantic_ai import Agent, RunContext
+from loguru import logger
+from pydantic_ai import Agent, ModelRetry, RunContext
+from pydantic_ai.messages import (
+    AgentStreamEvent,
+    FunctionToolCallEvent,
+    FunctionToolResultEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+)
 from pydantic_ai.models.google import GoogleModel
 
-from backend.schemas import AgentExplanation, AgentPreference, FlightContext, RiskResult
+from backend.schemas import (
+    AgentExplanation,
+    AgentPreference,
+    ExplanationCacheStatus,
+    ExplanationProgress,
+    ExplanationSource,
+    FlightContext,
+    ProviderAttempt,
+    RiskResult,
+    SimilarSegments,
+)
 from backend.services.agent_utils import coerce_agent_result
+from backend.services.explanation_cache import (
+    EXPLANATION_CACHE,
+    explanation_fingerprint,
+)
+from backend.services.query_normalization import flight_summary
+from backend.services.telemetry_episodes import (
+    EpisodeQueryResult,
+    ExcursionChannel,
+    InvalidEpisodeQueryError,
+    find_episodes,
+)
+from backend.services.telemetry_similarity import (
+    find_similar_segments,
+    flight_conditions,
+)
 from backend.services.telemetry_tools import (
     PerformanceSummary,
     WeatherEnvSummary,
@@ -26,6 +65,15 @@ _AGENT_INIT_SIGNATURE = inspect.signature(Agent)
 _AGENT_RUN_SIGNATURE = inspect.signature(Agent.run)
 _SUPPORTS_RESULT_TYPE_AT_INIT = "result_type" in _AGENT_INIT_SIGNATURE.parameters
 _SUPPORTS_RESULT_TYPE_AT_RUN = "result_type" in _AGENT_RUN_SIGNATURE.parameters
+_SUPPORTS_EVENT_STREAM = "event_stream_handler" in _AGENT_RUN_SIGNATURE.parameters
+_DEFAULT_HEDGE_DELAY_S = 2.0
+# Provider of each preference, and the key enabling it.
+_PROVIDERS: dict[str, tuple[ExplanationSource, str]] = {
+    "you_com": ("You.com", "YOU_COM_API_KEY"),
+    "gemini": ("Gemini", "GOOGLE_API_KEY"),
+}
+
+ProgressCallback = Callable[[ExplanationProgress], None]
 
 _agent_kwargs: dict[str, Any] = {}
 if _SUPPORTS_RESULT_TYPE_AT_INIT:
@@ -56,73 +104,236 @@ agent = Agent(
         3. Optional short telemetry findings if the tools reveal interesting signals.
         """
     ).strip(),
+    deps_type=FlightContext,
     **_agent_kwargs,
 )
 
 
 @agent.tool
-def tool_analyze_weather_env(_: RunContext[None]) -> WeatherEnvSummary:
+def tool_analyze_weather_env(_: RunContext[FlightContext]) -> WeatherEnvSummary:
     return analyze_weather_env()
 
 
 @agent.tool
-def tool_analyze_weight_fuel(_: RunContext[None]) -> WeightFuelSummary:
+def tool_analyze_weight_fuel(_: RunContext[FlightContext]) -> WeightFuelSummary:
     return analyze_weight_fuel()
 
 
 @agent.tool
-def tool_analyze_wow(_: RunContext[None]) -> WowSummary:
+def tool_analyze_wow(_: RunContext[FlightContext]) -> WowSummary:
     return analyze_wow()
 
 
 @agent.tool
-def tool_analyze_performance(_: RunContext[None]) -> PerformanceSummary:
+def tool_analyze_performance(_: RunContext[FlightContext]) -> PerformanceSummary:
     return analyze_performance()
 
 
+@agent.tool
+def tool_find_excursions(
+    _: RunContext[FlightContext],
+    channel: ExcursionChannel,
+    threshold_deg: float | None = None,
+    start: float | None = None,
+    end: float | None = None,
+) -> EpisodeQueryResult:
+    """
+    List distinct high-AOA or high-sideslip excursion episodes.
+
+    Args:
+        channel: "aoa" or "sideslip" (absolute AOSS).
+        threshold_deg: Episode threshold in degrees; defaults to 12 (AOA) or
+            10 (sideslip).
+        start: Only episodes ending at or after this time.
+        end: Only episodes starting at or before this time.
+    """
+
+    try:
+        return find_episodes(channel, threshold_deg, start, end, limit=20)
+    except InvalidEpisodeQueryError as exc:
+        raise ModelRetry(str(exc)) from exc
+
+
+@agent.tool
+def tool_find_similar_segments(
+    ctx: RunContext[FlightContext], k: int = 5
+) -> SimilarSegments:
+    """
+    Find the historical telemetry segments flown in the conditions closest to
+    this flight's crosswind, gusts and temperature.
+
+    Args:
+        k: Number of segments to return, at most 20.
+    """
+
+    return find_similar_segments(flight_conditions(ctx.deps), k=min(max(k, 1), 20))
+
+
 async def generate_agent_explanation(
     context: FlightContext,
     risk: RiskResult,
     preference: AgentPreference = "auto",
+    progress: ProgressCallback | None = None,
 ) -> AgentExplanation:
     """
     Execute the configured agent using the structured flight context / risk record.
+
+    In ``auto`` mode the providers race: You.com starts first, Gemini joins
+    after ``hedge_delay_s`` (or as soon as You.com fails), the first
+    explanation wins and the other call is cancelled. ``attempts`` on the
+    result reports every call made and how long it took.
+
+    Near-identical evaluations share explanations through
+    ``EXPLANATION_CACHE``; ``cache`` on the result says whether this one was
+    generated, cached or shared with a concurrent request.
+
+    ``progress``, if given, is called with every provider started or failed
+    and with the Gemini agent's text and tool calls as they stream in; an
+    explanation taken from the cache or from a concurrent request's run
+    reports a single ``cached`` or ``shared`` update instead.
+    """
+
+    if preference != "auto":
+        provider, key = _PROVIDERS[preference]
+        if not os.getenv(key):
+            raise RuntimeError(f"{key} is not set.")
+        providers, delay_s = [provider], 0.0
+    else:
+        providers = [
+            provider for provider, key in _PROVIDERS.values() if os.getenv(key)
+        ]
+        if not providers:
+            raise RuntimeError(
+                "Set YOU_COM_API_KEY or GOOGLE_API_KEY to enable AI explanations."
+            )
+        delay_s = hedge_delay_s()
+    return await EXPLANATION_CACHE.get(
+        explanation_fingerprint(context, risk, providers),
+        lambda: _hedged(providers, context, risk, delay_s, progress),
+        None if progress is None else partial(_reused, progress),
+    )
+
+
+def _reused(progress: ProgressCallback, status: ExplanationCacheStatus) -> None:
+    progress(ExplanationProgress(kind="cached" if status == "hit" else "shared"))
+
+
+def hedge_delay_s() -> float:
+    """
+    Seconds the preferred provider runs alone before the other one is started
+    too (``AGENT_HEDGE_DELAY_S``, default 2); 0 starts both at once.
     """
+
+    delay = float(os.getenv("AGENT_HEDGE_DELAY_S", _DEFAULT_HEDGE_DELAY_S))
+    if delay < 0:
+        raise ValueError(f"AGENT_HEDGE_DELAY_S must not be negative, not {delay}")
+    return delay
+
+
+async def _hedged(
+    providers: list[ExplanationSource],
+    context: FlightContext,
+    risk: RiskResult,
+    delay_s: float,
+    progress: ProgressCallback | None = None,
+) -> AgentExplanation:
+    """
+    Race ``providers`` in order of preference, starting each one ``delay_s``
+    after the previous one or as soon as every running call failed.
+    """
+
+    waiting = list(providers)
+    running: dict[asyncio.Task[AgentExplanation], ExplanationSource] = {}
+    started: dict[ExplanationSource, float] = {}
+    attempts: list[ProviderAttempt] = []
     errors: list[str] = []
+    winner: AgentExplanation | None = None
 
-    if preference in ("auto", "you_com"):
-        if os.getenv("YOU_COM_API_KEY"):
-            try:
-                return await generate_you_com_explanation(context, risk)
-            except Exception as exc:  # pragma: no cover - best-effort integration
-                errors.append(f"You.com agent failed: {exc}")
-                if preference == "you_com":
-                    raise RuntimeError(errors[-1]) from exc
-        elif preference == "you_com":
-            raise RuntimeError("YOU_COM_API_KEY is not set.")
-
-    if preference in ("auto", "gemini"):
-        if os.getenv("GOOGLE_API_KEY"):
-            try:
-                return await _run_gemini_agent(context, risk)
-            except Exception as exc:  # pragma: no cover - best-effort integration
-                errors.append(f"Gemini agent failed: {exc}")
-                if preference == "gemini":
-                    raise RuntimeError(errors[-1]) from exc
-        elif preference == "gemini":
-            raise RuntimeError("GOOGLE_API_KEY is not set.")
-
-    if errors:
-        raise RuntimeError(" / ".join(errors))
+    def start_next() -> None:
+        provider = waiting.pop(0)
+        started[provider] = time.perf_counter()
+        call = _call_provider(provider, context, risk, progress)
+        running[asyncio.create_task(call)] = provider
+        if progress is not None:
+            progress(ExplanationProgress(kind="provider_started", provider=provider))
+
+    def record(
+        provider: ExplanationSource,
+        outcome: Literal["won", "failed", "cancelled"],
+        error: str | None,
+    ) -> None:
+        duration_ms = (time.perf_counter() - started[provider]) * 1000
+        attempts.append(
+            ProviderAttempt(
+                provider=provider,
+                outcome=outcome,
+                duration_ms=round(duration_ms, 1),
+                error=error,
+            )
+        )
 
-    raise RuntimeError(
-        "Set YOU_COM_API_KEY or GOOGLE_API_KEY to enable AI explanations."
+    start_next()
+    try:
+        while running and winner is None:
+            hedge_at = max(started.values()) + delay_s
+            timeout = max(hedge_at - time.perf_counter(), 0) if waiting else None
+            done, _ = await asyncio.wait(
+                running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            # Preferred providers first, should several finish together.
+            for task in sorted(done, key=lambda task: providers.index(running[task])):
+                provider = running.pop(task)
+                exc = task.exception()
+                if exc is not None:
+                    errors.append(f"{provider} agent failed: {exc}")
+                    record(provider, "failed", str(exc))
+                    if progress is not None:
+                        progress(
+                            ExplanationProgress(
+                                kind="provider_failed", provider=provider, text=str(exc)
+                            )
+                        )
+                elif winner is None:
+                    winner = task.result()
+                    record(provider, "won", None)
+                else:
+                    record(provider, "cancelled", None)
+            if winner is None and waiting and (not done or not running):
+                start_next()
+    finally:
+        for task, provider in running.items():
+            task.cancel()
+            if winner is not None:
+                record(provider, "cancelled", None)
+        await asyncio.gather(*running, return_exceptions=True)
+
+    logger.info(
+        "Agent explanation attempts: "
+        + ", ".join(
+            f"{a.provider} {a.outcome} in {a.duration_ms:.0f} ms" for a in attempts
+        )
     )
+    if winner is None:
+        raise RuntimeError(" / ".join(errors))
+    attempts.sort(key=lambda attempt: providers.index(attempt.provider))
+    return winner.model_copy(update={"attempts": attempts})
+
+
+async def _call_provider(
+    provider: ExplanationSource,
+    context: FlightContext,
+    risk: RiskResult,
+    progress: ProgressCallback | None,
+) -> AgentExplanation:
+    if provider == "You.com":
+        return await generate_you_com_explanation(context, risk)
+    return await _run_gemini_agent(context, risk, progress)
 
 
 async def _run_gemini_agent(
     context: FlightContext,
     risk: RiskResult,
+    progress: ProgressCallback | None = None,
 ) -> AgentExplanation:
     if not os.getenv("GOOGLE_API_KEY"):
         raise RuntimeError(
@@ -134,39 +345,50 @@ async def _run_gemini_agent(
         "tier": risk.tier,
         "factors": [f"{factor.label} (+{factor.impact})" for factor in risk.factors],
     }
-    flight_summary = {
-        "route": f"{context.departure_icao} → {context.destination_icao}",
-        "departure_time": context.departure_time_utc.isoformat(),
-        "pilot_hours": {
-            "total": context.pilot_total_hours,
-            "last_90_days": context.pilot_hours_last_90_days,
-        },
-        "conditions": {
-            "ifr_expected": context.conditions_ifr_expected,
-            "night": context.conditions_night,
-            "mountainous": context.terrain_mountainous,
-        },
-        "weather": {
-            "vis_depart": context.departure_visibility_sm,
-            "vis_dest": context.destination_visibility_sm,
-            "ceiling_depart": context.departure_ceiling_ft,
-            "ceiling_dest": context.destination_ceiling_ft,
-            "max_crosswind": context.max_crosswind_knots,
-            "gusts": context.gusts_knots,
-            "icing_risk": context.icing_risk_0_1,
-            "turbulence_risk": context.turbulence_risk_0_1,
-        },
-    }
-
     run_input = {
-        "flight": flight_summary,
+        "flight": flight_summary(context),
         "risk": risk_summary,
     }
 
     run_kwargs: dict[str, Any] = {}
     if not _SUPPORTS_RESULT_TYPE_AT_INIT and _SUPPORTS_RESULT_TYPE_AT_RUN:
         run_kwargs["result_type"] = AgentExplanation
+    if progress is not None and _SUPPORTS_EVENT_STREAM:
+        run_kwargs["event_stream_handler"] = _progress_handler(progress)
 
-    result = await agent.run(run_input, **run_kwargs)
+    result = await agent.run(run_input, deps=context, **run_kwargs)
     explanation = coerce_agent_result(result)
     return explanation.model_copy(update={"source": "Gemini"})
+
+
+def _progress_handler(progress: ProgressCallback):
+    """An agent event stream handler reporting the run's progress."""
+
+    async def handle(
+        _: RunContext[FlightContext], events: AsyncIterable[AgentStreamEvent]
+    ) -> None:
+        async for event in events:
+            update = _agent_progress(event)
+            if update is not None:
+                progress(update)
+
+    return handle
+
+
+def _agent_progress(event: AgentStreamEvent) -> ExplanationProgress | None:
+    text = None
+    if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+        text = event.part.content
+    elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+        text = event.delta.content_delta
+    elif isinstance(event, FunctionToolCallEvent):
+        return ExplanationProgress(
+            kind="tool_call", provider="Gemini", tool=event.part.tool_name
+        )
+    elif isinstance(event, FunctionToolResultEvent):
+        return ExplanationProgress(
+            kind="tool_result", provider="Gemini", tool=event.result.tool_name
+        )
+    if not text:
+        return None
+    return ExplanationProgress(kind="text", provider="Gemini", text=text)
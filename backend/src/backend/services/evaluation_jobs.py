@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import socket
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from loguru import logger
+
+from backend.apps.should_you_fly.tables import EvaluationJobRecord
+from backend.schemas import (
+    AgentPreference,
+    EvaluationJob,
+    FlightContext,
+    RiskResult,
+)
+from backend.services.ai_agent import generate_agent_explanation
+
+_TERMINAL_STATUSES = ("done", "failed", "cancelled")
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when too many evaluation jobs are already waiting."""
+
+
+def _setting(name: str, default: str) -> float:
+    return float(os.getenv(f"EVALUATION_JOB_{name}", default))
+
+
+async def submit_evaluation_job(
+    context: FlightContext,
+    risk: RiskResult,
+    agent_source: AgentPreference = "auto",
+    priority: int = 0,
+) -> EvaluationJob:
+    """
+    Queue the AI explanation of an evaluation whose ``risk`` is already
+    known. At most ``EVALUATION_JOB_MAX_QUEUED`` jobs (default 1000) wait at
+    a time.
+    """
+
+    max_queued = int(_setting("MAX_QUEUED", "1000"))
+    queued = await EvaluationJobRecord.count().where(
+        EvaluationJobRecord.status == "queued"
+    )
+    if queued >= max_queued:
+        raise JobQueueFullError(
+            f"{queued} evaluation jobs are already queued; try again later."
+        )
+    now = datetime.now(UTC)
+    record = EvaluationJobRecord(
+        created_at=now,
+        updated_at=now,
+        status="queued",
+        priority=priority,
+        agent_source=agent_source,
+        context=context.model_dump(mode="json"),
+        risk=risk.model_dump(mode="json"),
+        attempts=0,
+    )
+    await record.save()
+    EVALUATION_JOBS.notify()
+    return await fetch_job(record.id)  # type: ignore[return-value]
+
+
+async def fetch_job(job_id: UUID) -> EvaluationJob | None:
+    row = (
+        await EvaluationJobRecord.select()
+        .where(EvaluationJobRecord.id == job_id)
+        .output(load_json=True)
+        .first()
+    )
+    return None if row is None else _job(row)
+
+
+async def cancel_job(job_id: UUID) -> EvaluationJob | None:
+    """
+    Cancel a queued or running job; finished jobs are left as they are. A
+    running job's worker stops explaining it at its next lease renewal, or
+    at once when it runs in this process; its provider calls are cancelled
+    too, unless another evaluation waits for the same explanation (see
+    ``ExplanationCache``).
+    """
+
+    await EvaluationJobRecord.raw(
+        "UPDATE evaluation_job_record SET status = 'cancelled',"
+        " lease_expires_at = NULL, updated_at = now()"
+        " WHERE id = {} AND status IN ('queued', 'running')",
+        job_id,
+    )
+    EVALUATION_JOBS.cancel_local(job_id)
+    return await fetch_job(job_id)
+
+
+async def watch_job(job_id: UUID) -> AsyncIterator[EvaluationJob]:
+    """
+    The job every time it changes, polled every ``EVALUATION_JOB_POLL_S``
+    seconds, until it is done, failed or cancelled.
+    """
+
+    last_update: datetime | None = None
+    while True:
+        job = await fetch_job(job_id)
+        if job is None:
+            return
+        if job.updated_at != last_update:
+            last_update = job.updated_at
+            yield job
+        if job.status in _TERMINAL_STATUSES:
+            return
+        await asyncio.sleep(_setting("POLL_S", "1"))
+
+
+class EvaluationJobWorkers:
+    """
+    Bounded pool of background workers explaining queued evaluation jobs.
+
+    ``EVALUATION_JOB_WORKERS`` workers (default 4, ``0`` for a process that
+    only serves the API) claim the highest-priority, oldest queued job with
+    ``SELECT ... FOR UPDATE SKIP LOCKED``, so workers in any number of
+    processes share the queue table without claiming a job twice. A claimed
+    job holds a lease of ``EVALUATION_JOB_LEASE_S`` seconds (default 60),
+    renewed while it runs; a job whose worker died without finishing it is
+    claimed again once its lease has expired, up to
+    ``EVALUATION_JOB_MAX_ATTEMPTS`` claims (default 3), so jobs survive
+    worker restarts. Workers idle until a job is submitted in this process,
+    or for ``EVALUATION_JOB_POLL_S`` seconds (default 1).
+    """
+
+    def __init__(self) -> None:
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.completed = 0
+        self.failed = 0
+        self._tasks: list[asyncio.Task[None]] = []
+        self._explaining: dict[UUID, asyncio.Task[Any]] = {}
+        self._cancelled: set[UUID] = set()
+        self._wakeup: asyncio.Event | None = None
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        workers = int(_setting("WORKERS", "4"))
+        if self.running or workers <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            loop.create_task(self._work(), name=f"evaluation-job-worker-{index}")
+            for index in range(workers)
+        ]
+        self._tasks.append(
+            loop.create_task(self._renew_leases(), name="evaluation-job-leases")
+        )
+
+    async def stop(self) -> None:
+        """Stop the workers; the jobs they were explaining are queued again."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    def notify(self) -> None:
+        """Wake the idle workers: a job was just queued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def cancel_local(self, job_id: UUID) -> None:
+        task = self._explaining.get(job_id)
+        if task is not None:
+            self._cancelled.add(job_id)
+            task.cancel()
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                claimed = await self._claim()
+            except Exception as exc:
+                logger.warning(f"Could not claim an evaluation job: {exc}")
+                claimed = None
+            if claimed is None:
+                await self._idle()
+                continue
+            try:
+                await self._explain(*claimed)
+            except Exception as exc:
+                # Left running: claimed again once its lease has expired.
+                logger.warning(
+                    f"Could not record evaluation job {claimed[0].id}: {exc}"
+                )
+
+    async def _idle(self) -> None:
+        assert self._wakeup is not None
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), _setting("POLL_S", "1"))
+        except TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _claim(self) -> tuple[EvaluationJob, FlightContext] | None:
+        rows = await EvaluationJobRecord.raw(
+            "UPDATE evaluation_job_record SET status = 'running', worker = {},"
+            " attempts = attempts + 1, updated_at = now(),"
+            " lease_expires_at = now() + make_interval(secs => {})"
+            " WHERE id = ("
+            "  SELECT id FROM evaluation_job_record"
+            "  WHERE status = 'queued'"
+            "   OR (status = 'running' AND lease_expires_at < now())"
+            "  ORDER BY priority DESC, created_at"
+            "  LIMIT 1 FOR UPDATE SKIP LOCKED"
+            " ) RETURNING *",
+            self.worker_id,
+            _setting("LEASE_S", "60"),
+        )
+        if not rows:
+            return None
+        context = json.loads(rows[0]["context"])
+        return _job(rows[0]), FlightContext.model_validate(context)
+
+    async def _explain(self, job: EvaluationJob, context: FlightContext) -> None:
+        if job.attempts > _setting("MAX_ATTEMPTS", "3"):
+            await self._finish(
+                job.id,
+                "failed",
+                error=f"Abandoned after {job.attempts - 1} interrupted attempts.",
+            )
+            return
+        explaining = asyncio.create_task(
+            generate_agent_explanation(context, job.risk, job.agent_source)
+        )
+        self._explaining[job.id] = explaining
+        try:
+            explanation = await explaining
+        except asyncio.CancelledError:
+            if job.id not in self._cancelled:
+                # The pool is stopping: leave the job to the next worker.
+                await asyncio.shield(self._requeue(job.id))
+                raise
+            logger.info(f"Evaluation job {job.id} cancelled")
+        except RuntimeError as exc:
+            self.failed += 1
+            await self._finish(job.id, "failed", error=str(exc))
+        except Exception:
+            logger.exception(f"Evaluation job {job.id} failed")
+            self.failed += 1
+            await self._finish(
+                job.id, "failed", error="Failed to generate AI explanation."
+            )
+        else:
+            self.completed += 1
+            await self._finish(
+                job.id, "done", explanation=explanation.model_dump_json()
+            )
+        finally:
+            self._explaining.pop(job.id, None)
+            self._cancelled.discard(job.id)
+
+    async def _finish(
+        self,
+        job_id: UUID,
+        status: str,
+        explanation: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        # Only while the job is still this worker's: it may have been
+        # cancelled meanwhile.
+        await EvaluationJobRecord.raw(
+            "UPDATE evaluation_job_record SET status = {}, explanation = {}::jsonb,"
+            " error = {}, lease_expires_at = NULL, updated_at = now()"
+            " WHERE id = {} AND status = 'running' AND worker = {}",
+            status,
+            explanation,
+            error,
+            job_id,
+            self.worker_id,
+        )
+
+    async def _requeue(self, job_id: UUID) -> None:
+        try:
+            await EvaluationJobRecord.raw(
+                "UPDATE evaluation_job_record SET status = 'queued', worker = NULL,"
+                " attempts = attempts - 1, lease_expires_at = NULL,"
+                " updated_at = now()"
+                " WHERE id = {} AND status = 'running' AND worker = {}",
+                job_id,
+                self.worker_id,
+            )
+        except Exception as exc:
+            logger.warning(
+                f"Could not requeue evaluation job {job_id}; it is claimed again"
+                f" when its lease expires: {exc}"
+            )
+
+    async def _renew_leases(self) -> None:
+        lease_s = _setting("LEASE_S", "60")
+        while True:
+            await asyncio.sleep(lease_s / 3)
+            job_ids = list(self._explaining)
+            if not job_ids:
+                continue
+            try:
+                rows = await EvaluationJobRecord.raw(
+                    "UPDATE evaluation_job_record"
+                    " SET lease_expires_at = now() + make_interval(secs => {})"
+                    " WHERE id = ANY({}) AND status = 'running' AND worker = {}"
+                    " RETURNING id",
+                    lease_s,
+                    job_ids,
+                    self.worker_id,
+                )
+            except Exception as exc:
+                logger.warning(f"Could not renew evaluation job leases: {exc}")
+                continue
+            # Jobs no longer ours were cancelled (possibly by another process).
+            for job_id in set(job_ids) - {row["id"] for row in rows}:
+                self.cancel_local(job_id)
+
+
+def _job(row: dict[str, Any]) -> EvaluationJob:
+    def loaded(value: Any) -> Any:
+        return json.loads(value) if isinstance(value, str) else value
+
+    return EvaluationJob(
+        id=row["id"],
+        status=row["status"],
+        priority=row["priority"],
+        agent_source=row["agent_source"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        risk=loaded(row["risk"]),
+        explanation=loaded(row["explanation"]),
+        error=row["error"],
+        attempts=row["attempts"],
+    )
+
+
+EVALUATION_JOBS = EvaluationJobWorkers()
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from backend.schemas import (
+    AgentExplanation,
+    ExplanationCacheStatus,
+    ExplanationSource,
+    FlightContext,
+    RiskResult,
+)
+from backend.services.query_normalization import (
+    canonical_aircraft,
+    flight_summary,
+    time_bucket,
+)
+
+ExplanationRun = Callable[[], Awaitable[AgentExplanation]]
+# Told "hit" or "shared" as soon as a caller is served without its own run.
+ReuseCallback = Callable[[ExplanationCacheStatus], None]
+
+
+def explanation_fingerprint(
+    context: FlightContext,
+    risk: RiskResult,
+    providers: list[ExplanationSource],
+) -> str:
+    """
+    Canonical fingerprint of what an explanation depends on: the risk result
+    (tier, score, ruleset and the set of fired factors), the route, aircraft
+    type, departure time bucket and conditions of the flight, and the
+    providers that may answer. When Gemini may answer, everything its prompt
+    and tools read about the flight is included as is, so an explanation
+    never quotes another flight's numbers; You.com only reads the rest, so
+    flights differing only in inputs that fired no different factor share
+    its explanations.
+    """
+
+    canonical = {
+        "tier": risk.tier,
+        "score": risk.score,
+        "ruleset": risk.ruleset_version,
+        "factors": sorted((f.label, f.impact) for f in risk.factors),
+        "route": [context.departure_icao.upper(), context.destination_icao.upper()],
+        "aircraft": canonical_aircraft(context.aircraft_type),
+        "departure": time_bucket(context.departure_time_utc),
+        "conditions": [
+            context.conditions_ifr_expected,
+            context.conditions_night,
+            context.terrain_mountainous,
+        ],
+        "providers": providers,
+    }
+    if "Gemini" in providers:
+        canonical["flight"] = flight_summary(context)
+        # Read by the similarity tool, not sent in the prompt.
+        canonical["freezing_level_ft"] = context.freezing_level_ft
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class _CachedExplanation:
+    created_at: float
+    explanation: AgentExplanation
+
+
+class ExplanationCache:
+    """
+    Explanations by fingerprint, so near-identical evaluations (a squadron
+    briefing together) share one provider run.
+
+    Explanations are kept for ``ttl_s`` seconds
+    (``AGENT_EXPLANATION_CACHE_TTL_S``, default 600, ``0`` disables the
+    cache), at most ``size`` of them (``AGENT_EXPLANATION_CACHE_SIZE``,
+    default 256), least recently used first out. Requests arriving while the
+    same fingerprint is being explained wait for that run instead of starting
+    their own; failed runs are not cached. A caller going away leaves the run
+    to the others, and the run (with its provider calls) is cancelled once
+    every caller waiting for it has gone.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        ttl_s: float | None = None,
+        size: int | None = None,
+    ) -> None:
+        self.clock = clock
+        if ttl_s is None:
+            ttl_s = float(os.getenv("AGENT_EXPLANATION_CACHE_TTL_S", "600"))
+        if size is None:
+            size = int(os.getenv("AGENT_EXPLANATION_CACHE_SIZE", "256"))
+        self.ttl_s = ttl_s
+        self.size = size
+        self.hits = 0
+        self.shared = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, _CachedExplanation] = OrderedDict()
+        self._runs: dict[str, asyncio.Task[AgentExplanation]] = {}
+        # Callers waiting for each run.
+        self._waiters: dict[asyncio.Task[AgentExplanation], int] = {}
+
+    async def get(
+        self,
+        fingerprint: str,
+        run: ExplanationRun,
+        reused: ReuseCallback | None = None,
+    ) -> AgentExplanation:
+        """
+        The explanation of ``fingerprint``, from the cache, from a run in
+        progress or by awaiting ``run``, with ``cache`` telling which.
+        ``reused`` is called at once when it is not this caller's run.
+        """
+
+        if self.ttl_s <= 0:
+            return await run()
+        entry = self._entries.get(fingerprint)
+        if entry is not None and self.clock() - entry.created_at < self.ttl_s:
+            self._entries.move_to_end(fingerprint)
+            self.hits += 1
+            if reused is not None:
+                reused("hit")
+            return entry.explanation.model_copy(update={"cache": "hit"})
+
+        task = self._runs.get(fingerprint)
+        if task is not None:
+            self.shared += 1
+            if reused is not None:
+                reused("shared")
+            explanation = await self._wait(fingerprint, task)
+            return explanation.model_copy(update={"cache": "shared"})
+        self.misses += 1
+        task = asyncio.get_running_loop().create_task(
+            self._store(fingerprint, run), name="agent-explanation"
+        )
+        self._runs[fingerprint] = task
+        task.add_done_callback(lambda _: self._finished(fingerprint, task))
+        explanation = await self._wait(fingerprint, task)
+        return explanation.model_copy(update={"cache": "miss"})
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def _wait(
+        self, fingerprint: str, task: asyncio.Task[AgentExplanation]
+    ) -> AgentExplanation:
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # Shielded: a caller going away must not cancel the run others
+            # wait for.
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # Nobody waits for it any more: stop paying for it, and
+                    # let the next caller start a run of its own.
+                    if self._runs.get(fingerprint) is task:
+                        del self._runs[fingerprint]
+                    task.cancel()
+
+    def _finished(self, fingerprint: str, task: asyncio.Task[AgentExplanation]) -> None:
+        if self._runs.get(fingerprint) is task:
+            del self._runs[fingerprint]
+        # Retrieved here too: every caller may have gone before a run failed.
+        if not task.cancelled():
+            task.exception()
+
+    async def _store(self, fingerprint: str, run: ExplanationRun) -> AgentExplanation:
+        explanation = await run()
+        self._entries[fingerprint] = _CachedExplanation(self.clock(), explanation)
+        self._entries.move_to_end(fingerprint)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        return explanation
+
+
+EXPLANATION_CACHE = ExplanationCache()
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from backend.schemas import (
+    FactorFrequency,
+    HistoryStatsSummary,
+    RiskResult,
+    TierMixPoint,
+)
+
+if TYPE_CHECKING:
+    from backend.services.risk_engine import RiskAssessment
+
+_MAX_SCORE = 100
+_TIERS = ("GO", "CAUTION", "NO-GO")
+_PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass(slots=True)
+class ScoreHistogram:
+    """
+    Exact quantile sketch for risk scores.
+
+    Scores are integers clamped to 0-100, so one counter per possible value is
+    both exact and constant-size; merging two sketches is an element-wise sum.
+    """
+
+    counts: list[int] = field(default_factory=lambda: [0] * (_MAX_SCORE + 1))
+    total: int = 0
+    score_sum: int = 0
+
+    def add(self, score: int) -> None:
+        self.counts[score] += 1
+        self.total += 1
+        self.score_sum += score
+
+    def merge(self, other: ScoreHistogram) -> None:
+        for score, count in enumerate(other.counts):
+            self.counts[score] += count
+        self.total += other.total
+        self.score_sum += other.score_sum
+
+    def quantile(self, q: float) -> int | None:
+        """Nearest-rank quantile, ``q`` in [0, 1]."""
+        if not self.total:
+            return None
+        rank = max(1, math.ceil(q * self.total))
+        seen = 0
+        for score, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return score
+        return _MAX_SCORE
+
+    @property
+    def mean(self) -> float | None:
+        return self.score_sum / self.total if self.total else None
+
+
+@dataclass(slots=True)
+class HourlyTierMix:
+    """Tier counters per UTC hour, keeping only the most recent ``hours``."""
+
+    hours: int = 48
+    buckets: dict[int, Counter[str]] = field(default_factory=dict)
+    # Bounds and bucket of the hour last added to; most adds land in it.
+    _current: tuple[datetime, datetime, Counter[str]] | None = field(
+        default=None, repr=False
+    )
+
+    def add(self, timestamp: datetime, tier: str) -> None:
+        current = self._current
+        if current is not None and current[0] <= timestamp < current[1]:
+            current[2][tier] += 1
+            return
+        hour = int(timestamp.timestamp()) // 3600
+        bucket = self.buckets.get(hour)
+        if bucket is None:
+            bucket = self.buckets[hour] = Counter()
+            self._evict()
+        bucket[tier] += 1
+        if hour in self.buckets:
+            start = datetime.fromtimestamp(hour * 3600, UTC)
+            self._current = (start, start + timedelta(hours=1), bucket)
+
+    def merge(self, other: HourlyTierMix) -> None:
+        for hour, counts in other.buckets.items():
+            self.buckets.setdefault(hour, Counter()).update(counts)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self.buckets) > self.hours:
+            del self.buckets[min(self.buckets)]
+        self._current = None
+
+
+@dataclass(slots=True)
+class FactorHeavyHitters:
+    """
+    Space-Saving summary of the most frequent risk factors.
+
+    Tracks at most ``capacity`` labels. When a new label arrives at capacity it
+    replaces the least frequent one and inherits its count as ``error``, so
+    every reported count over-estimates the true count by at most ``error``.
+    """
+
+    capacity: int = 32
+    counts: dict[str, int] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def add(self, label: str, count: int = 1) -> None:
+        if label in self.counts:
+            self.counts[label] += count
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[label] = count
+            self.errors[label] = 0
+            return
+        evicted = min(self.counts, key=self.counts.__getitem__)
+        floor = self.counts.pop(evicted)
+        self.errors.pop(evicted)
+        self.counts[label] = floor + count
+        self.errors[label] = floor
+
+    def merge(self, other: FactorHeavyHitters) -> None:
+        """
+        Fold ``other`` in, keeping the error bounds valid.
+
+        A label missing from a full sketch may have been evicted from it, so
+        that side counts it at its smallest count, taken as error too.
+        """
+
+        floor, other_floor = self._floor(), other._floor()
+        counts: dict[str, int] = {}
+        errors: dict[str, int] = {}
+        for label in self.counts.keys() | other.counts.keys():
+            counts[label] = self.counts.get(label, floor) + other.counts.get(
+                label, other_floor
+            )
+            errors[label] = self.errors.get(label, floor) + other.errors.get(
+                label, other_floor
+            )
+        kept = sorted(counts, key=counts.__getitem__, reverse=True)[: self.capacity]
+        self.counts = {label: counts[label] for label in kept}
+        self.errors = {label: errors[label] for label in kept}
+
+    def _floor(self) -> int:
+        """Most any label missing from the sketch can have been counted."""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values(), default=0)
+
+    def top(self, limit: int) -> list[tuple[str, int, int]]:
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return [(label, count, self.errors[label]) for label, count in ranked[:limit]]
+
+
+@dataclass(slots=True)
+class HistoryStats:
+    """
+    Incremental, mergeable summary of every evaluation seen by this process.
+
+    ``record`` is O(1): factor label sets are tallied as a whole (the scoring
+    fast path hands over interned tuples) and folded into the heavy-hitters
+    sketch only once ``flush_at`` distinct sets have piled up or a summary is
+    requested. ``summary`` is O(1) in the number of evaluations recorded.
+
+    ``HISTORY_STATS`` lives in each worker process and is not shared, so with
+    several workers each one reports only the evaluations it scored; sketches
+    can be combined with ``merge``, but nothing does so across processes.
+    """
+
+    scores: ScoreHistogram = field(default_factory=ScoreHistogram)
+    tiers: HourlyTierMix = field(default_factory=HourlyTierMix)
+    factors: FactorHeavyHitters = field(default_factory=FactorHeavyHitters)
+    pending_factors: Counter[tuple[str, ...]] = field(default_factory=Counter)
+    flush_at: int = 256
+
+    def add(self, timestamp: datetime, risk: RiskResult | RiskAssessment) -> None:
+        self.record(
+            timestamp,
+            risk.score,
+            risk.tier,
+            tuple(factor.label for factor in risk.factors),
+        )
+
+    def record(
+        self, timestamp: datetime, score: int, tier: str, labels: tuple[str, ...]
+    ) -> None:
+        self.scores.add(score)
+        self.tiers.add(timestamp, tier)
+        if labels:
+            pending = self.pending_factors
+            pending[labels] += 1
+            if len(pending) > self.flush_at:
+                self._flush_factors()
+
+    def merge(self, other: HistoryStats) -> None:
+        self._flush_factors()
+        other._flush_factors()
+        self.scores.merge(other.scores)
+        self.tiers.merge(other.tiers)
+        self.factors.merge(other.factors)
+
+    def summary(self, top_factors: int = 10) -> HistoryStatsSummary:
+        self._flush_factors()
+        return HistoryStatsSummary(
+            count=self.scores.total,
+            mean_score=self.scores.mean,
+            percentiles={
+                f"p{p}": value
+                for p in _PERCENTILES
+                if (value := self.scores.quantile(p / 100)) is not None
+            },
+            tier_mix_by_hour=[
+                TierMixPoint(
+                    hour=datetime.fromtimestamp(hour * 3600, UTC),
+                    counts={tier: counts[tier] for tier in _TIERS},
+                )
+                for hour, counts in sorted(self.tiers.buckets.items())
+            ],
+            top_factors=[
+                FactorFrequency(label=label, count=count, max_overcount=error)
+                for label, count, error in self.factors.top(top_factors)
+            ],
+        )
+
+    def _flush_factors(self) -> None:
+        for labels, count in self.pending_factors.items():
+            for label in labels:
+                self.factors.add(label, count)
+        self.pending_factors.clear()
+
+
+HISTORY_STATS = HistoryStats()
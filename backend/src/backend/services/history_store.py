@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from backend.apps.should_you_fly.tables import EvaluationRecord
+from backend.schemas import FlightContext, HistoryPage, HistoryPoint, RiskResult
+from backend.services.shared_history import RECENT_EVALUATIONS
+
+if TYPE_CHECKING:
+    from backend.services.risk_engine import RiskAssessment
+
+
+@dataclass(frozen=True, slots=True)
+class PendingEvaluation:
+    timestamp: datetime
+    context: FlightContext
+    risk: RiskResult | RiskAssessment
+
+
+def context_hash(context: FlightContext) -> str:
+    """Stable fingerprint of a flight context (hex, 32 chars)."""
+    return hashlib.blake2b(
+        context.model_dump_json().encode(), digest_size=16
+    ).hexdigest()
+
+
+class EvaluationHistoryWriter:
+    """
+    Write-behind persistence of evaluations to ``EvaluationRecord``.
+
+    ``enqueue`` never blocks or touches the database: it drops the evaluation
+    into a bounded in-memory queue that a background task drains in batches
+    (up to ``batch_size`` rows, or whatever arrived within ``flush_interval_s``)
+    with one multi-row ``INSERT`` each. When the queue is full or the writer is
+    not running, evaluations are dropped and counted rather than slowing the
+    request path down.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval_s: float = 1.0,
+        max_pending: int = 10_000,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.written = 0
+        # ``None`` asks the background task to write what it holds and exit.
+        self._queue: asyncio.Queue[PendingEvaluation | None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        # Bounded in ``_put``, so the stop marker always fits.
+        self._queue = asyncio.Queue()
+        self._task = self._loop.create_task(self._run(), name="history-writer")
+
+    async def stop(self) -> None:
+        """Flush what is queued and stop the background task."""
+        if self._task is None:
+            return
+        assert self._queue is not None
+        # Behind everything already queued: the task writes all of it,
+        # including the batch it is still collecting, before it exits.
+        self._queue.put_nowait(None)
+        await self._task
+        # Evaluations enqueued while the task was finishing.
+        await self._drain()
+        self._task = None
+
+    def enqueue(
+        self,
+        timestamp: datetime,
+        context: FlightContext,
+        risk: RiskResult | RiskAssessment,
+    ) -> None:
+        queue, loop = self._queue, self._loop
+        if queue is None or loop is None or not self.running:
+            return
+        item = PendingEvaluation(timestamp=timestamp, context=context, risk=risk)
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            self._put(item)
+        else:
+            loop.call_soon_threadsafe(self._put, item)
+
+    def _put(self, item: PendingEvaluation) -> None:
+        assert self._queue is not None
+        if self._queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            return
+        self._queue.put_nowait(item)
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        stopping = False
+        while not stopping:
+            batch: list[PendingEvaluation] = []
+            item = await self._queue.get()
+            deadline = asyncio.get_running_loop().time() + self.flush_interval_s
+            while item is not None:
+                batch.append(item)
+                timeout = deadline - asyncio.get_running_loop().time()
+                if len(batch) >= self.batch_size or timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+            stopping = item is None
+            if batch:
+                await self._write(batch)
+
+    async def _drain(self) -> None:
+        assert self._queue is not None
+        while not self._queue.empty():
+            batch: list[PendingEvaluation] = []
+            while len(batch) < self.batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not None:
+                    batch.append(item)
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch: list[PendingEvaluation]) -> None:
+        rows = [
+            EvaluationRecord(
+                created_at=item.timestamp,
+                score=item.risk.score,
+                tier=item.risk.tier,
+                factors=[
+                    {"label": factor.label, "impact": factor.impact}
+                    for factor in item.risk.factors
+                ],
+                context_hash=context_hash(item.context),
+                ruleset_version=item.risk.ruleset_version,
+            )
+            for item in batch
+        ]
+        try:
+            await EvaluationRecord.insert(*rows)
+        except Exception as exc:  # pragma: no cover - depends on the database
+            self.dropped += len(rows)
+            logger.exception(f"Failed to persist {len(rows)} evaluations: {exc}")
+        else:
+            self.written += len(rows)
+
+
+HISTORY_WRITER = EvaluationHistoryWriter()
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a history pagination cursor cannot be decoded."""
+
+
+async def fetch_history(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = 12,
+) -> HistoryPage:
+    """
+    Page through persisted evaluations, newest page first.
+
+    Uses keyset pagination on ``(created_at, id)``: ``next_cursor`` encodes the
+    oldest row of the page and the next request continues strictly before it,
+    so deep pages cost the same as the first. Points within a page are in
+    chronological order for charting.
+    """
+
+    query = EvaluationRecord.select(
+        EvaluationRecord.id,
+        EvaluationRecord.created_at,
+        EvaluationRecord.score,
+        EvaluationRecord.tier,
+    )
+    if start is not None:
+        query = query.where(EvaluationRecord.created_at >= start)
+    if end is not None:
+        query = query.where(EvaluationRecord.created_at < end)
+    if cursor is not None:
+        cursor_ts, cursor_id = _decode_cursor(cursor)
+        query = query.where(
+            (EvaluationRecord.created_at < cursor_ts)
+            | (
+                (EvaluationRecord.created_at == cursor_ts)
+                & (EvaluationRecord.id < cursor_id)
+            )
+        )
+    rows = await query.order_by(
+        EvaluationRecord.created_at, EvaluationRecord.id, ascending=False
+    ).limit(limit + 1)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        oldest = rows[-1]
+        next_cursor = _encode_cursor(oldest["created_at"], oldest["id"])
+    return HistoryPage(
+        points=[
+            HistoryPoint(
+                timestamp=row["created_at"], score=row["score"], tier=row["tier"]
+            )
+            for row in reversed(rows)
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+async def recent_history(limit: int = 12) -> HistoryPage | None:
+    """
+    Latest evaluations from the host-wide shared ring.
+
+    Every worker on the host reads the same ring, so the answer does not depend
+    on which process serves the request, and it includes evaluations still
+    waiting in the write-behind queue. Returns ``None`` when the ring holds
+    fewer than ``limit`` points (e.g. right after a host restart) so callers
+    can fall back to ``fetch_history``. ``next_cursor`` continues into the
+    persisted history right after the oldest point returned; only its row id
+    is looked up in the database.
+    """
+
+    recent = RECENT_EVALUATIONS.snapshot(limit)
+    if len(recent) < limit:
+        return None
+    oldest = recent[0][0]
+    shown = sum(1 for timestamp, _, _ in recent if timestamp == oldest)
+    return HistoryPage(
+        points=[
+            HistoryPoint(timestamp=timestamp, score=score, tier=tier)
+            for timestamp, score, tier in recent
+        ],
+        next_cursor=_encode_cursor(oldest, await _boundary_id(oldest, shown)),
+    )
+
+
+async def _boundary_id(timestamp: datetime, shown: int) -> int:
+    """
+    Id of the ``shown``-th newest persisted row at ``timestamp``: the last row
+    a ring page showed, in ``fetch_history`` order. ``0``, skipping every row
+    at ``timestamp``, while the rows shown are still queued for writing.
+    """
+
+    try:
+        row = (
+            await EvaluationRecord.select(EvaluationRecord.id)
+            .where(EvaluationRecord.created_at == timestamp)
+            .order_by(EvaluationRecord.id, ascending=False)
+            .offset(shown - 1)
+            .first()
+        )
+    except Exception as exc:
+        logger.warning(f"Could not look up the history cursor row: {exc}")
+        return 0
+    return 0 if row is None else row["id"]
+
+
+async def fetch_history_buckets(
+    bucket_seconds: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = 500,
+) -> HistoryPage:
+    """
+    Downsample persisted evaluations into fixed-width time buckets in SQL.
+
+    Each point carries the mean score of its bucket plus the min, max and
+    count, so months of history chart as a few hundred points. Pagination is
+    keyset on the bucket start, newest page first, like ``fetch_history``.
+    """
+
+    conditions: list[str] = []
+    args: list[object] = [float(bucket_seconds)]
+    for condition, value in (
+        ("created_at >= {}", start),
+        ("created_at < {}", end),
+        ("created_at < {}", _decode_cursor(cursor)[0] if cursor else None),
+    ):
+        if value is not None:
+            conditions.append(condition)
+            args.append(value)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    args.append(limit + 1)
+
+    rows = await EvaluationRecord.raw(
+        "SELECT to_timestamp(floor(extract(epoch FROM created_at) / b.width)"
+        " * b.width) AS bucket_start,"
+        " avg(score)::float AS score, min(score) AS min_score,"
+        " max(score) AS max_score, count(*) AS count"
+        " FROM evaluation_record, (SELECT {}::float AS width) AS b"
+        f" {where}"
+        " GROUP BY bucket_start ORDER BY bucket_start DESC LIMIT {}",
+        *args,
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1]["bucket_start"], 0)
+    return HistoryPage(
+        points=[
+            HistoryPoint(
+                timestamp=row["bucket_start"],
+                score=row["score"],
+                min_score=row["min_score"],
+                max_score=row["max_score"],
+                count=row["count"],
+            )
+            for row in reversed(rows)
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+def _encode_cursor(timestamp: datetime, row_id: int) -> str:
+    return f"{timestamp.isoformat()}|{row_id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        timestamp, row_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except ValueError as exc:
+        raise InvalidCursorError(f"Invalid history cursor: {cursor!r}") from exc
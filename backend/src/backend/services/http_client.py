@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+from loguru import logger
+
+_HAS_H2 = importlib.util.find_spec("h2") is not None
+# Default of every ``<PREFIX>_*`` setting of a SharedHttpClient.
+_DEFAULT_SETTINGS = {
+    "HTTP2": "1",
+    "MAX_CONNECTIONS": "20",
+    "MAX_KEEPALIVE_CONNECTIONS": "10",
+    "KEEPALIVE_EXPIRY_S": "30",
+    "TIMEOUT_S": "30",
+    "CONNECT_TIMEOUT_S": "10",
+}
+# Connection setup phases reported by httpcore's ``trace`` extension.
+_HANDSHAKE_EVENTS = ("connection.connect_tcp", "connection.start_tls")
+
+
+@dataclass(frozen=True, slots=True)
+class ConnectionUse:
+    """How one request got its connection, attached to the response."""
+
+    # False when the request opened (and paid the handshake for) a connection.
+    reused: bool
+    http_version: str
+    # TCP connect plus TLS handshake; 0 for reused connections.
+    handshake_ms: float
+    elapsed_ms: float
+
+
+class SharedHttpClient:
+    """
+    One long-lived ``httpx.AsyncClient`` for an upstream API, opened with the
+    app (``start``) and closed with it (``stop``).
+
+    Requests share its pool of keep-alive connections (multiplexed over
+    HTTP/2 when the ``h2`` package is installed) instead of paying DNS, TCP
+    and TLS setup on every call. The pool and timeouts come from
+    ``<env_prefix>_*`` environment variables read at ``start``: ``HTTP2``
+    (default 1), ``MAX_CONNECTIONS`` (20), ``MAX_KEEPALIVE_CONNECTIONS`` (10),
+    ``KEEPALIVE_EXPIRY_S`` (30), ``TIMEOUT_S`` (30) and ``CONNECT_TIMEOUT_S``
+    (10).
+
+    Every response carries a ``ConnectionUse`` in
+    ``response.extensions["connection_use"]``, and the counters below add
+    them up.
+    """
+
+    def __init__(self, env_prefix: str) -> None:
+        self.env_prefix = env_prefix
+        self.requests = 0
+        self.connections_opened = 0
+        self.handshake_ms = 0.0
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._client is not None
+
+    @property
+    def reused(self) -> int:
+        """Requests sent on a connection opened by an earlier request."""
+        return self.requests - self.connections_opened
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._client = httpx.AsyncClient(**self._client_kwargs())
+
+    async def stop(self) -> None:
+        """Close the pooled connections."""
+        if self._client is None:
+            return
+        client, self._client = self._client, None
+        await client.aclose()
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request on the shared client or, when it is not running (e.g.
+        in scripts, outside the app), on a client of its own.
+        """
+
+        if self._client is not None:
+            return await self._send(self._client, method, url, **kwargs)
+        async with httpx.AsyncClient(**self._client_kwargs()) as client:
+            return await self._send(client, method, url, **kwargs)
+
+    async def _send(
+        self, client: httpx.AsyncClient, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        phase_started: dict[str, float] = {}
+        handshake_s = 0.0
+        opened = False
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            nonlocal handshake_s, opened
+            phase, _, stage = event.rpartition(".")
+            if phase not in _HANDSHAKE_EVENTS:
+                return
+            opened = True
+            if stage == "started":
+                phase_started[phase] = time.perf_counter()
+            elif phase in phase_started:
+                handshake_s += time.perf_counter() - phase_started.pop(phase)
+
+        started = time.perf_counter()
+        extensions = {**kwargs.pop("extensions", {}), "trace": trace}
+        response = await client.request(method, url, extensions=extensions, **kwargs)
+        use = ConnectionUse(
+            reused=not opened,
+            http_version=response.http_version,
+            handshake_ms=round(handshake_s * 1000, 3),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+        response.extensions["connection_use"] = use
+        self.requests += 1
+        if opened:
+            self.connections_opened += 1
+            self.handshake_ms += use.handshake_ms
+        logger.debug(
+            f"{method} {response.url.host} over {use.http_version}: "
+            f"{'reused connection' if use.reused else 'new connection'}, "
+            f"handshake {use.handshake_ms:.1f} ms, total {use.elapsed_ms:.1f} ms"
+        )
+        return response
+
+    def _client_kwargs(self) -> dict[str, Any]:
+        def setting(name: str) -> str:
+            return os.getenv(f"{self.env_prefix}_{name}", _DEFAULT_SETTINGS[name])
+
+        http2 = setting("HTTP2").lower() not in ("0", "false", "no", "off")
+        if http2 and not _HAS_H2:
+            logger.warning(
+                f"{self.env_prefix}_HTTP2 is on but the h2 package is missing "
+                "(install httpx[http2]); using HTTP/1.1 keep-alive connections"
+            )
+            http2 = False
+        return {
+            "http2": http2,
+            "limits": httpx.Limits(
+                max_connections=int(setting("MAX_CONNECTIONS")),
+                max_keepalive_connections=int(setting("MAX_KEEPALIVE_CONNECTIONS")),
+                keepalive_expiry=float(setting("KEEPALIVE_EXPIRY_S")),
+            ),
+            "timeout": httpx.Timeout(
+                float(setting("TIMEOUT_S")),
+                connect=float(setting("CONNECT_TIMEOUT_S")),
+            ),
+        }
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+import re
+from datetime import UTC, datetime
+from typing import Any
+
+from backend.schemas import FlightContext
+
+
+def canonical_aircraft(aircraft_type: str) -> str:
+    """
+    ``aircraft_type`` without separators, upper-cased: "c-172", " C172 " and
+    "c 172" are the same type.
+    """
+
+    return re.sub(r"[\s\-_/]+", "", aircraft_type).upper()
+
+
+def time_bucket(departure: datetime) -> str:
+    """``departure`` floored to ``YOU_COM_QUERY_TIME_BUCKET_H`` hours (default 6)."""
+    hours = max(int(os.getenv("YOU_COM_QUERY_TIME_BUCKET_H", "6")), 1)
+    if departure.utcoffset() is not None:
+        departure = departure.astimezone(UTC)
+    hour = departure.hour - departure.hour % hours
+    return departure.replace(hour=hour, minute=0, second=0, microsecond=0).strftime(
+        "%Y-%m-%d %H:%MZ"
+    )
+
+
+def flight_summary(context: FlightContext) -> dict[str, Any]:
+    """The flight as the Gemini agent is told about it."""
+    return {
+        "route": f"{context.departure_icao} → {context.destination_icao}",
+        "departure_time": context.departure_time_utc.isoformat(),
+        "pilot_hours": {
+            "total": context.pilot_total_hours,
+            "last_90_days": context.pilot_hours_last_90_days,
+        },
+        "conditions": {
+            "ifr_expected": context.conditions_ifr_expected,
+            "night": context.conditions_night,
+            "mountainous": context.terrain_mountainous,
+        },
+        "weather": {
+            "vis_depart": context.departure_visibility_sm,
+            "vis_dest": context.destination_visibility_sm,
+            "ceiling_depart": context.departure_ceiling_ft,
+            "ceiling_dest": context.destination_ceiling_ft,
+            "max_crosswind": context.max_crosswind_knots,
+            "gusts": context.gusts_knots,
+            "icing_risk": context.icing_risk_0_1,
+            "turbulence_risk": context.turbulence_risk_0_1,
+        },
+    }
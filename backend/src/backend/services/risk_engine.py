@@ -1,113 +1,205 @@
 from __future__ import annotations
 
-from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import UTC, datetime
 
-from backend.schemas import FlightContext, RiskFactor, RiskResult
+import polars as pl
+import polars.selectors as cs
 
-RECENT_EVALUATIONS: deque[tuple[datetime, int]] = deque(maxlen=12)
+from backend.schemas import FlightContext, RiskResult
+from backend.services.history_stats import HISTORY_STATS
+from backend.services.history_store import HISTORY_WRITER
+from backend.services.risk_rules import (
+    CompiledRuleSet,
+    FactorRecord,
+    get_active_ruleset,
+)
+from backend.services.shared_history import RECENT_EVALUATIONS
+
+_POLARS_DTYPES: dict[type, pl.DataType] = {
+    bool: pl.Boolean(),
+    int: pl.Int64(),
+    float: pl.Float64(),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RiskAssessment:
+    """
+    Internal result of scoring one flight, before any Pydantic model exists.
+
+    Holds the fired-rule bitmask and the compiled table instead of a factor
+    list, so scoring allocates nothing per fired rule; ``factors`` are interned
+    per bitmask. Call ``to_result`` at the API boundary. Every route answers
+    with a ``RiskResult``, so there the Pydantic cost is only moved, not
+    saved: the fast path pays off only for callers that never need one.
+    """
+
+    score: int
+    tier: str
+    fired: int
+    rules: CompiledRuleSet
+
+    @property
+    def factors(self) -> tuple[FactorRecord, ...]:
+        return self.rules.records_for(self.fired)
+
+    @property
+    def labels(self) -> tuple[str, ...]:
+        return self.rules.labels_for(self.fired)
+
+    @property
+    def ruleset_version(self) -> str:
+        return self.rules.version
+
+    def to_result(self) -> RiskResult:
+        return RiskResult(
+            score=self.score,
+            tier=self.tier,
+            factors=list(self.rules.factors_for(self.fired)),
+            ruleset_version=self.rules.version,
+        )
+
+
+def assess_risk(context: FlightContext) -> RiskAssessment:
+    """
+    Score one flight and record it, without building Pydantic models.
+
+    Same rules, clamping and history side effects as ``compute_risk``.
+    """
+
+    rules = get_active_ruleset()
+    score, fired = rules.evaluate(context)
+    score = 0 if score < 0 else 100 if score > 100 else score
+    assessment = RiskAssessment(score, _TIER_BY_SCORE[score], fired, rules)
+    add_recent_evaluation(datetime.now(UTC), context, assessment)
+    return assessment
 
 
 def compute_risk(context: FlightContext) -> RiskResult:
     """
     Deterministic rule-based scoring with transparent factors.
 
-    Each rule contributes a fixed number of points. The score is clamped to the
-    0–100 range before mapping to the GO/CAUTION/NO-GO tiers.
+    Each rule of the active rule table (see ``risk_rules``) contributes a fixed
+    number of points. The score is clamped to the 0–100 range before mapping to
+    the GO/CAUTION/NO-GO tiers.
     """
 
-    score = 0
-    factors: list[RiskFactor] = []
-
-    def record(condition: bool, label: str, impact: int) -> None:
-        nonlocal score
-        if condition:
-            score += impact
-            factors.append(RiskFactor(label=label, impact=impact))
-
-    # Pilot experience
-    if context.pilot_total_hours < 50:
-        record(True, "Pilot total hours < 50", 25)
-    elif context.pilot_total_hours < 100:
-        record(True, "Pilot total hours < 100", 15)
-
-    record(
-        context.pilot_hours_last_90_days < 10,
-        "Pilot flew < 10 hours in last 90 days",
-        15,
-    )
+    return assess_risk(context).to_result()
 
-    # Aircraft loading
-    mtow_ratio = context.planned_takeoff_weight_kg / max(context.aircraft_mtow_kg, 1)
-    record(
-        mtow_ratio > 0.9,
-        "Planned takeoff weight > 90% MTOW",
-        15,
-    )
 
-    # Ratings vs conditions
-    record(
-        context.conditions_ifr_expected and not context.pilot_instrument_rating,
-        "IFR expected but pilot not instrument-rated",
-        30,
-    )
-    record(
-        context.conditions_night and not context.pilot_night_current,
-        "Night flight with lapsed night currency",
-        20,
-    )
+def compute_risk_batch(contexts: Sequence[FlightContext]) -> list[RiskResult]:
+    """
+    Score many flights in one columnar pass.
 
-    # Crosswind
-    if context.max_crosswind_knots > 20:
-        record(True, "Crosswind component > 20 kt", 30)
-    elif context.max_crosswind_knots > 15:
-        record(True, "Crosswind component > 15 kt", 20)
-
-    # Visibility / ceiling at both ends
-    record(
-        context.departure_visibility_sm < 3 or context.destination_visibility_sm < 3,
-        "Visibility under 3 SM",
-        20,
-    )
-    record(
-        context.departure_ceiling_ft < 1000 or context.destination_ceiling_ft < 1000,
-        "Ceiling under 1000 ft",
-        20,
-    )
+    Produces the same ``RiskResult`` as ``compute_risk`` for every context (same
+    factor labels, impacts and order) but does not record the legs in the
+    recent-evaluation history, since batches are planning runs.
+    """
 
-    # Icing / turbulence (scaled)
-    if context.icing_risk_0_1 > 0.7:
-        record(True, "Severe icing risk (>0.7)", 35)
-    elif context.icing_risk_0_1 > 0.5:
-        record(True, "Moderate icing risk (>0.5)", 25)
+    if not contexts:
+        return []
 
-    record(
-        context.turbulence_risk_0_1 > 0.5,
-        "Elevated turbulence risk (>0.5)",
-        15,
+    rules = get_active_ruleset()
+    frame = pl.DataFrame(
+        {
+            name: [getattr(context, name) for context in contexts]
+            for name in rules.columns
+        },
+        schema={name: context_dtype(name) for name in rules.columns},
     )
+    scored = score_frame(frame, rules)
+
+    return [
+        RiskResult(
+            score=score,
+            tier=tier_for_score(score),
+            factors=list(rules.factors_for(fired)),
+            ruleset_version=rules.version,
+        )
+        for score, fired in zip(
+            scored.get_column("score").to_list(),
+            scored.get_column("fired").to_list(),
+            strict=True,
+        )
+    ]
+
+
+def score_frame(
+    frame: pl.DataFrame,
+    rules: CompiledRuleSet | None = None,
+) -> pl.DataFrame:
+    """
+    Evaluate the active rule table over a frame of ``FlightContext`` columns.
 
-    # Gust spread
-    record(
-        context.gusts_knots - context.max_crosswind_knots > 15,
-        "Large gust spread (>15 kt)",
-        10,
-    )
+    Returns one row per input row with the clamped ``score`` and the ``fired``
+    rule bitmask (bit ``i`` set when rule ``i`` fired), so callers can build
+    factor lists only for the rows they need. Pass ``rules`` to pin the table
+    the bitmask refers to.
+    """
 
-    clamped_score = max(0, min(100, score))
-    tier = _tier_for_score(clamped_score)
+    if rules is None:
+        rules = get_active_ruleset()
+    # NaN never satisfies a Python comparison; the compiled masks treat nulls
+    # the same way.
+    frame = frame.with_columns(cs.float().fill_nan(None))
+    impacts = [rule.impact for rule in rules.ruleset.rules]
+    return frame.select(
+        pl.sum_horizontal(
+            mask.cast(pl.Int64) * impact
+            for mask, impact in zip(rules.masks, impacts, strict=True)
+        )
+        .clip(0, 100)
+        .alias("score"),
+        pl.sum_horizontal(
+            mask.cast(pl.Int64) * (1 << bit) for bit, mask in enumerate(rules.masks)
+        ).alias("fired"),
+    )
 
-    add_recent_evaluation(datetime.now(UTC), clamped_score)
-    return RiskResult(score=clamped_score, tier=tier, factors=factors)
 
+def context_dtype(name: str) -> pl.DataType:
+    """Polars dtype for a scalar ``FlightContext`` field."""
+    return _POLARS_DTYPES[FlightContext.model_fields[name].annotation]
 
-def add_recent_evaluation(timestamp: datetime, score: int) -> None:
-    RECENT_EVALUATIONS.append((timestamp, score))
 
+def add_recent_evaluation(
+    timestamp: datetime,
+    context: FlightContext,
+    risk: RiskResult | RiskAssessment,
+) -> None:
+    """
+    Record an evaluation in the host-wide recent window and live statistics,
+    and queue it for Postgres.
 
-def _tier_for_score(score: int) -> str:
-    if score < 30:
-        return "GO"
-    if score < 60:
-        return "CAUTION"
-    return "NO-GO"
+    The recent window is a shared memory-mapped ring and persistence is
+    write-behind, so this never waits on the database.
+    """
+    RECENT_EVALUATIONS.append(timestamp, risk.score, risk.tier)
+    if isinstance(risk, RiskAssessment):
+        HISTORY_STATS.record(timestamp, risk.score, risk.tier, risk.labels)
+    else:
+        HISTORY_STATS.add(timestamp, risk)
+    HISTORY_WRITER.enqueue(timestamp, context, risk)
+
+
+def tier_for_score(score: int) -> str:
+    """GO/CAUTION/NO-GO tier of a clamped 0-100 score."""
+    return _TIER_BY_SCORE[score]
+
+
+def tier_expr(score: pl.Expr) -> pl.Expr:
+    """``tier_for_score`` over a column of clamped scores."""
+    tiers = pl.lit(_TOP_TIER)
+    for bound, tier in reversed(_TIER_BOUNDS):
+        tiers = pl.when(score < bound).then(pl.lit(tier)).otherwise(tiers)
+    return tiers
+
+
+# Every tier below the top one with its exclusive score bound, lowest first.
+_TIER_BOUNDS = (30, "GO"), (60, "CAUTION")
+_TOP_TIER = "NO-GO"
+_TIER_BY_SCORE = tuple(
+    next((tier for bound, tier in _TIER_BOUNDS if score < bound), _TOP_TIER)
+    for score in range(101)
+)
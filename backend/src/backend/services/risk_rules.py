@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import reduce
+from pathlib import Path
+from typing import Literal, NamedTuple
+
+import polars as pl
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from backend.schemas import FlightContext, RiskFactor
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent.parent / "data" / "risk_rules.json"
+
+# How often (seconds) the active table checks its source file for changes.
+_RELOAD_INTERVAL_S = 1.0
+
+RuleField = Literal[
+    "pilot_total_hours",
+    "pilot_hours_last_90_days",
+    "pilot_instrument_rating",
+    "pilot_night_current",
+    "aircraft_mtow_kg",
+    "planned_takeoff_weight_kg",
+    "conditions_ifr_expected",
+    "conditions_night",
+    "terrain_mountainous",
+    "departure_visibility_sm",
+    "destination_visibility_sm",
+    "departure_ceiling_ft",
+    "destination_ceiling_ft",
+    "max_crosswind_knots",
+    "gusts_knots",
+    "icing_risk_0_1",
+    "turbulence_risk_0_1",
+    # Derived features, computed from the fields above.
+    "mtow_ratio",
+    "gust_spread_knots",
+]
+
+Comparator = Literal["<", "<=", ">", ">=", "==", "!="]
+
+# Python source for each derived feature, evaluated against the context ``c``.
+_DERIVED_SOURCE: dict[str, str] = {
+    "mtow_ratio": "c.planned_takeoff_weight_kg / max(c.aircraft_mtow_kg, 1)",
+    "gust_spread_knots": "c.gusts_knots - c.max_crosswind_knots",
+}
+
+_DERIVED_EXPRS: dict[str, pl.Expr] = {
+    "mtow_ratio": pl.col("planned_takeoff_weight_kg")
+    / pl.max_horizontal(pl.col("aircraft_mtow_kg"), pl.lit(1.0)),
+    "gust_spread_knots": pl.col("gusts_knots") - pl.col("max_crosswind_knots"),
+}
+
+_DERIVED_INPUTS: dict[str, tuple[str, ...]] = {
+    "mtow_ratio": ("planned_takeoff_weight_kg", "aircraft_mtow_kg"),
+    "gust_spread_knots": ("gusts_knots", "max_crosswind_knots"),
+}
+
+
+class RuleCondition(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    field: RuleField
+    op: Comparator
+    value: bool | int | float
+
+
+class RiskRule(BaseModel):
+    """
+    One scoring rule: ``impact`` points when its conditions hold.
+
+    Rules sharing a ``group`` are mutually exclusive; the first one (in table
+    order) whose conditions hold fires and the rest of the group is skipped.
+    """
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    label: str
+    impact: int
+    group: str | None = None
+    match: Literal["all", "any"] = "all"
+    when: list[RuleCondition] = Field(min_length=1)
+
+
+class RuleSet(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    version: str = Field(min_length=1)
+    rules: list[RiskRule] = Field(min_length=1, max_length=62)
+
+
+Evaluator = Callable[[FlightContext], tuple[int, int]]
+
+
+class FactorRecord(NamedTuple):
+    """Interned label and impact of one rule, for paths that skip Pydantic."""
+
+    label: str
+    impact: int
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRuleSet:
+    """
+    A ``RuleSet`` compiled for fast scoring.
+
+    ``evaluate`` returns ``(raw_score, fired)`` where bit ``i`` of ``fired`` is
+    set when rule ``i`` fired. ``masks`` are the equivalent Polars expressions
+    for columnar scoring, one boolean per rule.
+    """
+
+    ruleset: RuleSet
+    evaluate: Evaluator
+    masks: tuple[pl.Expr, ...]
+    columns: tuple[str, ...]
+    _factors_cache: dict[int, tuple[RiskFactor, ...]] = field(
+        default_factory=dict, repr=False
+    )
+    _records_cache: dict[int, tuple[FactorRecord, ...]] = field(
+        default_factory=dict, repr=False
+    )
+    _labels_cache: dict[int, tuple[str, ...]] = field(default_factory=dict, repr=False)
+
+    @property
+    def version(self) -> str:
+        return self.ruleset.version
+
+    def factors_for(self, fired: int) -> tuple[RiskFactor, ...]:
+        """Factors for a fired bitmask, shared between calls with the same mask."""
+        factors = self._factors_cache.get(fired)
+        if factors is None:
+            factors = tuple(
+                RiskFactor(label=rule.label, impact=rule.impact)
+                for bit, rule in enumerate(self.ruleset.rules)
+                if fired >> bit & 1
+            )
+            self._factors_cache[fired] = factors
+        return factors
+
+    def records_for(self, fired: int) -> tuple[FactorRecord, ...]:
+        """Like ``factors_for`` but as plain tuples, with no model construction."""
+        records = self._records_cache.get(fired)
+        if records is None:
+            records = tuple(
+                FactorRecord(rule.label, rule.impact)
+                for bit, rule in enumerate(self.ruleset.rules)
+                if fired >> bit & 1
+            )
+            self._records_cache[fired] = records
+        return records
+
+    def labels_for(self, fired: int) -> tuple[str, ...]:
+        """Interned labels of the fired rules, in table order."""
+        labels = self._labels_cache.get(fired)
+        if labels is None:
+            labels = tuple(record.label for record in self.records_for(fired))
+            self._labels_cache[fired] = labels
+        return labels
+
+
+def compile_ruleset(ruleset: RuleSet) -> CompiledRuleSet:
+    return CompiledRuleSet(
+        ruleset=ruleset,
+        evaluate=_compile_evaluator(ruleset),
+        masks=_compile_masks(ruleset),
+        columns=_required_columns(ruleset),
+    )
+
+
+def load_ruleset(path: Path) -> RuleSet:
+    return RuleSet.model_validate_json(path.read_bytes())
+
+
+def get_active_ruleset() -> CompiledRuleSet:
+    """
+    Return the compiled rule table currently in force.
+
+    The source file (``RISK_RULES_PATH`` or the bundled default) is re-checked
+    at most once per ``_RELOAD_INTERVAL_S``; when it changes, the new table is
+    compiled and swapped in with a single reference assignment, so concurrent
+    scorers always see either the old or the new table, never a mix. A table
+    that fails to parse is logged and the previous one stays active.
+    """
+
+    active = _ACTIVE
+    now = time.monotonic()
+    if active is not None and now < _state.next_check:
+        return active.compiled
+    with _reload_lock:
+        return _refresh(now).compiled
+
+
+def activate_ruleset(ruleset: RuleSet) -> CompiledRuleSet:
+    """Compile ``ruleset`` and make it the active table for this process."""
+    global _ACTIVE
+    compiled = compile_ruleset(ruleset)
+    _ACTIVE = _ActiveRuleSet(compiled=compiled, source=None)
+    return compiled
+
+
+def rules_path() -> Path:
+    return Path(os.getenv("RISK_RULES_PATH") or DEFAULT_RULES_PATH)
+
+
+@dataclass(frozen=True, slots=True)
+class _ActiveRuleSet:
+    compiled: CompiledRuleSet
+    # (path, size, mtime_ns) of the file the table was loaded from.
+    source: tuple[Path, int, int] | None
+
+
+@dataclass(slots=True)
+class _ReloadState:
+    next_check: float = 0.0
+
+
+_ACTIVE: _ActiveRuleSet | None = None
+_state = _ReloadState()
+_reload_lock = threading.Lock()
+
+
+def _refresh(now: float) -> _ActiveRuleSet:
+    global _ACTIVE
+    _state.next_check = now + _RELOAD_INTERVAL_S
+    active = _ACTIVE
+    if active is not None and active.source is None:
+        # Activated programmatically; file reloads resume only via reset.
+        return active
+
+    path = rules_path()
+    try:
+        stat = path.stat()
+        source = (path, stat.st_size, stat.st_mtime_ns)
+        if active is not None and active.source == source:
+            return active
+        compiled = compile_ruleset(load_ruleset(path))
+    except (OSError, ValidationError) as exc:
+        if active is None:
+            raise
+        logger.error(f"Keeping risk rules {active.compiled.version}: {exc}")
+        return active
+
+    _ACTIVE = _ActiveRuleSet(compiled=compiled, source=source)
+    if active is not None:
+        logger.info(
+            f"Risk rules reloaded: {active.compiled.version} → {compiled.version}"
+        )
+    return _ACTIVE
+
+
+def _reset_active_ruleset() -> None:
+    """Forget the active table so the next lookup reloads it from disk."""
+    global _ACTIVE
+    _ACTIVE = None
+    _state.next_check = 0.0
+
+
+def _compile_evaluator(ruleset: RuleSet) -> Evaluator:
+    used = {cond.field for rule in ruleset.rules for cond in rule.when}
+    lines = ["def evaluate(c):", "    score = 0", "    fired = 0"]
+    lines.extend(
+        f"    {name} = {source}"
+        for name, source in _DERIVED_SOURCE.items()
+        if name in used
+    )
+
+    emitted: set[str] = set()
+    for bit, rule in enumerate(ruleset.rules):
+        if rule.group is None:
+            lines.extend(_rule_branch("if", bit, rule))
+            continue
+        if rule.group in emitted:
+            continue
+        emitted.add(rule.group)
+        keyword = "if"
+        for member_bit, member in enumerate(ruleset.rules):
+            if member.group == rule.group:
+                lines.extend(_rule_branch(keyword, member_bit, member))
+                keyword = "elif"
+    lines.append("    return score, fired")
+
+    namespace: dict[str, object] = {}
+    code = compile("\n".join(lines), f"<risk rules {ruleset.version}>", "exec")
+    exec(code, namespace)
+    return namespace["evaluate"]  # type: ignore[return-value]
+
+
+def _rule_branch(keyword: str, bit: int, rule: RiskRule) -> list[str]:
+    joiner = " and " if rule.match == "all" else " or "
+    test = joiner.join(_condition_source(cond) for cond in rule.when)
+    return [
+        f"    {keyword} {test}:",
+        f"        score += {rule.impact!r}",
+        f"        fired |= {1 << bit}",
+    ]
+
+
+def _condition_source(cond: RuleCondition) -> str:
+    subject = cond.field if cond.field in _DERIVED_SOURCE else f"c.{cond.field}"
+    if cond.op == "!=":
+        # NaN != x holds in Python; like the null masks, NaN matches nothing.
+        return f"({subject} != {cond.value!r} and {subject} == {subject})"
+    return f"({subject} {cond.op} {cond.value!r})"
+
+
+def _compile_masks(ruleset: RuleSet) -> tuple[pl.Expr, ...]:
+    masks: list[pl.Expr] = []
+    taken: dict[str, pl.Expr] = {}
+    for rule in ruleset.rules:
+        conditions = [_condition_expr(cond) for cond in rule.when]
+        if rule.match == "all":
+            mask = reduce(lambda left, right: left & right, conditions)
+        else:
+            mask = reduce(lambda left, right: left | right, conditions)
+        # Nulls stand in for NaN, which never satisfies a Python comparison.
+        mask = mask.fill_null(False)
+        if rule.group is not None:
+            previous = taken.get(rule.group)
+            if previous is not None:
+                mask = mask & ~previous
+                taken[rule.group] = previous | mask
+            else:
+                taken[rule.group] = mask
+        masks.append(mask)
+    return tuple(masks)
+
+
+def _condition_expr(cond: RuleCondition) -> pl.Expr:
+    subject = _DERIVED_EXPRS.get(cond.field, pl.col(cond.field))
+    value = pl.lit(cond.value)
+    match cond.op:
+        case "<":
+            return subject < value
+        case "<=":
+            return subject <= value
+        case ">":
+            return subject > value
+        case ">=":
+            return subject >= value
+        case "==":
+            return subject == value
+        case "!=":
+            return subject != value
+
+
+def _required_columns(ruleset: RuleSet) -> tuple[str, ...]:
+    columns: dict[str, None] = {}
+    for rule in ruleset.rules:
+        for cond in rule.when:
+            for name in _DERIVED_INPUTS.get(cond.field, (cond.field,)):
+                columns[name] = None
+    return tuple(columns)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import polars as pl
+
+from backend.schemas import RiskResult, SweepPoint, SweepRequest, SweepResult
+from backend.services.risk_engine import (
+    context_dtype,
+    score_frame,
+    tier_expr,
+    tier_for_score,
+)
+from backend.services.risk_rules import get_active_ruleset
+
+
+def sweep_risk(request: SweepRequest) -> SweepResult:
+    """
+    Score every combination of the requested axes in one columnar pass.
+
+    Axes are cross-joined into a grid, fields not being swept are taken from
+    ``request.base``, and the whole grid goes through the vectorized rule
+    table at once. Only the ``top_k`` lowest-risk points get full factor
+    lists; the rest of the surface is returned as bare scores and tiers.
+    Sweeps are what-if runs and are not recorded in the evaluation history.
+    """
+
+    rules = get_active_ruleset()
+    grid = _build_grid(request)
+    constants = [
+        pl.lit(getattr(request.base, name), dtype=context_dtype(name)).alias(name)
+        for name in rules.columns
+        if name not in grid.columns
+    ]
+    scored = score_frame(grid.with_columns(constants), rules).with_row_index("index")
+
+    surface = scored.select(pl.col("score"), tier_expr(pl.col("score")).alias("tier"))
+
+    # Stable on the grid index, so ties favour earlier points.
+    best_rows = scored.sort("score", "index").head(request.top_k)
+    best_frame = grid[best_rows.get_column("index")]
+    shape = [len(axis) for axis in request.axes]
+    best = [
+        SweepPoint(
+            index=index,
+            coordinates=_unravel(index, shape),
+            values=values,
+            risk=RiskResult(
+                score=score,
+                tier=tier_for_score(score),
+                factors=list(rules.factors_for(fired)),
+                ruleset_version=rules.version,
+            ),
+        )
+        for (index, score, fired), values in zip(
+            best_rows.iter_rows(),
+            best_frame.iter_rows(named=True),
+            strict=True,
+        )
+    ]
+
+    return SweepResult(
+        axes=[axis.label for axis in request.axes],
+        shape=shape,
+        scores=surface.get_column("score").to_list(),
+        tiers=surface.get_column("tier").to_list(),
+        best=best,
+        ruleset_version=rules.version,
+    )
+
+
+def _build_grid(request: SweepRequest) -> pl.DataFrame:
+    grid: pl.DataFrame | None = None
+    for axis in request.axes:
+        frame = pl.DataFrame(
+            axis.values,
+            schema_overrides={
+                name: context_dtype(name)
+                for name in axis.values
+                if name != "departure_time_utc"
+            },
+        )
+        # Left rows stay outermost, giving the row-major layout of ``shape``.
+        grid = (
+            frame
+            if grid is None
+            else grid.join(frame, how="cross", maintain_order="left_right")
+        )
+    assert grid is not None
+    return grid
+
+
+def _unravel(index: int, shape: list[int]) -> list[int]:
+    coordinates: list[int] = []
+    for size in reversed(shape):
+        index, position = divmod(index, size)
+        coordinates.append(position)
+    return coordinates[::-1]
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import fcntl
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import weakref
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from loguru import logger
+
+_MAGIC = b"CLRSKYRB"
+_FORMAT_VERSION = 2
+# magic, format version, writer slots, records per slot
+_HEADER = struct.Struct("<8sIII")
+_HEADER_SIZE = 64
+# owning pid, total records ever appended to the slot
+_SLOT_HEADER = struct.Struct("<qQ")
+_PID = struct.Struct("<q")
+_TOTAL = struct.Struct("<Q")
+# timestamp (µs since epoch), score, tier code, padding to 16 bytes
+_RECORD = struct.Struct("<qhB5x")
+_TIERS = ("GO", "CAUTION", "NO-GO")
+_TIER_CODES = {tier: code for code, tier in enumerate(_TIERS)}
+_UNKNOWN_TIER = len(_TIERS)
+_SLOT_HEADER_SIZE = _SLOT_HEADER.size
+_RECORD_SIZE = _RECORD.size
+
+_DEFAULT_SLOTS = 64
+_DEFAULT_CAPACITY = 1024
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+_OPEN_RINGS: weakref.WeakSet[SharedRingBuffer] = weakref.WeakSet()
+
+
+def default_ring_path() -> Path:
+    """Shared-memory backed file when available, so every worker maps the same pages."""
+    configured = os.getenv("EVALUATION_RING_PATH")
+    if configured:
+        return Path(configured)
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() else Path(tempfile.gettempdir())
+    return base / "clearsky-evaluations.ring"
+
+
+class SharedRingBuffer:
+    """
+    Recent evaluations shared by every worker process on a host.
+
+    The rings live in one memory-mapped file (under ``/dev/shm`` by default)
+    of fixed-size records. Each process claims its own slot the first time it
+    appends, so appends never contend: the owner copies one 16-byte record and
+    then bumps the slot's counter, without locks shared with other processes
+    or syscalls. Readers check the counter before and after copying and drop
+    records that may have been overwritten meanwhile, then merge all slots by
+    timestamp, so every worker returns the same window. Slots of exited
+    processes are handed to the next process that needs one, records included.
+
+    The file is created lazily; whoever creates it decides the number of slots
+    and the per-slot ``capacity``.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        capacity: int | None = None,
+        slots: int | None = None,
+    ) -> None:
+        self._path = path
+        self._capacity = capacity or int(
+            os.getenv("EVALUATION_RING_CAPACITY", _DEFAULT_CAPACITY)
+        )
+        self._slots = slots or int(os.getenv("EVALUATION_RING_SLOTS", _DEFAULT_SLOTS))
+        self._fd: int | None = None
+        self._map: mmap.mmap | None = None
+        self._slot_base: int | None = None
+        self._total = 0
+        self._exhausted = False
+        self._lock = threading.Lock()
+        _OPEN_RINGS.add(self)
+
+    @property
+    def path(self) -> Path:
+        return self._path or default_ring_path()
+
+    @property
+    def capacity(self) -> int:
+        """Records kept per writer process."""
+        self._ensure_open()
+        return self._capacity
+
+    def append(self, timestamp: datetime, score: int, tier: str) -> None:
+        if self._slot_base is None and (self._exhausted or self._claim_slot() is None):
+            return
+        micros = (timestamp - _EPOCH) // _MICROSECOND
+        code = _TIER_CODES.get(tier, _UNKNOWN_TIER)
+        with self._lock:
+            buffer, base = self._map, self._slot_base
+            if buffer is None or base is None:
+                return
+            # Single writer per slot, so our own copy of the counter is current.
+            total = self._total
+            _RECORD.pack_into(
+                buffer,
+                base + _SLOT_HEADER_SIZE + total % self._capacity * _RECORD_SIZE,
+                micros,
+                score,
+                code,
+            )
+            _TOTAL.pack_into(buffer, base + 8, total + 1)
+            self._total = total + 1
+
+    def snapshot(self, limit: int | None = None) -> list[tuple[datetime, int, str]]:
+        """The most recent ``limit`` records (all by default), oldest first."""
+        buffer, _ = self._ensure_open()
+        per_slot = self._capacity if limit is None else min(limit, self._capacity)
+        runs = [self._read_slot(buffer, slot, per_slot) for slot in range(self._slots)]
+        merged = list(heapq.merge(*runs))
+        if limit is not None:
+            merged = merged[max(0, len(merged) - limit) :] if limit else []
+        return [
+            (
+                _EPOCH + timedelta(microseconds=micros),
+                score,
+                _TIERS[code] if code < len(_TIERS) else "NO-GO",
+            )
+            for micros, score, code in merged
+        ]
+
+    def clear(self) -> None:
+        """Forget every record (for tests; other live writers keep counting)."""
+        buffer, fd = self._ensure_open()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            for slot in range(self._slots):
+                _TOTAL.pack_into(buffer, self._slot_offset(slot) + 8, 0)
+            self._total = 0
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._slot_base = None
+
+    def __iter__(self) -> Iterator[tuple[datetime, int]]:
+        return iter([(timestamp, score) for timestamp, score, _ in self.snapshot()])
+
+    def __len__(self) -> int:
+        buffer, _ = self._ensure_open()
+        return sum(
+            min(
+                _TOTAL.unpack_from(buffer, self._slot_offset(slot) + 8)[0],
+                self._capacity,
+            )
+            for slot in range(self._slots)
+        )
+
+    def _read_slot(
+        self, buffer: mmap.mmap, slot: int, count: int
+    ) -> list[tuple[int, int, int]]:
+        base = self._slot_offset(slot)
+        records = base + _SLOT_HEADER.size
+        before = _TOTAL.unpack_from(buffer, base + 8)[0]
+        first = max(0, before - count)
+        rows = [
+            _RECORD.unpack_from(
+                buffer, records + (sequence % self._capacity) * _RECORD.size
+            )
+            for sequence in range(first, before)
+        ]
+        after = _TOTAL.unpack_from(buffer, base + 8)[0]
+        # Sequences the owner may have wrapped over while we were copying.
+        overwritten = after - self._capacity - first
+        return rows[overwritten:] if overwritten > 0 else rows
+
+    def _slot_offset(self, slot: int) -> int:
+        return _HEADER_SIZE + slot * (_SLOT_HEADER.size + self._capacity * _RECORD.size)
+
+    def _claim_slot(self) -> int | None:
+        """Take a free or abandoned slot; returns its offset in the file."""
+        buffer, fd = self._ensure_open()
+        pid = os.getpid()
+        with self._lock:
+            if self._slot_base is not None:
+                return self._slot_base
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                for slot in range(self._slots):
+                    offset = self._slot_offset(slot)
+                    owner = _PID.unpack_from(buffer, offset)[0]
+                    if owner in (0, pid) or not _is_alive(owner):
+                        _PID.pack_into(buffer, offset, pid)
+                        self._slot_base = offset
+                        self._total = _TOTAL.unpack_from(buffer, offset + 8)[0]
+                        return offset
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._exhausted = True
+        logger.warning(
+            f"All {self._slots} evaluation ring slots at {self.path} are taken; "
+            "this worker's evaluations will not appear in the shared window"
+        )
+        return None
+
+    def _forget_slot(self) -> None:
+        # A forked child must not keep writing into its parent's slot.
+        self._lock = threading.Lock()
+        self._slot_base = None
+        self._exhausted = False
+
+    def _ensure_open(self) -> tuple[mmap.mmap, int]:
+        buffer, fd = self._map, self._fd
+        if buffer is None or fd is None:
+            with self._lock:
+                if self._map is None or self._fd is None:
+                    self._open()
+                buffer, fd = self._map, self._fd
+        assert buffer is not None and fd is not None
+        return buffer, fd
+
+    def _open(self) -> None:
+        path = self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            header = os.pread(fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size:
+                magic, version, slots, capacity = _HEADER.unpack(header)
+            else:
+                magic, version, slots, capacity = b"", 0, 0, 0
+            if magic != _MAGIC or version != _FORMAT_VERSION or not slots * capacity:
+                slots, capacity = self._slots, self._capacity
+                os.ftruncate(fd, 0)
+                os.ftruncate(
+                    fd,
+                    _HEADER_SIZE
+                    + slots * (_SLOT_HEADER.size + capacity * _RECORD.size),
+                )
+                os.pwrite(fd, _HEADER.pack(_MAGIC, _FORMAT_VERSION, slots, capacity), 0)
+            elif (slots, capacity) != (self._slots, self._capacity):
+                logger.info(
+                    f"Evaluation ring at {path} already sized for {slots} writers "
+                    f"of {capacity} records"
+                )
+            self._slots, self._capacity = slots, capacity
+            self._map = mmap.mmap(fd, self._slot_offset(slots))
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+
+def _forget_slots_after_fork() -> None:
+    for ring in list(_OPEN_RINGS):
+        ring._forget_slot()
+
+
+os.register_at_fork(after_in_child=_forget_slots_after_fork)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+RECENT_EVALUATIONS = SharedRingBuffer()
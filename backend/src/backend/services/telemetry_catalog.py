@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Collection
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+
+import polars as pl
+from loguru import logger
+from pydantic import BaseModel, ConfigDict
+
+from backend.services import telemetry_tools
+from backend.services.telemetry_tools import (
+    ALL_SORTIES,
+    _data_key,
+    _time_column,
+    _time_expr,
+    load_sortie_file,
+)
+
+_DEFAULT_AIRFRAME_COLUMN = "AIRFRAME"
+# 2024-05-01, 2024_05_01 or 20240501 anywhere in a file name.
+_DATE_IN_NAME = re.compile(r"(?<!\d)(\d{4})[-_]?(\d{2})[-_]?(\d{2})(?!\d)")
+
+
+class UnknownSortieError(ValueError):
+    pass
+
+
+class SortieInfo(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    sortie: str
+    path: str
+    airframe: str | None
+    date: date | None
+    # Seconds from the first to the last sample; None without a time column.
+    duration_s: float | None
+    rows: int
+    size_bytes: int
+    mtime_ns: int
+
+
+class SortieCatalog:
+    """
+    The sortie files of a telemetry directory and their metadata.
+
+    Every ``*.csv`` under the directory (``TELEMETRY_DIR``, by default the
+    directory of ``DATA_PATH``) is one sortie, identified by its path relative
+    to the directory without the suffix, e.g. ``F16-0042/2024-05-01_am``.
+    Sorties in a subdirectory belong to the airframe it is named after;
+    top-level files take their airframe from an ``AIRFRAME`` column when there
+    is one.
+
+    A rescan ingests new and changed files in a pool of processes: each worker
+    parses its CSVs, writes their Arrow sidecars (see
+    ``telemetry_tools.sidecar_path``) and measures them, so the analyzers only
+    ever memory-map ingested sorties. Unchanged files are not read again. A
+    file that cannot be ingested is logged and left out of the catalog until
+    it changes; the other sorties are unaffected.
+    Once started, a background task rescans every
+    ``TELEMETRY_CATALOG_RESCAN_S`` seconds (default 60) and lookups read the
+    last scan; without it a lookup rescans when the last scan is older than
+    that. Only the very first lookup of a directory waits for a scan.
+    ``refresh`` rescans at once.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self._directory = directory
+        self._sorties: dict[str, SortieInfo] = {}
+        self._scanned: Path | None = None
+        self._scanned_at = 0.0
+        # Sorties that could not be ingested, by the (size, mtime) they had.
+        self._failed: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self.rescan_s = float(os.getenv("TELEMETRY_CATALOG_RESCAN_S", "60"))
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is not None:
+            return self._directory
+        configured = os.getenv("TELEMETRY_DIR")
+        return Path(configured) if configured else telemetry_tools.DATA_PATH.parent
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Rescan the directory in the background from now on."""
+        if self.running or self.rescan_s <= 0:
+            return
+        self._task = asyncio.get_running_loop().create_task(
+            self._rescan(), name="telemetry-catalog-rescan"
+        )
+
+    async def stop(self) -> None:
+        """Stop rescanning; a scan in progress finishes in its thread."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def sorties(self) -> list[SortieInfo]:
+        """Every sortie in the directory as of the last scan."""
+        return self._cataloged()
+
+    def get(self, sortie: str) -> SortieInfo:
+        return self.select(sortie)[0]
+
+    def select(self, sorties: str | Collection[str]) -> list[SortieInfo]:
+        """
+        The sorties a selector names, in catalog order: one sortie id, a
+        collection of ids, or ``ALL_SORTIES``.
+        """
+
+        cataloged = self._cataloged()
+        if sorties == ALL_SORTIES:
+            if not cataloged:
+                raise FileNotFoundError(f"No sortie files found in {self.directory}")
+            return cataloged
+        wanted = {sorties} if isinstance(sorties, str) else set(sorties)
+        if not wanted:
+            raise UnknownSortieError("No sorties selected")
+        unknown = wanted.difference(info.sortie for info in cataloged)
+        if unknown:
+            raise UnknownSortieError(
+                f"Unknown sortie(s) {', '.join(sorted(unknown))} in {self.directory}"
+            )
+        return [info for info in cataloged if info.sortie in wanted]
+
+    def refresh(self, workers: int | None = None) -> list[SortieInfo]:
+        """
+        Rescan the directory, ingesting new and changed files in parallel.
+
+        Unchanged files cost one ``stat`` each, so rescanning is cheap.
+        """
+
+        with self._lock:
+            self._refresh(workers)
+            return list(self._sorties.values())
+
+    def _cataloged(self) -> list[SortieInfo]:
+        if not self._current():
+            with self._lock:
+                # Another thread may have scanned while this one waited.
+                if not self._current():
+                    self._refresh()
+        return list(self._sorties.values())
+
+    def _current(self) -> bool:
+        if self._scanned != self.directory:
+            return False
+        return self.running or time.monotonic() - self._scanned_at < self.rescan_s
+
+    async def _rescan(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                logger.exception(f"Could not rescan sorties in {self.directory}")
+            await asyncio.sleep(self.rescan_s)
+
+    def _refresh(self, workers: int | None = None) -> None:
+        root = self.directory
+        previous = self._sorties if self._scanned == root else {}
+        failed = self._failed if self._scanned == root else {}
+        current: dict[str, SortieInfo | None] = {}
+        failures: dict[str, tuple[int, int]] = {}
+        # (size, mtime) of the files to ingest, by sortie id, in ``pending`` order.
+        waiting: dict[str, tuple[int, int]] = {}
+        pending: list[tuple[str, str]] = []
+        for path in _sortie_files(root):
+            sortie = path.relative_to(root).with_suffix("").as_posix()
+            try:
+                _, size, mtime_ns = _data_key(path)
+            except OSError:
+                continue  # Removed since the directory was listed.
+            known = previous.get(sortie)
+            if known is not None and (known.size_bytes, known.mtime_ns) == (
+                size,
+                mtime_ns,
+            ):
+                current[sortie] = known
+            elif failed.get(sortie) == (size, mtime_ns):
+                failures[sortie] = (size, mtime_ns)
+            else:
+                current[sortie] = None
+                waiting[sortie] = (size, mtime_ns)
+                pending.append((str(root), str(path)))
+
+        ingested = _ingest_all(pending, workers)
+        for (sortie, key), info in zip(waiting.items(), ingested, strict=True):
+            current[sortie] = info
+            if info is None:
+                failures[sortie] = key
+        self._failed = failures
+        self._sorties = {
+            sortie: info for sortie, info in current.items() if info is not None
+        }
+        self._scanned = root
+        self._scanned_at = time.monotonic()
+        if pending:
+            logger.info(
+                f"Ingested {sum(info is not None for info in ingested)} of "
+                f"{len(pending)} sortie file(s); "
+                f"{len(self._sorties)} sorties cataloged in {root}"
+            )
+
+
+def ingest_workers() -> int:
+    """Processes used to ingest sortie files (``TELEMETRY_INGEST_WORKERS``)."""
+    configured = os.getenv("TELEMETRY_INGEST_WORKERS")
+    return max(1, int(configured) if configured else os.cpu_count() or 1)
+
+
+def ingest_sortie(root: str, path: str) -> SortieInfo:
+    """
+    Load (or convert) one sortie file and describe it.
+
+    Runs in the ingestion worker processes, so it only takes and returns
+    picklable values.
+    """
+
+    root_dir, file = Path(root), Path(path)
+    key = _data_key(file)
+    frame = load_sortie_file(file, key)
+    schema = frame.schema
+    relative = file.relative_to(root_dir)
+
+    airframe: str | None = None
+    airframe_column = _airframe_column(schema)
+    if len(relative.parts) > 1:
+        airframe = relative.parts[0]
+    elif airframe_column is not None:
+        value = frame.get_column(airframe_column).drop_nulls().first()
+        airframe = None if value is None else str(value)
+
+    duration_s: float | None = None
+    sortie_date = _date_from_name(file.stem)
+    time_column = _time_column(schema)
+    if time_column is not None:
+        times = frame.select(_time_expr(schema, 0)).to_series().drop_nulls()
+        if times.len():
+            duration_s = float(times.last() - times.first())
+        if sortie_date is None and schema[time_column] in (pl.Date, pl.Datetime):
+            first = frame.get_column(time_column).drop_nulls().first()
+            if first is not None:
+                sortie_date = first if type(first) is date else first.date()
+
+    return SortieInfo(
+        sortie=relative.with_suffix("").as_posix(),
+        path=str(file),
+        airframe=airframe,
+        date=sortie_date,
+        duration_s=duration_s,
+        rows=frame.height,
+        size_bytes=key[1],
+        mtime_ns=key[2],
+    )
+
+
+def _ingest_all(
+    pending: list[tuple[str, str]], workers: int | None = None
+) -> list[SortieInfo | None]:
+    """Ingest ``pending`` files in order; ``None`` (logged) for those that fail."""
+    workers = min(workers or ingest_workers(), len(pending))
+    if workers <= 1:
+        return [_outcome(path, ingest_sortie, root, path) for root, path in pending]
+    # Spawned, not forked: forking a process whose Polars thread pool is
+    # running can deadlock the child.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_limit_polars_threads,
+        initargs=(max(1, (os.cpu_count() or 1) // workers),),
+    ) as pool:
+        futures = [
+            (path, pool.submit(ingest_sortie, root, path)) for root, path in pending
+        ]
+        return [_outcome(path, future.result) for path, future in futures]
+
+
+def _outcome(
+    path: str, ingest: Callable[..., SortieInfo], *args: str
+) -> SortieInfo | None:
+    try:
+        return ingest(*args)
+    except Exception as exc:
+        logger.error(f"Could not ingest sortie file {path}: {exc}")
+        return None
+
+
+def _limit_polars_threads(threads: int) -> None:
+    # Runs first thing in each ingestion worker, before its Polars thread pool
+    # starts: without a cap every worker would start a thread per core and
+    # the pool would oversubscribe the machine.
+    os.environ["POLARS_MAX_THREADS"] = str(threads)
+
+
+def _sortie_files(root: Path) -> list[Path]:
+    if not root.is_dir():
+        return []
+    return sorted(
+        path
+        for path in root.rglob("*.csv")
+        if not any(part.startswith(".") for part in path.relative_to(root).parts)
+    )
+
+
+def _airframe_column(schema: pl.Schema) -> str | None:
+    column = os.getenv("TELEMETRY_AIRFRAME_COLUMN", _DEFAULT_AIRFRAME_COLUMN)
+    return column if column in schema else None
+
+
+def _date_from_name(name: str) -> date | None:
+    match = _DATE_IN_NAME.search(name)
+    if match is None:
+        return None
+    try:
+        return date(*(int(part) for part in match.groups()))
+    except ValueError:
+        return None
+
+
+TELEMETRY_CATALOG = SortieCatalog()
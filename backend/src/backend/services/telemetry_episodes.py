@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Literal
+
+import polars as pl
+from pydantic import BaseModel, ConfigDict
+
+from backend.services.telemetry_tools import (
+    HIGH_AOA_DEG,
+    HIGH_SIDESLIP_DEG,
+    SingleFlight,
+    SortieSelector,
+    TelemetryEngine,
+    _data_key,
+    _load_dataframe,
+    _load_sortie,
+    _resolve_sorties,
+    _scan_telemetry,
+    _sortie_column,
+    _sortie_expr,
+    _time_column,
+    _time_expr,
+    require_columns,
+    telemetry_engine,
+)
+
+ExcursionChannel = Literal["aoa", "sideslip"]
+# Per channel: the indexed signal, the default episode threshold and the
+# lowest threshold the index can answer (only samples above it are kept).
+_CHANNELS: dict[str, tuple[pl.Expr, float, float]] = {
+    "aoa": (pl.col("AOA"), HIGH_AOA_DEG, 8.0),
+    "sideslip": (pl.col("AOSS").abs(), HIGH_SIDESLIP_DEG, 5.0),
+}
+require_columns("episodes", ["AOA", "AOSS", "EVENT"])
+DEFAULT_EPISODE_LIMIT = 100
+_INDEX_CACHE_SIZE = 32
+# Episode tables memoized per index, by (channel, threshold).
+_EPISODE_CACHE_SIZE = 8
+
+_INDEXES: OrderedDict[tuple[str, int, int], EpisodeIndex] = OrderedDict()
+_INDEXES_LOCK = threading.Lock()
+_BUILDING = SingleFlight()
+
+
+class InvalidEpisodeQueryError(ValueError):
+    pass
+
+
+class ExcursionEpisode(BaseModel):
+    """
+    One contiguous run of samples over the threshold. ``end`` is the time the
+    signal dropped back under it (the last sample's time at the end of the
+    data), so ``duration`` is in ``time_basis`` units like the WOW segments.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    sortie: str
+    start: float
+    end: float
+    duration: float
+    # Highest value of the signal (|AOSS| for sideslip) and when it occurred.
+    peak: float
+    peak_time: float
+    # First EVENT code recorded during the episode.
+    event: int | None
+    samples: int
+
+
+class EpisodeQueryResult(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    channel: ExcursionChannel
+    threshold: float
+    time_basis: str
+    num_episodes: int
+    total_duration: float
+    # The first ``limit`` episodes in time order.
+    episodes: list[ExcursionEpisode]
+
+
+class EpisodeIndex:
+    """
+    Interval index of the AOA and sideslip excursions of one sortie file.
+
+    Built in one pass that keeps only the samples above each channel's floor
+    threshold, with their row number. Episodes over any threshold at or above
+    the floor are the runs of consecutive rows among those samples, found by
+    run-length encoding them, so queries never touch the full frame again.
+    Rows appended to the file later are indexed on their own (see
+    ``extended``).
+    """
+
+    def __init__(
+        self, sortie: str, time_basis: str, samples: dict[str, pl.DataFrame]
+    ) -> None:
+        self.sortie = sortie
+        self.time_basis = time_basis
+        self._samples = samples
+        self._episodes: OrderedDict[tuple[str, float], pl.DataFrame] = OrderedDict()
+        self._episodes_lock = threading.Lock()
+
+    @classmethod
+    def build(
+        cls, sortie: str, path: Path, engine: TelemetryEngine | None = None
+    ) -> EpisodeIndex:
+        engine = engine or telemetry_engine()
+        scan = (
+            _load_dataframe(path).lazy() if engine == "eager" else _scan_telemetry(path)
+        )
+        schema = scan.collect_schema()
+        return cls(
+            sortie,
+            _time_column(schema) or "row",
+            _collect_samples(scan, schema, sortie, 0, engine),
+        )
+
+    def extended(self, frame: pl.DataFrame, rows: int) -> EpisodeIndex:
+        """
+        This index of the first ``rows`` rows of ``frame`` brought up to date
+        with the rows after them. The last indexed row is indexed again: an
+        episode it ends may now continue into the new rows.
+        """
+
+        start = max(rows - 1, 0)
+        added = _collect_samples(
+            frame.slice(start).lazy(), frame.schema, self.sortie, start, "eager"
+        )
+        samples = {}
+        for name, indexed in self._samples.items():
+            kept = indexed.get_column("row").search_sorted(start)
+            samples[name] = pl.concat([indexed.head(kept), added[name]])
+        return EpisodeIndex(self.sortie, self.time_basis, samples)
+
+    def episodes(
+        self,
+        channel: ExcursionChannel,
+        threshold: float | None = None,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> pl.DataFrame:
+        """
+        Episodes of ``channel`` over ``threshold`` that overlap ``[start,
+        end]``, one row per episode in time order.
+        """
+
+        if channel not in _CHANNELS:
+            raise InvalidEpisodeQueryError(
+                f"Unknown channel {channel!r}; available: {', '.join(_CHANNELS)}"
+            )
+        _, default, floor = _CHANNELS[channel]
+        threshold = default if threshold is None else threshold
+        if threshold < floor:
+            raise InvalidEpisodeQueryError(
+                f"{channel} episodes are indexed for thresholds of {floor} and up"
+            )
+        key = (channel, threshold)
+        with self._episodes_lock:
+            episodes = self._episodes.get(key)
+            if episodes is not None:
+                self._episodes.move_to_end(key)
+        if episodes is None:
+            episodes = _run_lengths(
+                self._samples[channel].filter(pl.col("value") > threshold),
+                self.sortie,
+            )
+            with self._episodes_lock:
+                self._episodes[key] = episodes
+                while len(self._episodes) > _EPISODE_CACHE_SIZE:
+                    self._episodes.popitem(last=False)
+        if start is not None:
+            episodes = episodes.filter(pl.col("end") >= start)
+        if end is not None:
+            episodes = episodes.filter(pl.col("start") <= end)
+        return episodes
+
+
+def episode_index(
+    sortie: str, path: Path, engine: TelemetryEngine | None = None
+) -> EpisodeIndex:
+    """
+    The episode index of one sortie file, built once per file version. With
+    the eager engine, a version appended to an indexed one only has its new
+    rows indexed.
+    """
+
+    engine = engine or telemetry_engine()
+    key = _data_key(path)
+    with _BUILDING(key):
+        with _INDEXES_LOCK:
+            index = _INDEXES.get(key)
+            if index is not None:
+                _INDEXES.move_to_end(key)
+                return index
+            earlier = [
+                (version, index)
+                for version, index in _INDEXES.items()
+                if version[0] == key[0]
+            ]
+        index = None
+        if engine == "eager" and earlier:
+            loaded = _load_sortie(path)
+            version, indexed = earlier[-1]
+            rows = loaded.prefix_rows(version)
+            if rows is not None:
+                index = indexed.extended(loaded.frame, rows)
+        if index is None:
+            index = EpisodeIndex.build(sortie, path, engine)
+        with _INDEXES_LOCK:
+            _INDEXES[key] = index
+            while len(_INDEXES) > _INDEX_CACHE_SIZE:
+                _INDEXES.popitem(last=False)
+        return index
+
+
+def find_episodes(
+    channel: ExcursionChannel,
+    threshold: float | None = None,
+    start: float | None = None,
+    end: float | None = None,
+    sorties: SortieSelector = None,
+    limit: int = DEFAULT_EPISODE_LIMIT,
+    engine: TelemetryEngine | None = None,
+) -> EpisodeQueryResult:
+    """
+    High-AOA or high-sideslip excursion episodes of the selected sorties,
+    optionally over a custom ``threshold`` and within ``[start, end]``.
+    """
+
+    time_basis: str | None = None
+    frames: list[pl.DataFrame] = []
+    for sortie, path in _resolve_sorties(sorties):
+        index = episode_index(sortie, path, engine)
+        time_basis = time_basis or index.time_basis
+        frames.append(index.episodes(channel, threshold, start, end))
+    episodes = pl.concat(frames)
+    return EpisodeQueryResult(
+        channel=channel,
+        threshold=_CHANNELS[channel][1] if threshold is None else threshold,
+        time_basis=time_basis or "row",
+        num_episodes=episodes.height,
+        total_duration=float(episodes.get_column("duration").sum()),
+        episodes=[
+            ExcursionEpisode(**episode) for episode in episodes.head(limit).to_dicts()
+        ],
+    )
+
+
+def count_episodes(
+    sources: list[tuple[str, Path]], engine: TelemetryEngine | None = None
+) -> dict[str, int]:
+    """Episodes over the default thresholds of every channel in ``sources``."""
+    counts = dict.fromkeys(_CHANNELS, 0)
+    for sortie, path in sources:
+        index = episode_index(sortie, path, engine)
+        for channel in _CHANNELS:
+            counts[channel] += index.episodes(channel).height  # type: ignore[arg-type]
+    return counts
+
+
+def _collect_samples(
+    scan: pl.LazyFrame,
+    schema: pl.Schema,
+    sortie: str,
+    row_offset: int,
+    engine: TelemetryEngine,
+) -> dict[str, pl.DataFrame]:
+    """The samples of ``scan`` above each channel's floor, by channel."""
+    time = _time_expr(schema, row_offset)
+    time_column = _time_column(schema)
+    sortie_column = _sortie_column(schema)
+    # Time the run of a sample ends at if it is the run's last sample: the
+    # next sample's time, or its own (the next row, on a row basis) at the
+    # end of the sortie.
+    next_time = time.shift(-1)
+    if sortie_column is not None:
+        same_sortie = pl.col(sortie_column).shift(-1).eq_missing(pl.col(sortie_column))
+        next_time = pl.when(same_sortie).then(next_time)
+    next_time = next_time.fill_null(time if time_column else time + 1)
+    columns = ["row", "time", "next_time", "event"]
+    # Files without a sortie column are one sortie: no per-sample ids.
+    sortie_ids = []
+    if sortie_column is not None:
+        sortie_ids.append(_sortie_expr(schema).fill_null(sortie).alias("sortie"))
+        columns.append("sortie")
+    rows = scan.select(
+        (pl.int_range(pl.len()) + row_offset).alias("row"),
+        time.alias("time"),
+        next_time.alias("next_time"),
+        pl.col("EVENT").cast(pl.Int64, strict=False).alias("event"),
+        *sortie_ids,
+        *(signal.alias(name) for name, (signal, _, _) in _CHANNELS.items()),
+    )
+    collected = pl.collect_all(
+        [
+            rows.filter(pl.col(name) > floor).select(
+                *columns, pl.col(name).alias("value")
+            )
+            for name, (_, _, floor) in _CHANNELS.items()
+        ],
+        engine="streaming" if engine == "streaming" else "auto",
+    )
+    return dict(zip(_CHANNELS, collected, strict=True))
+
+
+def _run_lengths(samples: pl.DataFrame, sortie: str) -> pl.DataFrame:
+    # A new episode starts wherever rows stop being consecutive or the sortie
+    # changes; every run of the remaining samples is one episode.
+    starts = pl.col("row").diff() != 1
+    sortie_id = pl.lit(sortie)
+    if "sortie" in samples.columns:
+        starts |= pl.col("sortie").ne_missing(pl.col("sortie").shift(1))
+        sortie_id = pl.col("sortie").first()
+    return (
+        samples.with_columns(starts.fill_null(True).cum_sum().alias("episode"))
+        .group_by("episode", maintain_order=True)
+        .agg(
+            sortie_id.alias("sortie"),
+            pl.col("time").first().alias("start"),
+            pl.col("next_time").last().alias("end"),
+            pl.col("value").max().alias("peak"),
+            pl.col("time").get(pl.col("value").arg_max()).alias("peak_time"),
+            pl.col("event").drop_nulls().first(),
+            pl.len().alias("samples"),
+        )
+        .select(
+            pl.col("sortie").cast(pl.String),
+            pl.col("start", "end").cast(pl.Float64),
+            (pl.col("end") - pl.col("start")).cast(pl.Float64).alias("duration"),
+            "peak",
+            pl.col("peak_time").cast(pl.Float64),
+            "event",
+            pl.col("samples").cast(pl.Int64),
+        )
+    )
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import io
+import struct
+from collections.abc import Iterator, Sequence
+from typing import Literal
+
+import polars as pl
+
+from backend.services.telemetry_tools import _load_dataframe, _resolve_sorties
+
+ExportFormat = Literal["arrow", "ndjson"]
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "ndjson": "application/x-ndjson",
+}
+
+# Approximate size of one exported batch; bounds the memory an export holds
+# whatever the size of the slice.
+_BATCH_BYTES = 4 << 20
+# Arrow IPC message framing: continuation marker, then the metadata length.
+_CONTINUATION = b"\xff\xff\xff\xff"
+_END_OF_STREAM = _CONTINUATION + b"\x00\x00\x00\x00"
+
+
+class InvalidExportRequestError(ValueError):
+    pass
+
+
+def telemetry_slice(
+    columns: Sequence[str] | None = None,
+    sortie: str | None = None,
+    start_row: int = 0,
+    end_row: int | None = None,
+) -> pl.DataFrame:
+    """
+    Rows ``[start_row, end_row)`` of ``columns`` (all by default) of one
+    sortie (``DATA_PATH`` by default).
+
+    A zero-copy view of the loaded frame: for an ingested sortie it still
+    points into the memory-mapped Arrow sidecar.
+    """
+
+    [(_, path)] = _resolve_sorties(sortie)
+    frame = _load_dataframe(path)
+    if columns:
+        unknown = [column for column in columns if column not in frame.schema]
+        if unknown:
+            raise InvalidExportRequestError(f"Unknown column(s) {', '.join(unknown)}")
+        frame = frame.select(columns)
+    if start_row < 0 or (end_row is not None and end_row < start_row):
+        raise InvalidExportRequestError(
+            "Row range must satisfy 0 <= start_row <= end_row"
+        )
+    end_row = frame.height if end_row is None else min(end_row, frame.height)
+    return frame.slice(start_row, max(end_row - start_row, 0))
+
+
+def export_telemetry(
+    frame: pl.DataFrame,
+    format: ExportFormat = "arrow",
+    batch_rows: int | None = None,
+) -> Iterator[bytes]:
+    """
+    Serialize ``frame`` batch by batch, as one Arrow IPC stream or as
+    newline-delimited JSON.
+
+    Each batch is a slice of ``frame`` written straight from its column
+    buffers, so no per-row Python objects are built and at most one batch is
+    held in memory at a time.
+    """
+
+    batch_rows = batch_rows or _batch_rows(frame)
+    batches = (
+        frame.slice(offset, batch_rows)
+        for offset in range(0, max(frame.height, 1), batch_rows)
+    )
+    if format == "ndjson":
+        return (batch.write_ndjson().encode() for batch in batches if batch.height)
+    return _arrow_stream(batches)
+
+
+def _arrow_stream(batches: Iterator[pl.DataFrame]) -> Iterator[bytes]:
+    # Polars only writes a whole stream at once, so every batch is written as
+    # a stream of its own and the pieces are spliced into one: the schema
+    # message of the first, the record batches of all, then end-of-stream.
+    for index, batch in enumerate(batches):
+        buffer = io.BytesIO()
+        batch.write_ipc_stream(buffer, compression="uncompressed")
+        stream = buffer.getbuffer()
+        start = 0 if index == 0 else _message_length(stream)
+        yield bytes(stream[start : len(stream) - len(_END_OF_STREAM)])
+    yield _END_OF_STREAM
+
+
+def _message_length(stream: memoryview) -> int:
+    # The leading schema message has no body: marker, length, metadata.
+    if stream[:4] != _CONTINUATION:
+        raise ValueError("Unexpected Arrow IPC message framing")
+    (metadata_length,) = struct.unpack_from("<i", stream, 4)
+    return 8 + metadata_length
+
+
+def _batch_rows(frame: pl.DataFrame) -> int:
+    row_bytes = frame.estimated_size() / max(frame.height, 1)
+    return max(int(_BATCH_BYTES / max(row_bytes, 1)), 1_000)
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from functools import partial
+
+import polars as pl
+
+from backend.schemas import ChannelSeries, TelemetryChart
+from backend.services.telemetry_tools import (
+    SingleFlight,
+    _data_key,
+    _load_dataframe,
+    _resolve_sorties,
+    _time_column,
+    _time_expr,
+    require_columns,
+)
+
+# Channels analysts chart; the ones present in a sortie file get a pyramid.
+CHART_CHANNELS = (
+    "AOA",
+    "AOSS",
+    "AIRSPEED_IC",
+    "AIRSPEED_TIC",
+    "MACH_IC",
+    "PRESS_ALT_IC",
+    "AMB_AIR_TEMP_C",
+    "LEFT_FUEL_FLOW",
+    "RIGHT_FUEL_FLOW",
+    "LEFT_AB_FUEL_FLOW",
+    "RIGHT_AB_FUEL_FLOW",
+)
+require_columns("charts", CHART_CHANNELS)
+DEFAULT_CHART_WIDTH = 800
+
+# Rows per bucket of the finest level and growth factor between levels; the
+# coarsest level still has at least _MIN_LEVEL_BUCKETS buckets.
+_BASE_BUCKET_ROWS = 16
+_LEVEL_FACTOR = 4
+_MIN_LEVEL_BUCKETS = 64
+_PYRAMID_CACHE_SIZE = 8
+
+_PYRAMIDS: OrderedDict[tuple[str, int, int], TelemetryPyramid] = OrderedDict()
+_PYRAMIDS_LOCK = threading.Lock()
+_BUILDING = SingleFlight()
+
+
+class InvalidChartRequestError(ValueError):
+    pass
+
+
+class TelemetryPyramid:
+    """
+    Min/max/sum/count of every chart channel of one sortie at several
+    resolutions.
+
+    Level ``k`` summarizes consecutive runs of ``16 * 4**k`` samples (in time
+    order), down to a few dozen buckets for the whole sortie, so a chart of
+    any range is built from at most a few buckets per pixel instead of every
+    raw sample in it. The levels add up to about a third of the raw channel
+    data, and are all the pyramid keeps: raw samples are sliced out of the
+    loaded sortie when a chart is zoomed in far enough to need them.
+    """
+
+    def __init__(
+        self,
+        sortie: str,
+        time_basis: str,
+        channels: Sequence[str],
+        span: tuple[float, float],
+        levels: list[tuple[int, pl.DataFrame]],
+        source: Callable[[], pl.DataFrame],
+        raw: pl.DataFrame | None = None,
+        in_time_order: bool = True,
+    ) -> None:
+        self.sortie = sortie
+        self.time_basis = time_basis
+        self.channels = tuple(channels)
+        # First and last sample times.
+        self._span = span
+        # (raw samples per bucket, buckets), finest first.
+        self._levels = levels
+        # The sortie frame, loaded again to slice raw samples out of when a
+        # chart needs them: only sorties too short for any level keep theirs.
+        self._source = source
+        self._raw = raw
+        # Whether the file's rows are already in time order (with no missing
+        # times), so finest-level bucket ``i`` holds rows ``16 * i`` onwards.
+        self._in_time_order = in_time_order
+
+    @classmethod
+    def build(
+        cls, sortie: str, frame: pl.DataFrame, source: Callable[[], pl.DataFrame]
+    ) -> TelemetryPyramid:
+        """
+        The pyramid of ``frame``; ``source`` loads the frame again when raw
+        samples are charted.
+        """
+
+        schema = frame.schema
+        channels = [channel for channel in CHART_CHANNELS if channel in schema]
+        raw = _raw_samples(frame, channels, 0)
+        in_time_order = raw.get_column("time").null_count() == 0
+        raw = raw.filter(pl.col("time").is_not_null())
+        if not raw.get_column("time").is_sorted():
+            in_time_order = False
+            raw = raw.sort("time", maintain_order=True)
+
+        levels: list[tuple[int, pl.DataFrame]] = []
+        bucket_rows = _BASE_BUCKET_ROWS
+        if raw.height > bucket_rows * _MIN_LEVEL_BUCKETS:
+            buckets = _group_runs(raw, bucket_rows, _sample_stats(channels))
+            levels.append((bucket_rows, buckets))
+            while buckets.height > _LEVEL_FACTOR * _MIN_LEVEL_BUCKETS:
+                buckets = _group_runs(buckets, _LEVEL_FACTOR, _merged_stats(channels))
+                bucket_rows *= _LEVEL_FACTOR
+                levels.append((bucket_rows, buckets))
+        times = raw.get_column("time")
+        span = (times.first(), times.last()) if times.len() else (0.0, 0.0)
+        return cls(
+            sortie,
+            _time_column(schema) or "row",
+            channels,
+            span,
+            levels,
+            source,
+            None if levels else raw,
+            in_time_order,
+        )
+
+    def chart(
+        self,
+        channels: Sequence[str],
+        start: float | None = None,
+        end: float | None = None,
+        width: int = DEFAULT_CHART_WIDTH,
+    ) -> TelemetryChart:
+        """
+        Min-max decimated series of ``channels`` between ``start`` and ``end``
+        (inclusive, in ``time_basis`` units), at most ``width`` points.
+
+        Ranges with no more than two samples per pixel return the raw
+        samples; larger ones are binned from the coarsest level that still
+        has at least one bucket per pixel.
+        """
+
+        unknown = [channel for channel in channels if channel not in self.channels]
+        if unknown:
+            raise InvalidChartRequestError(
+                f"Unknown channel(s) {', '.join(unknown)}; "
+                f"available: {', '.join(self.channels)}"
+            )
+        if not channels:
+            raise InvalidChartRequestError("Select at least one channel")
+        if width < 1:
+            raise InvalidChartRequestError("width must be positive")
+        if start is None:
+            start = self._span[0]
+        if end is None:
+            end = self._span[1]
+        if end < start:
+            raise InvalidChartRequestError("end must not be before start")
+
+        rows = self._rows_between(start, end)
+        bucket_rows, buckets = 1, None
+        for level_rows, level in self._levels:
+            if level_rows * width > rows:
+                break
+            bucket_rows, buckets = level_rows, level
+
+        columns = list(channels)
+        if buckets is None:
+            samples = self._samples(columns, start, end)
+            if samples.height <= 2 * width:
+                time = samples.get_column("time")
+                return self._chart(
+                    start,
+                    end,
+                    1,
+                    time,
+                    {
+                        channel: (samples.get_column(channel),) * 3
+                        for channel in columns
+                    },
+                )
+            stats = _sample_stats(columns)
+        else:
+            # Buckets overlapping the range, including one straddling ``start``.
+            lo, hi = _overlapping(buckets, start, end)
+            samples = buckets.slice(lo, hi - lo)
+            stats = _merged_stats(columns)
+
+        span = (end - start) or 1.0
+        pixel = ((pl.col("time") - start) / span * width).floor().clip(0, width - 1)
+        binned = samples.group_by(
+            pixel.cast(pl.Int64).alias("pixel"), maintain_order=True
+        ).agg(pl.col("time").first().clip(start, end), *stats)
+        return self._chart(
+            start,
+            end,
+            bucket_rows,
+            binned.get_column("time"),
+            {
+                channel: (
+                    binned.get_column(f"{channel}_min"),
+                    binned.get_column(f"{channel}_max"),
+                    binned.get_column(f"{channel}_sum")
+                    / binned.get_column(f"{channel}_count"),
+                )
+                for channel in columns
+            },
+        )
+
+    def _rows_between(self, start: float, end: float) -> int:
+        if self._raw is not None:
+            times = self._raw.get_column("time")
+            return times.search_sorted(end, side="right") - times.search_sorted(
+                start, side="left"
+            )
+        lo, hi = _overlapping(self._levels[0][1], start, end)
+        return (hi - lo) * self._levels[0][0]
+
+    def _samples(self, columns: list[str], start: float, end: float) -> pl.DataFrame:
+        """Raw samples of ``columns`` between ``start`` and ``end``, in time order."""
+        in_range = pl.col("time").is_between(start, end)
+        if self._raw is not None:
+            return self._raw.select("time", *columns).filter(in_range)
+        frame = self._source()
+        if not self._in_time_order:
+            # Rows out of time order: scan the whole sortie for the range.
+            return (
+                _raw_samples(frame, columns, 0)
+                .filter(in_range)
+                .sort("time", maintain_order=True)
+            )
+        bucket_rows, buckets = self._levels[0]
+        lo, hi = _overlapping(buckets, start, end)
+        first = lo * bucket_rows
+        rows = frame.slice(first, (hi - lo) * bucket_rows)
+        return _raw_samples(rows, columns, first).filter(in_range)
+
+    def _chart(
+        self,
+        start: float,
+        end: float,
+        bucket_rows: int,
+        time: pl.Series,
+        series: dict[str, tuple[pl.Series, pl.Series, pl.Series]],
+    ) -> TelemetryChart:
+        return TelemetryChart(
+            sortie=self.sortie,
+            time_basis=self.time_basis,
+            start=start,
+            end=end,
+            bucket_rows=bucket_rows,
+            time=time.to_list(),
+            channels={
+                channel: ChannelSeries(
+                    min=_floats(low), max=_floats(high), mean=_floats(mean)
+                )
+                for channel, (low, high, mean) in series.items()
+            },
+        )
+
+
+def telemetry_pyramid(sortie: str | None = None) -> TelemetryPyramid:
+    """
+    The pyramid of one sortie (``DATA_PATH`` by default), built on first use
+    and rebuilt when the sortie file changes.
+    """
+
+    [(sortie_id, path)] = _resolve_sorties(sortie)
+    key = _data_key(path)
+    with _BUILDING(key):
+        with _PYRAMIDS_LOCK:
+            pyramid = _PYRAMIDS.get(key)
+            if pyramid is not None:
+                _PYRAMIDS.move_to_end(key)
+                return pyramid
+        pyramid = TelemetryPyramid.build(
+            sortie_id, _load_dataframe(path), partial(_load_dataframe, path)
+        )
+        with _PYRAMIDS_LOCK:
+            _PYRAMIDS[key] = pyramid
+            while len(_PYRAMIDS) > _PYRAMID_CACHE_SIZE:
+                _PYRAMIDS.popitem(last=False)
+        return pyramid
+
+
+def telemetry_chart(
+    channels: Sequence[str],
+    sortie: str | None = None,
+    start: float | None = None,
+    end: float | None = None,
+    width: int = DEFAULT_CHART_WIDTH,
+) -> TelemetryChart:
+    return telemetry_pyramid(sortie).chart(channels, start, end, width)
+
+
+def _raw_samples(
+    frame: pl.DataFrame, channels: Sequence[str], row_offset: int
+) -> pl.DataFrame:
+    """Time (in seconds or rows from ``row_offset``) and Float64 ``channels``."""
+    return frame.select(
+        _time_expr(frame.schema, row_offset).alias("time"),
+        *(pl.col(channel).cast(pl.Float64) for channel in channels),
+    )
+
+
+def _overlapping(buckets: pl.DataFrame, start: float, end: float) -> tuple[int, int]:
+    """Range of the ``buckets`` overlapping ``[start, end]``."""
+    times = buckets.get_column("time")
+    lo = max(times.search_sorted(start, side="right") - 1, 0)
+    return lo, times.search_sorted(end, side="right")
+
+
+def _group_runs(
+    frame: pl.DataFrame, run_rows: int, stats: list[pl.Expr]
+) -> pl.DataFrame:
+    """Aggregate consecutive runs of ``run_rows`` rows into one bucket each."""
+    return (
+        frame.group_by(
+            (pl.int_range(pl.len()) // run_rows).alias("bucket"), maintain_order=True
+        )
+        .agg(pl.col("time").first(), *stats)
+        .drop("bucket")
+    )
+
+
+def _sample_stats(channels: Sequence[str]) -> list[pl.Expr]:
+    return [
+        expression
+        for channel in channels
+        for expression in (
+            pl.col(channel).min().alias(f"{channel}_min"),
+            pl.col(channel).max().alias(f"{channel}_max"),
+            pl.col(channel).sum().alias(f"{channel}_sum"),
+            pl.col(channel).count().alias(f"{channel}_count"),
+        )
+    ]
+
+
+def _merged_stats(channels: Sequence[str]) -> list[pl.Expr]:
+    return [
+        expression
+        for channel in channels
+        for expression in (
+            pl.col(f"{channel}_min").min(),
+            pl.col(f"{channel}_max").max(),
+            pl.col(f"{channel}_sum").sum(),
+            pl.col(f"{channel}_count").sum(),
+        )
+    ]
+
+
+def _floats(series: pl.Series) -> list[float | None]:
+    return series.fill_nan(None).to_list()
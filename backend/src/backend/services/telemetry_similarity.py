@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import polars as pl
+
+from backend.schemas import (
+    FlightContext,
+    SimilarSegment,
+    SimilarSegments,
+    TelemetryConditions,
+)
+from backend.services.telemetry_tools import (
+    _WOW_COLUMNS,
+    SingleFlight,
+    SortieSelector,
+    _data_key,
+    _load_dataframe,
+    _resolve_sorties,
+    _sortie_expr,
+    _time_column,
+    _time_expr,
+    require_columns,
+)
+
+# Samples per indexed window.
+WINDOW_ROWS = 64
+DEFAULT_NEIGHBOURS = 5
+# Per-window features, named after the TelemetryConditions fields.
+_FEATURES: dict[str, pl.Expr] = {
+    "airspeed_kt": pl.col("AIRSPEED_IC").mean(),
+    "altitude_ft": pl.col("PRESS_ALT_IC").mean(),
+    "abs_aoss_deg": pl.col("AOSS").abs().mean(),
+    "aoss_std_deg": pl.col("AOSS").std(),
+    "temperature_c": pl.col("AMB_AIR_TEMP_C").mean(),
+    "fuel_flow": (pl.col("LEFT_FUEL_FLOW") + pl.col("RIGHT_FUEL_FLOW")).mean(),
+}
+require_columns(
+    "similarity",
+    [
+        *(name for feature in _FEATURES.values() for name in feature.meta.root_names()),
+        *_WOW_COLUMNS,
+    ],
+)
+# Smallest meaningful difference of each feature: its distance unit when the
+# windows barely vary, so noise-level differences cannot dominate a match.
+_MIN_SCALES = {
+    "airspeed_kt": 5.0,
+    "altitude_ft": 250.0,
+    "abs_aoss_deg": 0.5,
+    "aoss_std_deg": 0.25,
+    "temperature_c": 1.0,
+    "fuel_flow": 100.0,
+}
+# Approach speed at which a planned crosswind is turned into sideslip, and the
+# standard lapse rate used to estimate surface temperature from the freezing
+# level.
+_APPROACH_AIRSPEED_KT = 150.0
+_LAPSE_RATE_C_PER_FT = 1.98 / 1000
+_INDEX_CACHE_SIZE = 32
+
+_INDEXES: OrderedDict[tuple[str, int, int], SimilarityIndex] = OrderedDict()
+_INDEXES_LOCK = threading.Lock()
+_BUILDING = SingleFlight()
+
+
+class InvalidSimilarityQueryError(ValueError):
+    pass
+
+
+class SimilarityIndex:
+    """
+    Feature vectors of consecutive ``WINDOW_ROWS``-sample windows of one
+    sortie file: mean airspeed, altitude, |sideslip|, temperature and fuel
+    flow, plus the spread of sideslip. With one row per window the index is
+    small enough for nearest-neighbour queries to scan every window in one
+    vectorized pass.
+    """
+
+    def __init__(self, time_basis: str, windows: pl.DataFrame) -> None:
+        self.time_basis = time_basis
+        self.windows = windows
+
+    @classmethod
+    def build(cls, sortie: str, frame: pl.DataFrame) -> SimilarityIndex:
+        schema = frame.schema
+        on_ground = pl.any_horizontal([pl.col(col) > 0 for col in _WOW_COLUMNS])
+        windows = (
+            frame.lazy()
+            .with_columns(
+                _time_expr(schema, 0).alias("time"),
+                _sortie_expr(schema).fill_null(sortie).alias("sortie"),
+                (pl.int_range(pl.len()) // WINDOW_ROWS).alias("window"),
+            )
+            .group_by("sortie", "window", maintain_order=True)
+            .agg(
+                pl.col("time").first().alias("start"),
+                pl.col("time").last().alias("end"),
+                on_ground.fill_null(False).mean().alias("ground_fraction"),
+                *(feature.alias(name) for name, feature in _FEATURES.items()),
+            )
+            .drop("window")
+            .collect()
+        )
+        return cls(_time_column(schema) or "row", windows)
+
+
+def similarity_index(sortie: str, path: Path) -> SimilarityIndex:
+    """
+    The window index of one sortie file, built once per file version.
+    """
+
+    key = _data_key(path)
+    with _BUILDING(key):
+        with _INDEXES_LOCK:
+            index = _INDEXES.get(key)
+            if index is not None:
+                _INDEXES.move_to_end(key)
+                return index
+        index = SimilarityIndex.build(sortie, _load_dataframe(path))
+        with _INDEXES_LOCK:
+            _INDEXES[key] = index
+            while len(_INDEXES) > _INDEX_CACHE_SIZE:
+                _INDEXES.popitem(last=False)
+        return index
+
+
+def is_cached(key: tuple[str, int, int]) -> bool:
+    """Whether the index of sortie file version ``key`` (a ``_data_key``) is built."""
+    with _INDEXES_LOCK:
+        return key in _INDEXES
+
+
+def find_similar_segments(
+    conditions: TelemetryConditions,
+    k: int = DEFAULT_NEIGHBOURS,
+    sorties: SortieSelector = None,
+) -> SimilarSegments:
+    """
+    The ``k`` telemetry windows of the selected sorties closest to
+    ``conditions``, nearest first.
+
+    Each set condition is compared in units of its standard deviation across
+    the windows (at least ``_MIN_SCALES``), so airspeed in knots and sideslip
+    in degrees weigh the same.
+    """
+
+    query = conditions.model_dump(exclude_none=True)
+    if not query:
+        raise InvalidSimilarityQueryError("Set at least one condition to match")
+    if k < 1:
+        raise InvalidSimilarityQueryError("k must be positive")
+
+    time_basis: str | None = None
+    frames: list[pl.DataFrame] = []
+    for sortie, path in _resolve_sorties(sorties):
+        index = similarity_index(sortie, path)
+        time_basis = time_basis or index.time_basis
+        frames.append(index.windows)
+    windows = pl.concat(frames)
+
+    spreads = windows.select(
+        pl.col(name).std().fill_null(0.0).alias(name) for name in query
+    ).row(0, named=True)
+    distance = pl.sum_horizontal(
+        ((pl.col(name) - value) / max(spreads[name], _MIN_SCALES[name])) ** 2
+        for name, value in query.items()
+    ).sqrt()
+    nearest = (
+        windows.drop_nulls(list(query))
+        .with_columns(distance.alias("distance"))
+        .bottom_k(k, by="distance")
+        .sort("distance", maintain_order=True)
+    )
+    return SimilarSegments(
+        time_basis=time_basis or "row",
+        query=conditions,
+        segments=[
+            SimilarSegment(
+                sortie=row["sortie"],
+                start=row["start"],
+                end=row["end"],
+                distance=row["distance"],
+                ground_fraction=row["ground_fraction"],
+                conditions=TelemetryConditions(
+                    **{name: row[name] for name in _FEATURES}
+                ),
+            )
+            for row in nearest.iter_rows(named=True)
+        ],
+    )
+
+
+def flight_conditions(context: FlightContext) -> TelemetryConditions:
+    """
+    The telemetry conditions a planned flight can be compared on.
+
+    The crosswind and gusts become the sideslip they cause on approach; the
+    freezing level gives the surface temperature at the standard lapse rate.
+    """
+
+    return TelemetryConditions(
+        abs_aoss_deg=_sideslip_deg(context.max_crosswind_knots),
+        aoss_std_deg=_sideslip_deg(context.gusts_knots),
+        temperature_c=(
+            None
+            if context.freezing_level_ft is None
+            else context.freezing_level_ft * _LAPSE_RATE_C_PER_FT
+        ),
+    )
+
+
+def _sideslip_deg(wind_knots: float) -> float:
+    return math.degrees(math.atan2(abs(wind_knots), _APPROACH_AIRSPEED_KT))
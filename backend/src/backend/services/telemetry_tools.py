@@ -1,15 +1,43 @@
 from __future__ import annotations
 
+import hashlib
+import io
+import operator
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Hashable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Literal
 
 import polars as pl
+from loguru import logger
 from pydantic import BaseModel, ConfigDict
 
 DATA_PATH = (
     Path(__file__).resolve().parent.parent / "data" / "AirForce_Sortie_Aeromod.csv"
 )
 
-_DATAFRAME: pl.DataFrame | None = None
+# Recently loaded sortie files by path (see ``_LoadedSortie``), least recent
+# first, holding at most ``TELEMETRY_LOADED_MB`` between them.
+_LOADED: OrderedDict[str, _LoadedSortie] = OrderedDict()
+_LOADED_LOCK = threading.Lock()
+_DEFAULT_LOADED_MB = 1024
+# Running statistics of recently analyzed sortie files by load mode and path
+# (eager engine).
+_FILE_TOTALS: OrderedDict[tuple[str, str], _FileTotals] = OrderedDict()
+_FILE_TOTALS_LOCK = threading.Lock()
+# Summaries of recently analyzed sortie selections, keyed on the load mode
+# and the identity (path, size, mtime_ns) of every file in the selection,
+# least recent first.
+_SummaryKey = tuple[str, tuple[tuple[str, int, int], ...]]
+_SUMMARIES: OrderedDict[_SummaryKey, TelemetrySummaries] = OrderedDict()
+_SUMMARY_CACHE_SIZE = 32
+_SUMMARIES_LOCK = threading.Lock()
 _CSV_READ_KWARGS = {
     "infer_schema_length": 10000,
     "schema_overrides": {
@@ -19,6 +47,84 @@ _CSV_READ_KWARGS = {
     "null_values": ["", "NA", "NaN"],
 }
 
+# "eager" analyzes the in-memory frame; "streaming" scans the file lazily with
+# Polars' streaming engine in bounded memory (for sortie files larger than RAM).
+TelemetryEngine = Literal["eager", "streaming"]
+_DEFAULT_MEMORY_BUDGET_MB = 256
+# Optional columns for the weight-on-wheels breakdown; without a time column
+# segment times are row indexes.
+_DEFAULT_SORTIE_COLUMN = "SORTIE_ID"
+_DEFAULT_TIME_COLUMN = "TIME"
+# Segments listed per sortie, so noisy WOW sensors cannot flood the agent.
+_MAX_SEGMENTS_PER_SORTIE = 100
+# Angle of attack and |sideslip| (degrees) above which a sample is an excursion.
+HIGH_AOA_DEG = 12.0
+HIGH_SIDESLIP_DEG = 10.0
+
+# Which sorties to analyze: one sortie id, a collection of ids, ALL_SORTIES for
+# the whole catalog, or None for the default ``DATA_PATH`` file.
+SortieSelector = str | Collection[str] | None
+ALL_SORTIES = "*"
+# "full" holds every column of a sortie file as parsed; "compact" holds only
+# the columns the telemetry consumers declare (see ``require_columns``), in
+# narrower dtypes, so that many more sorties fit in ``TELEMETRY_LOADED_MB``.
+TelemetryLoadMode = Literal["full", "compact"]
+# Columns each consumer of loaded sortie frames reads, by consumer.
+_REQUIRED_COLUMNS: dict[str, tuple[str, ...]] = {}
+# Rough multiple of a chunk's raw column bytes held in flight per thread.
+_CHUNK_OVERHEAD = 4
+# Bytes before the parsed end of a followed file that must be unchanged for
+# new bytes to count as an append, and how many appended chunks a frame may
+# accumulate before it is copied into one.
+_FINGERPRINT_BYTES = 4096
+_MAX_APPENDED_CHUNKS = 64
+# Earlier versions of a followed file remembered, for incremental updates of
+# the statistics and indexes built from them.
+_FOLLOWED_VERSIONS = 16
+
+
+class SingleFlight:
+    """
+    Per-key locks so that concurrent threads asking for the same missing value
+    compute it once: the first caller computes it while the others wait, then
+    find it in the cache. Different keys never wait on each other.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Lock of every key in flight, and how many callers hold or await it.
+        self._flights: dict[Hashable, tuple[threading.Lock, int]] = {}
+
+    @contextmanager
+    def __call__(self, key: Hashable) -> Iterator[None]:
+        with self._lock:
+            lock, waiters = self._flights.get(key, (threading.Lock(), 0))
+            self._flights[key] = (lock, waiters + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, waiters = self._flights[key]
+                if waiters == 1:
+                    del self._flights[key]
+                else:
+                    self._flights[key] = (lock, waiters - 1)
+
+
+_LOADING = SingleFlight()
+_SUMMARIZING = SingleFlight()
+
+
+def require_columns(consumer: str, columns: Iterable[str]) -> None:
+    """
+    Declare the columns ``consumer`` reads from loaded sortie frames; the
+    compact load mode keeps only declared columns (and the sortie and time
+    columns). Call it at import time, next to the code reading them.
+    """
+
+    _REQUIRED_COLUMNS[consumer] = tuple(columns)
+
 
 class WeatherEnvSummary(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -43,6 +149,28 @@ class WeightFuelSummary(BaseModel):
     risk_notes: list[str]
 
 
+class WowSegment(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    on_ground: bool
+    start: float
+    end: float
+    duration: float
+
+
+class WowSortieSummary(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    sortie: str
+    ground_fraction: float
+    ground_time: float
+    airborne_time: float
+    takeoff_times: list[float]
+    landing_times: list[float]
+    num_segments: int
+    segments: list[WowSegment]
+
+
 class WowSummary(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -50,6 +178,9 @@ class WowSummary(BaseModel):
     airborne_fraction: float
     num_takeoff_like_transitions: int
     num_landing_like_transitions: int
+    # Unit of the times below: the time column's name, or "row" (row index).
+    time_basis: str
+    sorties: list[WowSortieSummary]
     risk_notes: list[str]
 
 
@@ -60,116 +191,444 @@ class PerformanceSummary(BaseModel):
     max_airspeed: float
     max_aoa: float
     max_abs_aoss: float
+    # Samples over the AOA / sideslip thresholds, and the distinct excursions
+    # (contiguous runs of such samples) they form.
     num_high_aoa_events: int
     num_high_sideslip_events: int
+    num_high_aoa_episodes: int
+    num_high_sideslip_episodes: int
     event_values_present: list[int]
     risk_notes: list[str]
 
 
-def analyze_weather_env() -> WeatherEnvSummary:
-    df = _load_dataframe()
-    weather = df.select(
-        pl.col("AMB_AIR_TEMP_C").mean().alias("avg_temp"),
-        pl.col("PRESS_ALT_IC").min().alias("min_press_alt"),
-        pl.col("PRESS_ALT_IC").max().alias("max_press_alt"),
-        pl.col("AOSS").abs().max().alias("max_abs_aoss"),
-        pl.col("AOA").max().alias("max_aoa"),
-        pl.max_horizontal(pl.col("AIRSPEED_IC"), pl.col("AIRSPEED_TIC"))
-        .max()
-        .alias("max_airspeed"),
-    ).row(0, named=True)
-
-    min_airspeed = float(
-        df.select(
-            pl.min_horizontal(pl.col("AIRSPEED_IC"), pl.col("AIRSPEED_TIC")).min()
-        ).item()
+class ColumnMemory(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    name: str
+    dtype: str
+    bytes: int
+
+
+class TelemetryMemoryReport(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    sortie: str
+    load_mode: TelemetryLoadMode
+    rows: int
+    # Columns of the sortie file; ``columns`` lists the ones held in memory.
+    file_columns: int
+    total_bytes: int
+    columns: list[ColumnMemory]
+
+
+class TelemetrySummaries(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    weather: WeatherEnvSummary
+    weight_fuel: WeightFuelSummary
+    wow: WowSummary
+    performance: PerformanceSummary
+
+
+def analyze_weather_env(
+    engine: TelemetryEngine | None = None, sorties: SortieSelector = None
+) -> WeatherEnvSummary:
+    return telemetry_summaries(engine, sorties).weather.model_copy(deep=True)
+
+
+def analyze_weight_fuel(
+    engine: TelemetryEngine | None = None, sorties: SortieSelector = None
+) -> WeightFuelSummary:
+    return telemetry_summaries(engine, sorties).weight_fuel.model_copy(deep=True)
+
+
+def analyze_wow(
+    engine: TelemetryEngine | None = None, sorties: SortieSelector = None
+) -> WowSummary:
+    return telemetry_summaries(engine, sorties).wow.model_copy(deep=True)
+
+
+def analyze_performance(
+    engine: TelemetryEngine | None = None, sorties: SortieSelector = None
+) -> PerformanceSummary:
+    return telemetry_summaries(engine, sorties).performance.model_copy(deep=True)
+
+
+def telemetry_summaries(
+    engine: TelemetryEngine | None = None, sorties: SortieSelector = None
+) -> TelemetrySummaries:
+    """
+    All four telemetry summaries of the selected sorties, computed together.
+
+    The first call for a selection scans its files in a single fused pass (see
+    ``_aggregate_telemetry``); later calls return the memoized result until
+    the path, size or mtime of one of the files changes. ``engine`` only
+    decides how a missing result is computed.
+    """
+
+    engine = engine or telemetry_engine()
+    sources = _resolve_sorties(sorties)
+    key = _summary_key([_data_key(path) for _, path in sources])
+    cached = _cached_summaries(key)
+    if cached is not None:
+        return cached
+    # Deferred: the episode index builds on this module's loaders.
+    from backend.services.telemetry_episodes import count_episodes
+
+    with _SUMMARIZING(key):
+        cached = _cached_summaries(key)
+        if cached is not None:
+            return cached
+        totals = _aggregate_telemetry(engine, sources)
+        totals["episodes"] = count_episodes(sources, engine)
+        summaries = _summarize(totals)
+        with _SUMMARIES_LOCK:
+            _SUMMARIES[key] = summaries
+            while len(_SUMMARIES) > _SUMMARY_CACHE_SIZE:
+                _SUMMARIES.popitem(last=False)
+        return summaries
+
+
+def is_cached(key: tuple[str, int, int]) -> bool:
+    """
+    Whether the summaries of sortie file version ``key`` (a ``_data_key``) on
+    its own are memoized.
+    """
+
+    with _SUMMARIES_LOCK:
+        return _summary_key([key]) in _SUMMARIES
+
+
+def _summary_key(keys: list[tuple[str, int, int]]) -> _SummaryKey:
+    # Compact frames hold Float32 channels: their summaries differ slightly.
+    return telemetry_load_mode(), tuple(keys)
+
+
+def _cached_summaries(key: _SummaryKey) -> TelemetrySummaries | None:
+    with _SUMMARIES_LOCK:
+        cached = _SUMMARIES.get(key)
+        if cached is not None:
+            _SUMMARIES.move_to_end(key)
+        return cached
+
+
+def _resolve_sorties(sorties: SortieSelector) -> list[tuple[str, Path]]:
+    """(sortie id, file) of every selected sortie, in catalog order."""
+    if sorties is None:
+        return [(DATA_PATH.stem, DATA_PATH)]
+    # Deferred: the catalog builds on this module's loaders.
+    from backend.services.telemetry_catalog import TELEMETRY_CATALOG
+
+    return [
+        (info.sortie, Path(info.path)) for info in TELEMETRY_CATALOG.select(sorties)
+    ]
+
+
+def _aggregate_telemetry(
+    engine: TelemetryEngine, sources: list[tuple[str, Path]] | None = None
+) -> dict[str, Any]:
+    """
+    One pass over the telemetry producing every statistic the summaries need.
+
+    Each batch is reduced to mergeable partials (sums and counts instead of
+    means) plus its weight-on-wheels segments, and the partials are folded
+    together. The eager engine reduces each file's in-memory frame as one
+    batch; the streaming engine reduces ordered batches of the projected
+    columns and joins segments that straddle a batch boundary.
+
+    With the eager engine the running totals of every file are kept, so a
+    file that was appended to since (see ``_load_sortie``) only has its new
+    rows reduced and folded in.
+    """
+
+    if sources is None:
+        sources = [(DATA_PATH.stem, DATA_PATH)]
+    totals: dict[str, Any] = {}
+    segments: list[list[Any]] = []
+    time_basis: str | None = None
+    for sortie, path in sources:
+        file_totals = _file_totals(engine, sortie, path)
+        time_basis = time_basis or file_totals.time_basis
+        for name, value in file_totals.partials.items():
+            totals[name] = _MERGE[name](totals.get(name), value)
+        _extend_segments(segments, [tuple(segment) for segment in file_totals.segments])
+    totals["segments"] = segments
+    totals["time_basis"] = time_basis or "row"
+    return totals
+
+
+@dataclass(frozen=True, slots=True)
+class _FileTotals:
+    """Merged partials and WOW segments of the first ``rows`` rows of a file."""
+
+    key: tuple[str, int, int]
+    time_basis: str
+    rows: int
+    partials: dict[str, Any]
+    segments: list[list[Any]]
+
+    def extended(
+        self,
+        key: tuple[str, int, int],
+        batches: Iterable[pl.DataFrame],
+        schema: pl.Schema,
+        sortie: str,
+    ) -> _FileTotals:
+        """These totals with ``batches``, the rows after ``rows``, folded in."""
+        rows = self.rows
+        partials = dict(self.partials)
+        # Copied: the last segment grows if the new rows continue it.
+        segments = [list(segment) for segment in self.segments]
+        for batch in batches:
+            if not batch.height:
+                continue
+            batch_partials, batch_segments = _reduce_batch(batch, schema, rows, sortie)
+            rows += batch.height
+            for name, value in batch_partials.items():
+                partials[name] = _MERGE[name](partials.get(name), value)
+            _extend_segments(segments, batch_segments)
+        return _FileTotals(key, self.time_basis, rows, partials, segments)
+
+
+def _file_totals(engine: TelemetryEngine, sortie: str, path: Path) -> _FileTotals:
+    if engine != "eager":
+        schema, batches = _batches(path)
+        empty = _FileTotals(_data_key(path), _time_column(schema) or "row", 0, {}, [])
+        return empty.extended(empty.key, batches, schema, sortie)
+
+    loaded = _load_sortie(path)
+    totals_key = (telemetry_load_mode(), str(path))
+    with _FILE_TOTALS_LOCK:
+        cached = _FILE_TOTALS.get(totals_key)
+    if cached is not None and cached.key == loaded.key:
+        return cached
+    rows = None if cached is None else loaded.prefix_rows(cached.key)
+    schema = loaded.frame.schema
+    if cached is None or rows is None:
+        cached = _FileTotals(loaded.key, _time_column(schema) or "row", 0, {}, [])
+        rows = 0
+    totals = cached.extended(loaded.key, [loaded.frame.slice(rows)], schema, sortie)
+    with _FILE_TOTALS_LOCK:
+        _FILE_TOTALS[totals_key] = totals
+        _FILE_TOTALS.move_to_end(totals_key)
+        while len(_FILE_TOTALS) > _SUMMARY_CACHE_SIZE:
+            _FILE_TOTALS.popitem(last=False)
+    return totals
+
+
+def _batches(path: Path) -> tuple[pl.Schema, Iterable[pl.DataFrame]]:
+    scan = _scan_telemetry(path)
+    schema = scan.collect_schema()
+    batches = scan.select(_SOURCE_COLUMNS + _segment_columns(schema)).collect_batches(
+        chunk_size=_chunk_rows(len(schema)), engine="streaming"
     )
-    max_airspeed = float(weather["max_airspeed"])
+    return schema, batches
+
+
+def _reduce_batch(
+    batch: pl.DataFrame, schema: pl.Schema, row_offset: int, default_sortie: str
+) -> tuple[dict[str, Any], list[tuple[Any, ...]]]:
+    # Derived columns are computed once and shared by both queries below.
+    derived = batch.lazy().with_columns(
+        (pl.col("LEFT_FUEL_FLOW") - pl.col("RIGHT_FUEL_FLOW"))
+        .abs()
+        .alias("fuel_imbalance"),
+        pl.any_horizontal(
+            [pl.col("LEFT_AB_FUEL_FLOW") > 0, pl.col("RIGHT_AB_FUEL_FLOW") > 0]
+        ).alias("afterburner"),
+        pl.any_horizontal([pl.col(col) > 0 for col in _WOW_COLUMNS])
+        .fill_null(False)
+        .alias("on_ground"),
+        pl.col("AOSS").abs().alias("abs_aoss"),
+        _sortie_expr(schema).alias("sortie"),
+        _time_expr(schema, row_offset).alias("time"),
+    )
+    on_ground = pl.col("on_ground")
+    fuel_imbalance = pl.col("fuel_imbalance")
+    afterburner = pl.col("afterburner")
+    # First row of every run of constant ground state within one sortie.
+    starts_segment = on_ground.ne_missing(on_ground.shift(1))
+    if _sortie_column(schema) is not None:
+        sortie = pl.col("sortie")
+        starts_segment |= sortie.ne_missing(sortie.shift(1))
+    stats, boundaries = pl.collect_all(
+        [
+            derived.select(
+                pl.col("AMB_AIR_TEMP_C").sum().alias("temp_sum"),
+                pl.col("AMB_AIR_TEMP_C").count().alias("temp_count"),
+                pl.col("PRESS_ALT_IC").min().alias("min_press_alt"),
+                pl.col("PRESS_ALT_IC").max().alias("max_press_alt"),
+                pl.col("abs_aoss").max().alias("max_abs_aoss"),
+                pl.col("AOA").max().alias("max_aoa"),
+                # Column extremes, not row-wise ones: same result, no temporaries.
+                pl.max_horizontal(
+                    pl.col("AIRSPEED_IC").max(), pl.col("AIRSPEED_TIC").max()
+                ).alias("max_airspeed"),
+                pl.min_horizontal(
+                    pl.col("AIRSPEED_IC").min(), pl.col("AIRSPEED_TIC").min()
+                ).alias("min_airspeed"),
+                pl.col("LEFT_FUEL_FLOW").sum().alias("left_sum"),
+                pl.col("LEFT_FUEL_FLOW").count().alias("left_count"),
+                pl.col("RIGHT_FUEL_FLOW").sum().alias("right_sum"),
+                pl.col("RIGHT_FUEL_FLOW").count().alias("right_count"),
+                fuel_imbalance.sum().alias("imbalance_sum"),
+                fuel_imbalance.count().alias("imbalance_count"),
+                fuel_imbalance.max().alias("max_imbalance"),
+                afterburner.sum().alias("afterburner_sum"),
+                afterburner.count().alias("afterburner_count"),
+                pl.len().alias("rows"),
+                pl.col("time").last().alias("last_time"),
+                pl.col("MACH_IC").max().alias("max_mach"),
+                pl.col("AIRSPEED_TIC").max().alias("max_tic_airspeed"),
+                (pl.col("AOA") > HIGH_AOA_DEG).sum().alias("high_aoa_events"),
+                (pl.col("abs_aoss") > HIGH_SIDESLIP_DEG)
+                .sum()
+                .alias("high_aoss_events"),
+                pl.col("EVENT")
+                .drop_nans()
+                .drop_nulls()
+                .cast(pl.Int64)
+                .unique()
+                .implode()
+                .alias("events"),
+            ),
+            derived.with_row_index("row")
+            .with_columns(pl.col("time").shift(1).alias("previous_time"))
+            .filter(starts_segment)
+            .select("row", "sortie", "on_ground", "time", "previous_time"),
+        ]
+    )
+    partials = stats.row(0, named=True)
+    starts = boundaries.rows()
+    # A segment ends where the next one starts, or at the end of the batch.
+    ends = [(row, previous_time) for row, *_, previous_time in starts[1:]]
+    ends.append((batch.height, partials.pop("last_time")))
+    segments = [
+        (sortie or default_sortie, on_ground, start, end, end_row - row)
+        for (row, sortie, on_ground, start, _), (end_row, end) in zip(
+            starts, ends, strict=True
+        )
+    ]
+    return partials, segments
+
+
+def _extend_segments(
+    segments: list[list[Any]], batch_segments: list[tuple[Any, ...]]
+) -> None:
+    """Append a batch's segments, joining one that continues the previous run."""
+    for sortie, on_ground, start, end, rows in batch_segments:
+        last = segments[-1] if segments else None
+        if last is not None and last[0] == sortie and last[1] == on_ground:
+            last[3] = end
+            last[4] += rows
+        else:
+            segments.append([sortie, on_ground, start, end, rows])
+
+
+def _sortie_column(schema: pl.Schema) -> str | None:
+    column = os.getenv("TELEMETRY_SORTIE_COLUMN", _DEFAULT_SORTIE_COLUMN)
+    return column if column in schema else None
+
+
+def _sortie_expr(schema: pl.Schema) -> pl.Expr:
+    column = _sortie_column(schema)
+    if column is None:
+        # The whole file is one sortie.
+        return pl.lit(None, dtype=pl.String)
+    return pl.col(column).cast(pl.String)
+
+
+def _time_column(schema: pl.Schema) -> str | None:
+    column = os.getenv("TELEMETRY_TIME_COLUMN", _DEFAULT_TIME_COLUMN)
+    return column if column in schema else None
+
+
+def _time_expr(schema: pl.Schema, row_offset: int) -> pl.Expr:
+    column = _time_column(schema)
+    if column is None:
+        return (pl.int_range(pl.len()) + row_offset).cast(pl.Float64)
+    if schema[column] in (pl.Date, pl.Datetime):
+        return pl.col(column).dt.epoch("us") / 1e6
+    return pl.col(column).cast(pl.Float64, strict=False)
+
+
+def _segment_columns(schema: pl.Schema) -> list[str]:
+    optional = (_sortie_column(schema), _time_column(schema))
+    return [column for column in optional if column is not None]
+
+
+def _summarize(stats: dict[str, Any]) -> TelemetrySummaries:
+    return TelemetrySummaries(
+        weather=_weather_summary(stats),
+        weight_fuel=_weight_fuel_summary(stats),
+        wow=_wow_summary(stats),
+        performance=_performance_summary(stats),
+    )
+
+
+def _weather_summary(stats: dict[str, Any]) -> WeatherEnvSummary:
+    min_airspeed = float(stats["min_airspeed"])
+    max_airspeed = float(stats["max_airspeed"])
 
     risk_notes: list[str] = []
-    if float(weather["max_abs_aoss"]) > 10:
+    if float(stats["max_abs_aoss"]) > 10:
         risk_notes.append("High sideslip observed → crosswind-like conditions")
-    if float(weather["max_aoa"]) > 12:
+    if float(stats["max_aoa"]) > 12:
         risk_notes.append("High angle-of-attack events noted")
     if max_airspeed - min_airspeed > 120:
         risk_notes.append("Large airspeed variation detected")
 
     return WeatherEnvSummary(
-        avg_amb_temp_c=float(weather["avg_temp"]),
-        min_press_alt_ft=float(weather["min_press_alt"]),
-        max_press_alt_ft=float(weather["max_press_alt"]),
-        max_abs_aoss_deg=float(weather["max_abs_aoss"]),
-        max_aoa_deg=float(weather["max_aoa"]),
+        avg_amb_temp_c=float(_mean(stats, "temp")),
+        min_press_alt_ft=float(stats["min_press_alt"]),
+        max_press_alt_ft=float(stats["max_press_alt"]),
+        max_abs_aoss_deg=float(stats["max_abs_aoss"]),
+        max_aoa_deg=float(stats["max_aoa"]),
         max_airspeed=max_airspeed,
         risk_notes=risk_notes,
     )
 
 
-def analyze_weight_fuel() -> WeightFuelSummary:
-    df = _load_dataframe()
-    stats = df.select(
-        pl.col("LEFT_FUEL_FLOW").mean().alias("left_mean"),
-        pl.col("RIGHT_FUEL_FLOW").mean().alias("right_mean"),
-        (pl.col("LEFT_FUEL_FLOW") - pl.col("RIGHT_FUEL_FLOW"))
-        .abs()
-        .mean()
-        .alias("avg_imbalance"),
-        (pl.col("LEFT_FUEL_FLOW") - pl.col("RIGHT_FUEL_FLOW"))
-        .abs()
-        .max()
-        .alias("max_imbalance"),
-        (
-            pl.any_horizontal(
-                [
-                    pl.col("LEFT_AB_FUEL_FLOW") > 0,
-                    pl.col("RIGHT_AB_FUEL_FLOW") > 0,
-                ]
-            ).mean()
-        ).alias("afterburner_fraction"),
-    ).row(0, named=True)
+def _weight_fuel_summary(stats: dict[str, Any]) -> WeightFuelSummary:
+    avg_imbalance = float(_mean(stats, "imbalance"))
+    max_imbalance = float(stats["max_imbalance"])
+    afterburner_fraction = float(_mean(stats, "afterburner"))
 
     risk_notes: list[str] = []
-    if float(stats["avg_imbalance"]) > 200:
+    if avg_imbalance > 200:
         risk_notes.append("Fuel flow imbalance averaging above 200 units")
-    if float(stats["max_imbalance"]) > 400:
+    if max_imbalance > 400:
         risk_notes.append("Peak fuel flow imbalance exceeds 400 units")
-    if float(stats["afterburner_fraction"]) > 0.2:
+    if afterburner_fraction > 0.2:
         risk_notes.append("Frequent afterburner usage observed")
 
     return WeightFuelSummary(
-        avg_fuel_flow_left=float(stats["left_mean"]),
-        avg_fuel_flow_right=float(stats["right_mean"]),
-        avg_imbalance_abs=float(stats["avg_imbalance"]),
-        max_imbalance_abs=float(stats["max_imbalance"]),
-        afterburner_usage_fraction=float(stats["afterburner_fraction"]),
+        avg_fuel_flow_left=float(_mean(stats, "left")),
+        avg_fuel_flow_right=float(_mean(stats, "right")),
+        avg_imbalance_abs=avg_imbalance,
+        max_imbalance_abs=max_imbalance,
+        afterburner_usage_fraction=afterburner_fraction,
         risk_notes=risk_notes,
     )
 
 
-def analyze_wow() -> WowSummary:
-    df = _load_dataframe()
-    wow_cols = ["ADC_AIR_GND_WOW", "LT_GEAR_WOW", "RT_GEAR_WOW", "NOSE_WOW"]
-
-    on_ground_series = (
-        df.select(
-            pl.any_horizontal([pl.col(col) > 0 for col in wow_cols]).alias("on_ground")
-        )
-        .get_column("on_ground")
-        .to_list()
-    )
-
-    total = len(on_ground_series)
-    ground_count = sum(on_ground_series)
-    ground_fraction = ground_count / total if total else 0.0
+def _wow_summary(stats: dict[str, Any]) -> WowSummary:
+    segments: list[list[Any]] = stats["segments"]
+    time_basis: str = stats["time_basis"]
+    total = int(stats.get("rows") or 0)
+    ground_rows = sum(rows for _, on_ground, _, _, rows in segments if on_ground)
+    ground_fraction = ground_rows / total if total else 0.0
     airborne_fraction = 1 - ground_fraction
 
-    takeoffs = 0
-    landings = 0
-    for previous, current in zip(on_ground_series, on_ground_series[1:], strict=False):
-        if previous and not current:
-            takeoffs += 1
-        elif not previous and current:
-            landings += 1
+    by_sortie: dict[str, list[list[Any]]] = {}
+    for segment in segments:
+        by_sortie.setdefault(segment[0], []).append(segment)
+    sorties = [
+        _sortie_breakdown(sortie, runs, time_basis == "row")
+        for sortie, runs in by_sortie.items()
+    ]
+    takeoffs = sum(len(sortie.takeoff_times) for sortie in sorties)
+    landings = sum(len(sortie.landing_times) for sortie in sorties)
 
     risk_notes: list[str] = []
     if takeoffs + landings > 10:
@@ -182,58 +641,590 @@ def analyze_wow() -> WowSummary:
         airborne_fraction=airborne_fraction,
         num_takeoff_like_transitions=takeoffs,
         num_landing_like_transitions=landings,
+        time_basis=time_basis,
+        sorties=sorties,
         risk_notes=risk_notes,
     )
 
 
-def analyze_performance() -> PerformanceSummary:
-    df = _load_dataframe()
-    perf = df.select(
-        pl.col("MACH_IC").max().alias("max_mach"),
-        pl.col("AIRSPEED_TIC").max().alias("max_airspeed"),
-        pl.col("AOA").max().alias("max_aoa"),
-        pl.col("AOSS").abs().max().alias("max_abs_aoss"),
-        (pl.col("AOA") > 12).sum().alias("high_aoa_events"),
-        (pl.col("AOSS").abs() > 10).sum().alias("high_aoss_events"),
-    ).row(0, named=True)
-
-    event_values = (
-        df.get_column("EVENT")
-        .drop_nans()
-        .drop_nulls()
-        .cast(pl.Int64)
-        .unique()
-        .sort()
-        .to_list()
+def _sortie_breakdown(
+    sortie: str, runs: list[list[Any]], by_row: bool
+) -> WowSortieSummary:
+    # A segment lasts until the next one starts; the sortie's last segment
+    # ends at its last sample (one row later when times are row indexes).
+    segments: list[WowSegment] = []
+    takeoff_times: list[float] = []
+    landing_times: list[float] = []
+    rows = ground_rows = 0
+    for index, (_, on_ground, start, end, count) in enumerate(runs):
+        start = float(start) if start is not None else 0.0
+        end = float(end) if end is not None else start
+        following = runs[index + 1][2] if index + 1 < len(runs) else None
+        if following is not None:
+            duration = float(following) - start
+        else:
+            duration = end - start + (1 if by_row else 0)
+        if index and on_ground != runs[index - 1][1]:
+            (landing_times if on_ground else takeoff_times).append(start)
+        segments.append(
+            WowSegment(on_ground=on_ground, start=start, end=end, duration=duration)
+        )
+        rows += count
+        ground_rows += count if on_ground else 0
+
+    return WowSortieSummary(
+        sortie=sortie,
+        ground_fraction=ground_rows / rows if rows else 0.0,
+        ground_time=sum(s.duration for s in segments if s.on_ground),
+        airborne_time=sum(s.duration for s in segments if not s.on_ground),
+        takeoff_times=takeoff_times,
+        landing_times=landing_times,
+        num_segments=len(segments),
+        segments=segments[:_MAX_SEGMENTS_PER_SORTIE],
     )
 
+
+def _performance_summary(stats: dict[str, Any]) -> PerformanceSummary:
     risk_notes: list[str] = []
-    if float(perf["max_mach"]) > 0.95:
+    if float(stats["max_mach"]) > 0.95:
         risk_notes.append("Supersonic or near-Mach flight segments detected")
-    if float(perf["max_aoa"]) > 14:
+    if float(stats["max_aoa"]) > 14:
         risk_notes.append("AOA exceeds 14° indicating stall margin probes")
-    if float(perf["max_abs_aoss"]) > 15:
+    if float(stats["max_abs_aoss"]) > 15:
         risk_notes.append("Strong sideslip excursions observed")
 
     return PerformanceSummary(
-        max_mach=float(perf["max_mach"]),
-        max_airspeed=float(perf["max_airspeed"]),
-        max_aoa=float(perf["max_aoa"]),
-        max_abs_aoss=float(perf["max_abs_aoss"]),
-        num_high_aoa_events=int(perf["high_aoa_events"]),
-        num_high_sideslip_events=int(perf["high_aoss_events"]),
-        event_values_present=[int(value) for value in event_values],
+        max_mach=float(stats["max_mach"]),
+        max_airspeed=float(stats["max_tic_airspeed"]),
+        max_aoa=float(stats["max_aoa"]),
+        max_abs_aoss=float(stats["max_abs_aoss"]),
+        num_high_aoa_events=int(stats["high_aoa_events"]),
+        num_high_sideslip_events=int(stats["high_aoss_events"]),
+        num_high_aoa_episodes=stats["episodes"]["aoa"],
+        num_high_sideslip_episodes=stats["episodes"]["sideslip"],
+        event_values_present=sorted(stats.get("events") or ()),
         risk_notes=risk_notes,
     )
 
 
-def _load_dataframe() -> pl.DataFrame:
-    global _DATAFRAME
-    if _DATAFRAME is None:
-        if not DATA_PATH.exists():
-            raise FileNotFoundError(
-                f"Telemetry CSV not found at {DATA_PATH}. "
-                "Place AirForce_Sortie_Aeromod.csv there."
+def _mean(stats: dict[str, Any], name: str) -> float | None:
+    count = stats.get(f"{name}_count")
+    return stats[f"{name}_sum"] / count if count else None
+
+
+def _merged(combine: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+    def merge(total: Any, value: Any) -> Any:
+        if total is None:
+            return value
+        if value is None:
+            return total
+        return combine(total, value)
+
+    return merge
+
+
+def _union(total: list[int], value: list[int]) -> list[int]:
+    return list(set(total).union(value))
+
+
+_WOW_COLUMNS = ["ADC_AIR_GND_WOW", "LT_GEAR_WOW", "RT_GEAR_WOW", "NOSE_WOW"]
+_SOURCE_COLUMNS = [
+    "AMB_AIR_TEMP_C",
+    "PRESS_ALT_IC",
+    "AOSS",
+    "AOA",
+    "AIRSPEED_IC",
+    "AIRSPEED_TIC",
+    "MACH_IC",
+    "LEFT_FUEL_FLOW",
+    "RIGHT_FUEL_FLOW",
+    "LEFT_AB_FUEL_FLOW",
+    "RIGHT_AB_FUEL_FLOW",
+    *_WOW_COLUMNS,
+    "EVENT",
+]
+require_columns("summaries", _SOURCE_COLUMNS)
+# How each partial of ``_reduce_batch`` folds into the running total.
+_MERGE: dict[str, Callable[[Any, Any], Any]] = {
+    **dict.fromkeys(
+        [
+            "temp_sum",
+            "temp_count",
+            "left_sum",
+            "left_count",
+            "right_sum",
+            "right_count",
+            "imbalance_sum",
+            "imbalance_count",
+            "afterburner_sum",
+            "afterburner_count",
+            "rows",
+            "high_aoa_events",
+            "high_aoss_events",
+        ],
+        _merged(operator.add),
+    ),
+    **dict.fromkeys(["min_press_alt", "min_airspeed"], _merged(min)),
+    **dict.fromkeys(
+        [
+            "max_press_alt",
+            "max_abs_aoss",
+            "max_aoa",
+            "max_airspeed",
+            "max_imbalance",
+            "max_mach",
+            "max_tic_airspeed",
+        ],
+        _merged(max),
+    ),
+    "events": _merged(_union),
+}
+
+
+def telemetry_engine() -> TelemetryEngine:
+    """Engine the analyzers use by default (``TELEMETRY_ENGINE``, else eager)."""
+    engine = os.getenv("TELEMETRY_ENGINE", "eager")
+    if engine not in ("eager", "streaming"):
+        raise ValueError(
+            f"TELEMETRY_ENGINE must be 'eager' or 'streaming', not {engine!r}"
+        )
+    return engine  # type: ignore[return-value]
+
+
+def telemetry_load_mode() -> TelemetryLoadMode:
+    """How sortie files are held in memory (``TELEMETRY_LOAD_MODE``, else full)."""
+    mode = os.getenv("TELEMETRY_LOAD_MODE", "full")
+    if mode not in ("full", "compact"):
+        raise ValueError(
+            f"TELEMETRY_LOAD_MODE must be 'full' or 'compact', not {mode!r}"
+        )
+    return mode  # type: ignore[return-value]
+
+
+def memory_budget_bytes() -> int:
+    """Target peak memory of one streaming query (``TELEMETRY_MEMORY_BUDGET_MB``)."""
+    budget_mb = float(
+        os.getenv("TELEMETRY_MEMORY_BUDGET_MB", _DEFAULT_MEMORY_BUDGET_MB)
+    )
+    return int(budget_mb * 1024 * 1024)
+
+
+def loaded_budget_bytes() -> int:
+    """
+    Memory the loaded sortie frames may hold between them
+    (``TELEMETRY_LOADED_MB``); the most recently loaded one is always kept.
+    """
+
+    budget_mb = float(os.getenv("TELEMETRY_LOADED_MB", _DEFAULT_LOADED_MB))
+    return int(budget_mb * 1024 * 1024)
+
+
+def _scan_telemetry(path: Path | None = None) -> pl.LazyFrame:
+    """
+    Lazy scan of the sortie data, for projection and predicate pushdown.
+
+    Scans the Arrow sidecar when one exists for the current CSV, otherwise
+    the CSV itself; nothing is materialized until a query is collected.
+    """
+
+    path = path or DATA_PATH
+    _, size, mtime_ns = _data_key(path)
+    sidecar = sidecar_path(path, (size, mtime_ns))
+    if sidecar.exists():
+        return pl.scan_ipc(sidecar, memory_map=True)
+    return pl.scan_csv(path, **_CSV_READ_KWARGS)
+
+
+def _chunk_rows(columns: int) -> int:
+    # Size streaming chunks so that every thread's chunk stays within the
+    # budget even if all source columns were read (projection only shrinks it).
+    row_bytes = 8 * columns
+    chunk_rows = memory_budget_bytes() // (
+        pl.thread_pool_size() * row_bytes * _CHUNK_OVERHEAD
+    )
+    return max(chunk_rows, 1_000)
+
+
+def _load_dataframe(path: Path | None = None) -> pl.DataFrame:
+    """
+    One sortie's telemetry (``DATA_PATH`` by default), parsed once per CSV version.
+
+    The first parse of a CSV writes an uncompressed Arrow IPC sidecar (see
+    ``sidecar_path``) named after the CSV's size and mtime; every later load,
+    in this or any other process, memory-maps that sidecar instead of parsing
+    the CSV again. Editing or replacing the CSV changes the key, so a stale
+    sidecar is never read. Rows appended to the CSV since the last load are
+    parsed on their own and added to the frame (see ``_load_sortie``).
+
+    Thread-safe: concurrent first calls share one load. It blocks for as long
+    as the load takes, so call it from worker threads (as the sync routes and
+    agent tools are), never on the event loop.
+    """
+
+    return _load_sortie(path).frame
+
+
+@dataclass(frozen=True, slots=True)
+class _LoadedSortie:
+    """
+    A loaded sortie file, and what following its tail needs: how far it has
+    been parsed and enough of its bytes to tell an append from a rewrite.
+    """
+
+    key: tuple[str, int, int]
+    frame: pl.DataFrame
+    # Schema of the file, and the columns kept of it in the compact load mode
+    # (None in the full mode, where ``frame`` has that schema).
+    schema: pl.Schema
+    layout: tuple[str, ...] | None
+    # Bytes of complete lines parsed; None when the file changed while it was
+    # loaded, so that no offset is known to match the frame.
+    offset: int | None
+    # Whether the frame's last row was parsed from an unterminated line after
+    # ``offset`` (a row still being written).
+    pending: bool
+    header: bytes
+    # The bytes just before ``offset``.
+    fingerprint: bytes
+    # Row count of every remembered version of the file whose rows are still
+    # the first rows of ``frame``, this one included.
+    versions: dict[tuple[str, int, int], int]
+
+    def prefix_rows(self, key: tuple[str, int, int]) -> int | None:
+        """
+        How many rows version ``key`` of the file had, if they are all still
+        the first rows of ``frame``: everything built from that version can be
+        brought up to date from the rows after them.
+        """
+
+        return self.versions.get(key)
+
+
+def _load_sortie(path: Path | None = None) -> _LoadedSortie:
+    """
+    Like ``_load_dataframe``, following the file as it grows.
+
+    Recorders append rows to sortie CSVs during and after flights. When the
+    cached file only grew since it was loaded (same header, same bytes before
+    the parsed end), just the new bytes are read, parsed with the frame's
+    schema and appended to it; a row parsed from a line that was still being
+    written is parsed again. Any other change loads the file afresh.
+
+    In the compact load mode (``TELEMETRY_LOAD_MODE``) the frame only holds
+    the required columns, downcast (see ``_compacted``); the others are not
+    read at all, and no sidecar is written for a CSV without one. Loaded
+    sorties stay cached, least recently used first out, while they fit in
+    ``TELEMETRY_LOADED_MB``.
+    """
+
+    path = path or DATA_PATH
+    key = _data_key(path)
+    layout = _compact_layout()
+    cached = _cached_sortie(path)
+    if cached is not None and (cached.key, cached.layout) == (key, layout):
+        return cached
+
+    with _LOADING(key):
+        cached = _cached_sortie(path)
+        if cached is not None and (cached.key, cached.layout) == (key, layout):
+            return cached
+        loaded = None
+        if cached is not None and cached.layout == layout:
+            loaded = _appended(cached, path, key)
+        if loaded is None:
+            frame, schema = _read_sortie(path, key, layout)
+            loaded = _tail_state(path, key, frame, schema, layout)
+            logger.info(
+                f"Loaded {path.name}: {loaded.frame.height} rows, "
+                f"{loaded.frame.estimated_size('mb'):.1f} MiB "
+                f"({'compact' if layout else 'full'})"
             )
-        _DATAFRAME = pl.read_csv(DATA_PATH, **_CSV_READ_KWARGS)
-    return _DATAFRAME
+        with _LOADED_LOCK:
+            _LOADED[str(path)] = loaded
+            _LOADED.move_to_end(str(path))
+            held = sum(sortie.frame.estimated_size() for sortie in _LOADED.values())
+            budget = loaded_budget_bytes()
+            while held > budget and len(_LOADED) > 1:
+                _, evicted = _LOADED.popitem(last=False)
+                held -= evicted.frame.estimated_size()
+        return loaded
+
+
+def _cached_sortie(path: Path) -> _LoadedSortie | None:
+    with _LOADED_LOCK:
+        cached = _LOADED.get(str(path))
+        if cached is not None:
+            _LOADED.move_to_end(str(path))
+        return cached
+
+
+def _read_sortie(
+    path: Path, key: tuple[str, int, int], layout: tuple[str, ...] | None
+) -> tuple[pl.DataFrame, pl.Schema]:
+    """
+    One sortie file as held in memory, and the schema of the file. The
+    compact layout's columns are selected in the scan, so the other columns
+    are never read from the sidecar, nor parsed from a CSV without one.
+    """
+
+    if layout is None:
+        frame = load_sortie_file(path, key)
+        return frame, frame.schema
+    scan = _scan_telemetry(path)
+    schema = scan.collect_schema()
+    frame = scan.select(_compact_columns(schema, layout)).collect()
+    return _compacted(frame, layout), schema
+
+
+def _compact_layout() -> tuple[str, ...] | None:
+    if telemetry_load_mode() == "full":
+        return None
+    required = (name for names in _REQUIRED_COLUMNS.values() for name in names)
+    return tuple(dict.fromkeys(required))
+
+
+def _compacted(frame: pl.DataFrame, layout: tuple[str, ...] | None) -> pl.DataFrame:
+    """
+    ``frame`` with only the ``layout`` columns (and the sortie and time
+    columns), each in the narrowest dtype the consumers can read it in:
+    Float32 channels, UInt8 weight-on-wheels flags (1 where the flag is set),
+    the smallest integer type holding the values of integer columns, and a
+    categorical sortie id. Time columns keep their dtype and precision.
+    """
+
+    if layout is None:
+        return frame
+    schema = frame.schema
+    sortie_column = _sortie_column(schema)
+    time_column = _time_column(schema)
+    columns = []
+    for name in _compact_columns(schema, layout):
+        column = frame.get_column(name)
+        if name == time_column:
+            columns.append(column)
+            continue
+        if name == sortie_column:
+            column = column.cast(pl.String).cast(pl.Categorical)
+        elif name in _WOW_COLUMNS:
+            column = (column > 0).cast(pl.UInt8)
+        elif column.dtype.is_integer():
+            column = column.shrink_dtype()
+        elif column.dtype == pl.Float64:
+            column = column.cast(pl.Float32)
+        columns.append(column)
+    return pl.DataFrame(columns)
+
+
+def _compact_columns(schema: pl.Schema, layout: tuple[str, ...]) -> list[str]:
+    """The columns of ``schema`` the compact ``layout`` keeps."""
+    kept = dict.fromkeys([*layout, *_segment_columns(schema)])
+    return [name for name in kept if name in schema]
+
+
+def telemetry_memory_report(sortie: str | None = None) -> TelemetryMemoryReport:
+    """
+    Bytes held in memory per column of one loaded sortie (``DATA_PATH`` by
+    default), loading it first if needed.
+    """
+
+    [(sortie_id, path)] = _resolve_sorties(sortie)
+    loaded = _load_sortie(path)
+    columns = [
+        ColumnMemory(
+            name=column.name, dtype=str(column.dtype), bytes=column.estimated_size()
+        )
+        for column in loaded.frame.iter_columns()
+    ]
+    return TelemetryMemoryReport(
+        sortie=sortie_id,
+        load_mode="full" if loaded.layout is None else "compact",
+        rows=loaded.frame.height,
+        file_columns=len(loaded.schema),
+        total_bytes=sum(column.bytes for column in columns),
+        columns=columns,
+    )
+
+
+def _tail_state(
+    path: Path,
+    key: tuple[str, int, int],
+    frame: pl.DataFrame,
+    schema: pl.Schema,
+    layout: tuple[str, ...] | None,
+) -> _LoadedSortie:
+    _, size, _ = key
+    with path.open("rb") as file:
+        header = file.readline()
+        # Start of the last line: the end of the file unless it is unterminated.
+        offset = size
+        file.seek(max(size - 1, 0))
+        if file.read(1) != b"\n":
+            offset = _line_start(file, size)
+        file.seek(offset)
+        last_line = file.read(size - offset)
+        file.seek(max(offset - _FINGERPRINT_BYTES, 0))
+        fingerprint = file.read(offset - file.tell())
+    followable = header.endswith(b"\n") and offset >= len(header)
+    if not followable or _data_key(path) != key:
+        return _LoadedSortie(
+            key, frame, schema, layout, None, False, b"", b"", {key: frame.height}
+        )
+    return _LoadedSortie(
+        key,
+        frame,
+        schema,
+        layout,
+        offset,
+        bool(last_line.strip()) and frame.height > 0,
+        header,
+        fingerprint,
+        {key: frame.height},
+    )
+
+
+def _line_start(file: io.BufferedReader, end: int) -> int:
+    """Offset just after the last newline before ``end`` (0 without one)."""
+    position = end
+    while position > 0:
+        block_start = max(position - 64 * 1024, 0)
+        file.seek(block_start)
+        newline = file.read(position - block_start).rfind(b"\n")
+        if newline >= 0:
+            return block_start + newline + 1
+        position = block_start
+    return 0
+
+
+def _appended(
+    loaded: _LoadedSortie, path: Path, key: tuple[str, int, int]
+) -> _LoadedSortie | None:
+    """``loaded`` with the rows appended to its file since, unless it was rewritten."""
+    _, size, _ = key
+    if loaded.offset is None or size <= loaded.key[1]:
+        return None
+    with path.open("rb") as file:
+        if file.read(len(loaded.header)) != loaded.header:
+            return None
+        file.seek(loaded.offset - len(loaded.fingerprint))
+        if file.read(len(loaded.fingerprint)) != loaded.fingerprint:
+            return None
+        data = file.read(size - loaded.offset)
+    if len(data) != size - loaded.offset:
+        return None
+    try:
+        rows = pl.read_csv(
+            io.BytesIO(loaded.header + data),
+            schema=loaded.schema,
+            null_values=_CSV_READ_KWARGS["null_values"],
+        )
+    except pl.exceptions.PolarsError as exc:
+        logger.warning(f"Reloading {path}: appended rows do not parse: {exc}")
+        return None
+
+    frame = loaded.frame
+    versions = dict(loaded.versions)
+    if loaded.pending:
+        frame = frame.head(frame.height - 1)
+        versions = {old: n for old, n in versions.items() if n <= frame.height}
+    # Relaxed: compacted integers of the new rows may need a wider type.
+    frame = pl.concat([frame, _compacted(rows, loaded.layout)], how="vertical_relaxed")
+    if frame.n_chunks() > _MAX_APPENDED_CHUNKS:
+        frame = frame.rechunk()
+    versions[key] = frame.height
+    while len(versions) > _FOLLOWED_VERSIONS:
+        del versions[next(iter(versions))]
+    complete = data.rfind(b"\n") + 1
+    return _LoadedSortie(
+        key,
+        frame,
+        loaded.schema,
+        loaded.layout,
+        loaded.offset + complete,
+        bool(data[complete:].strip()),
+        loaded.header,
+        (loaded.fingerprint + data[:complete])[-_FINGERPRINT_BYTES:],
+        versions,
+    )
+
+
+def load_sortie_file(path: Path, key: tuple[str, int, int]) -> pl.DataFrame:
+    """
+    One sortie CSV as a frame: its sidecar memory-mapped, or the CSV parsed
+    and a sidecar written for next time. ``key`` is the file's ``_data_key``.
+    """
+    _, size, mtime_ns = key
+    sidecar = sidecar_path(path, (size, mtime_ns))
+    df = _read_sidecar(sidecar)
+    if df is None:
+        df = pl.read_csv(path, **_CSV_READ_KWARGS)
+        _write_sidecar(df, sidecar, path)
+    return df
+
+
+def _data_key(path: Path | None = None) -> tuple[str, int, int]:
+    """Identity of a CSV version (``DATA_PATH`` by default): path, size, mtime."""
+    path = path or DATA_PATH
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        hint = " Place AirForce_Sortie_Aeromod.csv there." if path == DATA_PATH else ""
+        raise FileNotFoundError(f"Telemetry CSV not found at {path}.{hint}") from None
+    return str(path), stat.st_size, stat.st_mtime_ns
+
+
+def sidecar_path(csv_path: Path, key: tuple[int, int]) -> Path:
+    """
+    Arrow IPC sidecar for one version of ``csv_path``.
+
+    Sidecars live in a ``.telemetry-cache`` directory next to the CSV or,
+    when set, in ``TELEMETRY_CACHE_DIR``, shared by CSVs from many
+    directories: there their names also carry a hash of the CSV's resolved
+    path, so ``a/sortie1.csv`` and ``b/sortie1.csv`` keep apart.
+    """
+
+    cache_dir = os.getenv("TELEMETRY_CACHE_DIR")
+    directory = Path(cache_dir) if cache_dir else csv_path.parent / ".telemetry-cache"
+    size, mtime_ns = key
+    return directory / f"{_sidecar_stem(csv_path)}.{size}-{mtime_ns}.arrow"
+
+
+def _sidecar_stem(csv_path: Path) -> str:
+    if not os.getenv("TELEMETRY_CACHE_DIR"):
+        return csv_path.stem
+    digest = hashlib.sha256(str(csv_path.resolve()).encode()).hexdigest()
+    return f"{csv_path.stem}-{digest[:16]}"
+
+
+def _read_sidecar(sidecar: Path) -> pl.DataFrame | None:
+    if not sidecar.exists():
+        return None
+    try:
+        return pl.read_ipc(sidecar, memory_map=True)
+    except (OSError, pl.exceptions.PolarsError) as exc:
+        logger.warning(f"Ignoring unreadable telemetry sidecar {sidecar}: {exc}")
+        return None
+
+
+def _write_sidecar(df: pl.DataFrame, sidecar: Path, csv_path: Path) -> None:
+    # Written under a temporary name and renamed into place, so concurrent
+    # loaders only ever see a missing or a complete sidecar.
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=sidecar.parent, prefix=f".{sidecar.name}.", suffix=".tmp"
+        )
+        os.close(fd)
+        try:
+            df.write_ipc(tmp_name, compression="uncompressed")
+            os.replace(tmp_name, sidecar)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError as exc:
+        logger.warning(f"Could not write telemetry sidecar {sidecar}: {exc}")
+        return
+
+    pattern = re.compile(rf"{re.escape(_sidecar_stem(csv_path))}\.\d+-\d+\.arrow")
+    for stale in sidecar.parent.iterdir():
+        if stale != sidecar and pattern.fullmatch(stale.name):
+            stale.unlink(missing_ok=True)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Literal
+
+from loguru import logger
+
+from backend.services import telemetry_similarity, telemetry_tools
+from backend.services.telemetry_similarity import similarity_index
+from backend.services.telemetry_tools import (
+    _data_key,
+    _resolve_sorties,
+    telemetry_summaries,
+)
+
+# "background" warms up while the app already serves requests (check /ready);
+# "blocking" finishes warming up before the app starts serving.
+WarmupMode = Literal["off", "background", "blocking"]
+# cold: not loaded yet; unavailable: there is no data file to load.
+TelemetryWarmth = Literal["cold", "warming", "warm", "unavailable", "failed"]
+
+
+def warmup_mode() -> WarmupMode:
+    """How the app warms telemetry up at startup (``TELEMETRY_WARMUP``)."""
+    mode = os.getenv("TELEMETRY_WARMUP", "off")
+    if mode not in ("off", "background", "blocking"):
+        raise ValueError(
+            f"TELEMETRY_WARMUP must be 'off', 'background' or 'blocking', not {mode!r}"
+        )
+    return mode  # type: ignore[return-value]
+
+
+def warm_telemetry() -> None:
+    """
+    Load the default sortie and build everything the agent tools read for an
+    evaluation: the summaries (with the episode index) and the similarity
+    index. Blocking; run it in a worker thread.
+    """
+
+    [(sortie, path)] = _resolve_sorties(None)
+    telemetry_summaries()
+    similarity_index(sortie, path)
+
+
+def telemetry_is_warm() -> bool:
+    """Whether an evaluation would find the default sortie fully loaded."""
+    [(_, path)] = _resolve_sorties(None)
+    try:
+        key = _data_key(path)
+    except FileNotFoundError:
+        return False
+    return telemetry_tools.is_cached(key) and telemetry_similarity.is_cached(key)
+
+
+class TelemetryWarmup:
+    """
+    Startup warm-up of the telemetry, off the event loop.
+
+    Loading and indexing a sortie file can take seconds, and the first request
+    needing it would otherwise pay for it. The warm-up runs ``warm_telemetry``
+    in a worker thread; requests arriving meanwhile share that load instead of
+    starting their own (the loaders are single-flight).
+    """
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task[None] | None = None
+        self._failure: TelemetryWarmth | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def state(self) -> TelemetryWarmth:
+        if self.running:
+            return "warming"
+        if telemetry_is_warm():
+            return "warm"
+        return self._failure or "cold"
+
+    async def start(self) -> None:
+        mode = warmup_mode()
+        if mode == "off" or self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(), name="telemetry-warmup"
+        )
+        if mode == "blocking":
+            await self._task
+
+    async def stop(self) -> None:
+        """Stop waiting for the warm-up; a load in progress finishes in its thread."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(warm_telemetry)
+        except FileNotFoundError as exc:
+            self._failure = "unavailable"
+            logger.warning(f"Telemetry warm-up skipped: {exc}")
+        except Exception:
+            self._failure = "failed"
+            logger.exception("Telemetry warm-up failed")
+        else:
+            self._failure = None
+            logger.info(f"Telemetry warm in {time.perf_counter() - started:.2f} s")
+
+
+TELEMETRY_WARMUP = TelemetryWarmup()
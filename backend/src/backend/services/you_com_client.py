@@ -1,20 +1,166 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
 from textwrap import shorten
 
-import httpx
+from loguru import logger
 
 from backend.schemas import AgentExplanation, FlightContext, RiskResult
+from backend.services.http_client import SharedHttpClient
+from backend.services.query_normalization import canonical_aircraft, time_bucket
 
 _DEFAULT_SEARCH_URL = "https://api.ydc-index.io/v1/search"
 _MAX_SNIPPET_CHARS = 220
 
+# Pooled connections to the You.com API, opened and closed with the app;
+# configured through the YOU_COM_* settings of SharedHttpClient.
+YOU_COM_HTTP = SharedHttpClient("YOU_COM")
+
+SearchFetch = Callable[[], Awaitable[list[dict]]]
+
 
 class YouComClientError(RuntimeError):
     """Raised when the You.com API cannot fulfill a request."""
 
 
+@dataclass(frozen=True, slots=True)
+class _CachedSearch:
+    # Wall-clock time (epoch seconds), so persisted entries age across restarts.
+    fetched_at: float
+    results: list[dict]
+
+
+class SearchCache:
+    """
+    Web results of You.com searches by (normalized) query, so evaluations of
+    near-identical flights share one paid search.
+
+    Results are fresh for ``YOU_COM_CACHE_TTL_S`` seconds (default 3600, ``0``
+    disables the cache). For ``YOU_COM_CACHE_STALE_S`` seconds after that
+    (default 86400) they are still served, while a background search
+    refreshes them; older ones are searched again before answering. Callers
+    of a query already being searched wait for that search. At most
+    ``YOU_COM_CACHE_SIZE`` queries (default 256) are kept, least recently
+    used first out. With ``YOU_COM_CACHE_PATH`` set, the cache is loaded
+    from that JSON file on first use and saved to it after every search.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self.clock = clock
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, _CachedSearch] = OrderedDict()
+        self._searches: dict[str, asyncio.Task[list[dict]]] = {}
+        self._loaded = False
+
+    async def get(self, query: str, fetch: SearchFetch) -> list[dict]:
+        """The results of ``query``, from the cache or by awaiting ``fetch``."""
+        ttl_s = float(os.getenv("YOU_COM_CACHE_TTL_S", "3600"))
+        if ttl_s <= 0:
+            return await fetch()
+        if not self._loaded:
+            self._loaded = True
+            await asyncio.to_thread(self._load)
+        entry = self._entries.get(query)
+        if entry is not None:
+            self._entries.move_to_end(query)
+            age_s = self.clock() - entry.fetched_at
+            if age_s < ttl_s:
+                self.hits += 1
+                return entry.results
+            if age_s < ttl_s + float(os.getenv("YOU_COM_CACHE_STALE_S", "86400")):
+                self.stale_hits += 1
+                self._search(query, fetch)
+                return entry.results
+        self.misses += 1
+        # Shielded: a cancelled caller must not cancel the search others share.
+        return await asyncio.shield(self._search(query, fetch))
+
+    async def stop(self) -> None:
+        """Cancel the background refreshes still running."""
+        searches = list(self._searches.values())
+        for search in searches:
+            search.cancel()
+        await asyncio.gather(*searches, return_exceptions=True)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._loaded = False
+
+    def _search(self, query: str, fetch: SearchFetch) -> asyncio.Task[list[dict]]:
+        search = self._searches.get(query)
+        if search is None:
+            search = asyncio.get_running_loop().create_task(
+                self._store(query, fetch), name="you-com-search"
+            )
+            self._searches[query] = search
+            search.add_done_callback(lambda _: self._searches.pop(query, None))
+            search.add_done_callback(_log_failed_refresh)
+        return search
+
+    async def _store(self, query: str, fetch: SearchFetch) -> list[dict]:
+        results = await fetch()
+        self._entries[query] = _CachedSearch(self.clock(), results)
+        self._entries.move_to_end(query)
+        size = int(os.getenv("YOU_COM_CACHE_SIZE", "256"))
+        while len(self._entries) > size:
+            self._entries.popitem(last=False)
+        if os.getenv("YOU_COM_CACHE_PATH"):
+            await asyncio.to_thread(self._save, dict(self._entries))
+        return results
+
+    def _load(self) -> None:
+        path = os.getenv("YOU_COM_CACHE_PATH")
+        if not path or not Path(path).exists():
+            return
+        try:
+            stored = json.loads(Path(path).read_text())
+            entries = {
+                query: _CachedSearch(float(entry["fetched_at"]), entry["results"])
+                for query, entry in stored.items()
+            }
+        except (OSError, ValueError, TypeError, KeyError) as exc:
+            logger.warning(f"Ignoring unreadable You.com search cache {path}: {exc}")
+            return
+        # Oldest first, so the least recently fetched are evicted first.
+        for query, entry in sorted(entries.items(), key=lambda e: e[1].fetched_at):
+            self._entries.setdefault(query, entry)
+
+    @staticmethod
+    def _save(entries: dict[str, _CachedSearch]) -> None:
+        path = Path(os.environ["YOU_COM_CACHE_PATH"])
+        stored = {
+            query: {"fetched_at": entry.fetched_at, "results": entry.results}
+            for query, entry in entries.items()
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=path.parent, suffix=".tmp", delete=False
+            ) as file:
+                json.dump(stored, file)
+            os.replace(file.name, path)
+        except OSError as exc:
+            logger.warning(f"Could not save the You.com search cache to {path}: {exc}")
+
+
+def _log_failed_refresh(search: asyncio.Task[list[dict]]) -> None:
+    if not search.cancelled() and search.exception() is not None:
+        logger.warning(f"You.com search failed: {search.exception()}")
+
+
+YOU_COM_CACHE = SearchCache()
+
+
 async def generate_you_com_explanation(
     context: FlightContext,
     risk: RiskResult,
@@ -26,17 +172,17 @@ async def generate_you_com_explanation(
     endpoint = os.getenv("YOU_COM_SEARCH_URL", _DEFAULT_SEARCH_URL)
     query = _build_query(context, risk)
 
-    timeout = httpx.Timeout(30.0, connect=10.0)
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.get(
+    async def search() -> list[dict]:
+        response = await YOU_COM_HTTP.request(
+            "GET",
             endpoint,
             headers={"X-API-Key": api_key},
             params={"query": query},
         )
+        response.raise_for_status()
+        return _extract_web_results(response.json())
 
-    response.raise_for_status()
-    data = response.json()
-    web_results = _extract_web_results(data)
+    web_results = await YOU_COM_CACHE.get(query, search)
 
     explanation = _compose_explanation(risk, web_results)
     recommendations = _compose_recommendations(risk, web_results)
@@ -117,12 +263,23 @@ def _build_citations(web_results: list[dict]) -> list[str] | None:
 
 
 def _build_query(context: FlightContext, risk: RiskResult) -> str:
+    """
+    The search query for a flight, normalized so that near-identical flights
+    share it (and its cached results): the departure time is bucketed, the
+    top factors sorted and the aircraft type canonicalized; the exact score
+    is left out in favour of the tier.
+    """
+
+    top_factors = sorted(risk.factors, key=lambda f: (-f.impact, f.label))[:3]
     factors = (
-        ", ".join(f.label for f in risk.factors[:3]) or "general aviation risk factors"
+        ", ".join(sorted(f.label for f in top_factors))
+        or "general aviation risk factors"
     )
     return (
-        f"Flight risk guidance for {context.aircraft_type} departing {context.departure_icao} "
-        f"to {context.destination_icao} around {context.departure_time_utc.isoformat()}. "
-        f"Risk tier {risk.tier} score {risk.score}. Factors: {factors}. "
+        f"Flight risk guidance for {canonical_aircraft(context.aircraft_type)} "
+        f"departing {context.departure_icao.upper()} "
+        f"to {context.destination_icao.upper()} "
+        f"around {time_bucket(context.departure_time_utc)}. "
+        f"Risk tier {risk.tier}. Factors: {factors}. "
         "Personal minimums and IFR considerations."
     )
@@ -0,0 +1,163 @@
+"""Synthetic data shared by the test suite and the benchmarks."""
+
+import random
+from datetime import UTC, datetime
+
+import polars as pl
+
+from backend.schemas import FlightContext, RiskFactor
+
+
+def base_context() -> FlightContext:
+    """A benign daytime VFR flight that fires no risk rules."""
+    return FlightContext(
+        departure_icao="KPAO",
+        destination_icao="KSQL",
+        departure_time_utc=datetime(2025, 1, 1, 18, 0, tzinfo=UTC),
+        pilot_total_hours=250,
+        pilot_hours_last_90_days=20,
+        pilot_instrument_rating=True,
+        pilot_night_current=True,
+        aircraft_type="C172",
+        aircraft_mtow_kg=1111,
+        planned_takeoff_weight_kg=900,
+        conditions_ifr_expected=False,
+        conditions_night=False,
+        terrain_mountainous=False,
+        departure_visibility_sm=10,
+        destination_visibility_sm=10,
+        departure_ceiling_ft=5000,
+        destination_ceiling_ft=5000,
+        max_crosswind_knots=5,
+        gusts_knots=10,
+        freezing_level_ft=8000,
+        icing_risk_0_1=0.1,
+        turbulence_risk_0_1=0.1,
+    )
+
+
+def random_contexts(base: FlightContext, count: int) -> list[FlightContext]:
+    """
+    ``count`` seeded variations of ``base`` whose values cluster around every
+    rule threshold of the default table.
+    """
+    rng = random.Random(1234)
+    contexts = []
+    for _ in range(count):
+        contexts.append(
+            base.model_copy(
+                update={
+                    "pilot_total_hours": rng.choice([0, 49, 50, 99, 100, 500]),
+                    "pilot_hours_last_90_days": rng.choice([0, 9, 10, 30]),
+                    "pilot_instrument_rating": rng.random() < 0.5,
+                    "pilot_night_current": rng.random() < 0.5,
+                    "aircraft_mtow_kg": rng.choice([0.0, 0.5, 1000.0, 1111.0]),
+                    "planned_takeoff_weight_kg": rng.uniform(0, 1200),
+                    "conditions_ifr_expected": rng.random() < 0.5,
+                    "conditions_night": rng.random() < 0.5,
+                    "departure_visibility_sm": rng.choice([0.5, 2.99, 3.0, 10.0]),
+                    "destination_visibility_sm": rng.choice([0.5, 3.0, 10.0]),
+                    "departure_ceiling_ft": rng.choice([200, 999, 1000, 5000]),
+                    "destination_ceiling_ft": rng.choice([200, 1000, 5000]),
+                    "max_crosswind_knots": rng.choice([0, 15, 15.5, 20, 20.5, 30]),
+                    "gusts_knots": rng.uniform(0, 50),
+                    "icing_risk_0_1": rng.choice([0.0, 0.5, 0.6, 0.7, 0.71, 1.0]),
+                    "turbulence_risk_0_1": rng.choice([0.0, 0.5, 0.51, 1.0]),
+                }
+            )
+        )
+    return contexts
+
+
+def legacy_compute_risk(context: FlightContext) -> tuple[int, list[RiskFactor]]:
+    """The hand-written rules the default table replaced, kept as a reference."""
+    score = 0
+    factors: list[RiskFactor] = []
+
+    def record(condition: bool, label: str, impact: int) -> None:
+        nonlocal score
+        if condition:
+            score += impact
+            factors.append(RiskFactor(label=label, impact=impact))
+
+    if context.pilot_total_hours < 50:
+        record(True, "Pilot total hours < 50", 25)
+    elif context.pilot_total_hours < 100:
+        record(True, "Pilot total hours < 100", 15)
+    record(
+        context.pilot_hours_last_90_days < 10,
+        "Pilot flew < 10 hours in last 90 days",
+        15,
+    )
+    mtow_ratio = context.planned_takeoff_weight_kg / max(context.aircraft_mtow_kg, 1)
+    record(mtow_ratio > 0.9, "Planned takeoff weight > 90% MTOW", 15)
+    record(
+        context.conditions_ifr_expected and not context.pilot_instrument_rating,
+        "IFR expected but pilot not instrument-rated",
+        30,
+    )
+    record(
+        context.conditions_night and not context.pilot_night_current,
+        "Night flight with lapsed night currency",
+        20,
+    )
+    if context.max_crosswind_knots > 20:
+        record(True, "Crosswind component > 20 kt", 30)
+    elif context.max_crosswind_knots > 15:
+        record(True, "Crosswind component > 15 kt", 20)
+    record(
+        context.departure_visibility_sm < 3 or context.destination_visibility_sm < 3,
+        "Visibility under 3 SM",
+        20,
+    )
+    record(
+        context.departure_ceiling_ft < 1000 or context.destination_ceiling_ft < 1000,
+        "Ceiling under 1000 ft",
+        20,
+    )
+    if context.icing_risk_0_1 > 0.7:
+        record(True, "Severe icing risk (>0.7)", 35)
+    elif context.icing_risk_0_1 > 0.5:
+        record(True, "Moderate icing risk (>0.5)", 25)
+    record(context.turbulence_risk_0_1 > 0.5, "Elevated turbulence risk (>0.5)", 15)
+    record(
+        context.gusts_knots - context.max_crosswind_knots > 15,
+        "Large gust spread (>15 kt)",
+        10,
+    )
+    return max(0, min(100, score)), factors
+
+
+def make_sortie_frame(rows: int = 600) -> pl.DataFrame:
+    """
+    Synthetic sortie telemetry with the columns the telemetry tools read.
+
+    The aircraft sits on the ground for the first and last sixth of the rows
+    (one takeoff, one landing) and flies a smooth profile in between.
+    """
+    index = pl.col("index")
+    airborne = (index >= rows // 6) & (index < rows - rows // 6)
+    wave = (index * 0.05).sin()
+    wow = (~airborne).cast(pl.Int64)
+    return pl.DataFrame({"index": range(rows)}).select(
+        (15 - wave * 5).alias("AMB_AIR_TEMP_C"),
+        (288.15 - wave * 5).alias("ADC_AMBIENT_AIR_TEMP"),
+        pl.when(airborne)
+        .then(5000 + wave * 4000)
+        .otherwise(20.0)
+        .alias("PRESS_ALT_IC"),
+        (wave * 12).alias("AOSS"),
+        (4 + (index * 0.11).cos() * 10).alias("AOA"),
+        pl.when(airborne).then(300 + wave * 80).otherwise(10.0).alias("AIRSPEED_IC"),
+        pl.when(airborne).then(310 + wave * 80).otherwise(12.0).alias("AIRSPEED_TIC"),
+        pl.when(airborne).then(0.6 + wave * 0.4).otherwise(0.01).alias("MACH_IC"),
+        (2000 + wave * 300).alias("LEFT_FUEL_FLOW"),
+        (2000 - wave * 300).alias("RIGHT_FUEL_FLOW"),
+        pl.when(wave > 0.8).then(500.0).otherwise(0.0).alias("LEFT_AB_FUEL_FLOW"),
+        pl.lit(0.0).alias("RIGHT_AB_FUEL_FLOW"),
+        wow.alias("ADC_AIR_GND_WOW"),
+        wow.alias("LT_GEAR_WOW"),
+        wow.alias("RT_GEAR_WOW"),
+        wow.alias("NOSE_WOW"),
+        pl.when(index % 97 == 0).then(index % 3).alias("EVENT"),
+    )
@@ -0,0 +1,539 @@
+import asyncio
+import json
+import time
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from backend.apps.should_you_fly.rest.routes import _evaluation_events
+from backend.schemas import (
+    MAX_BATCH_LEGS,
+    AgentExplanation,
+    EvaluationJob,
+    ExplanationProgress,
+    FlightContext,
+    HistoryPage,
+    HistoryPoint,
+)
+from backend.services import RECENT_EVALUATIONS, JobQueueFullError, compute_risk
+
+_HISTORY_START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def _sse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append(
+            (event.removeprefix("event: "), json.loads(data[len("data: ") :]))
+        )
+    return events
+
+
+class TestEvaluateStream:
+    def test_streams_risk_progress_then_explanation(
+        self, mocker, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        async def explain(context, risk, preference, progress):
+            progress(ExplanationProgress(kind="provider_started", provider="Gemini"))
+            progress(ExplanationProgress(kind="text", provider="Gemini", text="Be"))
+            return AgentExplanation(
+                explanation="Benign.", recommendations=[], source="Gemini"
+            )
+
+        mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.generate_agent_explanation",
+            explain,
+        )
+
+        response = test_client.post(
+            "/api/should-you-fly/evaluate/stream",
+            json=flight_context.model_dump(mode="json"),
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _sse_events(response.text)
+        assert [event for event, _ in events] == [
+            "risk",
+            "progress",
+            "progress",
+            "explanation",
+        ]
+        assert events[0][1] == compute_risk(flight_context).model_dump()
+        assert events[2][1]["text"] == "Be"
+        assert events[3][1]["explanation"] == "Benign."
+
+    async def test_sends_the_risk_before_the_explanation_is_done(
+        self, mocker, flight_context: FlightContext
+    ) -> None:
+        explained = asyncio.Event()
+
+        async def explain(context, risk, preference, progress):
+            await explained.wait()
+            return AgentExplanation(explanation="Late.", recommendations=[])
+
+        mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.generate_agent_explanation",
+            explain,
+        )
+        risk = compute_risk(flight_context)
+        events = _evaluation_events(flight_context, risk, "auto")
+
+        first = await asyncio.wait_for(anext(events), timeout=1)
+        assert first.startswith("event: risk\n")
+        explained.set()
+        rest = [event async for event in events]
+
+        assert rest[-1].startswith("event: explanation\n")
+
+    async def test_stops_waiting_for_progress_when_the_client_leaves(
+        self, mocker, flight_context: FlightContext
+    ) -> None:
+        async def explain(context, risk, preference, progress):
+            progress(ExplanationProgress(kind="shared"))
+            await asyncio.Event().wait()
+
+        mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.generate_agent_explanation",
+            explain,
+        )
+        events = _evaluation_events(
+            flight_context, compute_risk(flight_context), "auto"
+        )
+        await anext(events)
+        progress = await asyncio.wait_for(anext(events), timeout=1)
+        # The client disconnects while the stream waits for more progress.
+        waiting = asyncio.create_task(anext(events))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        await asyncio.sleep(0)
+
+        assert '"kind":"shared"' in progress
+        assert not [
+            task
+            for task in asyncio.all_tasks()
+            if task.get_coro().__qualname__ == "Queue.get" and not task.done()
+        ]
+
+    def test_reports_provider_errors_as_an_event(
+        self, mocker, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.generate_agent_explanation",
+            mocker.AsyncMock(side_effect=RuntimeError("GOOGLE_API_KEY is not set.")),
+        )
+
+        response = test_client.post(
+            "/api/should-you-fly/evaluate/stream",
+            params={"agent_source": "gemini"},
+            json=flight_context.model_dump(mode="json"),
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert _sse_events(response.text)[1:] == [
+            ("error", {"detail": "GOOGLE_API_KEY is not set."})
+        ]
+
+
+def _evaluation_job(flight_context: FlightContext, **update) -> EvaluationJob:
+    now = datetime(2025, 1, 1, 17, 0, tzinfo=UTC)
+    job = EvaluationJob(
+        id=UUID(int=1),
+        status="queued",
+        priority=0,
+        agent_source="auto",
+        created_at=now,
+        updated_at=now,
+        risk=compute_risk(flight_context),
+    )
+    return job.model_copy(update=update)
+
+
+class TestEvaluationJobs:
+    def test_background_evaluations_answer_202_with_the_job(
+        self, mocker, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        submit = mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.submit_evaluation_job",
+            return_value=_evaluation_job(flight_context, priority=4),
+        )
+
+        response = test_client.post(
+            "/api/should-you-fly/evaluate?background=true&priority=4",
+            json=flight_context.model_dump(mode="json"),
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job_id = str(UUID(int=1))
+        assert response.headers["location"] == f"/api/should-you-fly/jobs/{job_id}"
+        assert response.json()["risk"] == compute_risk(flight_context).model_dump()
+        assert submit.call_args.args[2:] == ("auto", 4)
+
+    def test_a_full_queue_answers_503(
+        self, mocker, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.submit_evaluation_job",
+            side_effect=JobQueueFullError("1000 evaluation jobs are already queued"),
+        )
+
+        response = test_client.post(
+            "/api/should-you-fly/evaluate?background=true",
+            json=flight_context.model_dump(mode="json"),
+        )
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def test_priorities_are_bounded(
+        self, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        response = test_client.post(
+            "/api/should-you-fly/evaluate?background=true&priority=11",
+            json=flight_context.model_dump(mode="json"),
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_jobs_can_be_polled_and_cancelled(
+        self, mocker, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.fetch_job",
+            return_value=_evaluation_job(flight_context, status="running"),
+        )
+        mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.cancel_job",
+            return_value=_evaluation_job(flight_context, status="cancelled"),
+        )
+        url = f"/api/should-you-fly/jobs/{UUID(int=1)}"
+
+        assert test_client.get(url).json()["status"] == "running"
+        assert test_client.delete(url).json()["status"] == "cancelled"
+
+    def test_unknown_jobs_are_404(self, mocker, test_client: TestClient) -> None:
+        mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.fetch_job", return_value=None
+        )
+        mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.cancel_job", return_value=None
+        )
+        url = f"/api/should-you-fly/jobs/{UUID(int=1)}"
+
+        assert test_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+        assert test_client.delete(url).status_code == status.HTTP_404_NOT_FOUND
+        assert test_client.get(f"{url}/events").status_code == (
+            status.HTTP_404_NOT_FOUND
+        )
+
+    def test_job_events_follow_the_job_until_it_is_done(
+        self, mocker, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        explanation = AgentExplanation(
+            explanation="Benign.", recommendations=[], source="Gemini"
+        )
+        updates = [
+            _evaluation_job(flight_context, status="running"),
+            _evaluation_job(flight_context, status="done", explanation=explanation),
+        ]
+
+        async def watch(job_id):
+            for job in updates:
+                yield job
+
+        mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.fetch_job",
+            return_value=updates[0],
+        )
+        mocker.patch("backend.apps.should_you_fly.rest.routes.watch_job", watch)
+
+        response = test_client.get(f"/api/should-you-fly/jobs/{UUID(int=1)}/events")
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _sse_events(response.text)
+        assert [(event, job["status"]) for event, job in events] == [
+            ("job", "running"),
+            ("job", "done"),
+        ]
+        assert events[-1][1]["explanation"]["explanation"] == "Benign."
+
+
+class TestEvaluateBatch:
+    def test_scores_every_leg_in_order(
+        self, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        risky = flight_context.model_copy(
+            update={"pilot_total_hours": 10, "max_crosswind_knots": 25}
+        )
+        legs = [flight_context, risky, flight_context]
+
+        response = test_client.post(
+            "/api/should-you-fly/evaluate/batch",
+            json=[leg.model_dump(mode="json") for leg in legs],
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert [item["risk"] for item in body] == [
+            compute_risk(leg).model_dump() for leg in legs
+        ]
+        assert all(item["explanation"] is None for item in body)
+
+    def test_rejects_invalid_leg(
+        self, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        payload = flight_context.model_dump(mode="json")
+        del payload["pilot_total_hours"]
+
+        response = test_client.post(
+            "/api/should-you-fly/evaluate/batch", json=[payload]
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_explains_legs_on_request(
+        self, mocker, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        explanation = {
+            "explanation": "Benign conditions.",
+            "recommendations": ["Fly safe."],
+            "telemetry_findings": None,
+            "source": "Gemini",
+        }
+        mock_explain = mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.generate_agent_explanation",
+            mocker.AsyncMock(return_value=explanation),
+        )
+
+        response = test_client.post(
+            "/api/should-you-fly/evaluate/batch",
+            params={"explain": True, "agent_source": "gemini"},
+            json=[flight_context.model_dump(mode="json")] * 2,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["explanation"] for item in response.json()] == [
+            {**explanation, "attempts": None, "cache": None}
+        ] * 2
+        assert all(item["error"] is None for item in response.json())
+        assert mock_explain.await_count == 2
+
+    def test_a_failing_leg_does_not_fail_the_others(
+        self, mocker, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        explained: list[str] = []
+
+        async def explain(context, risk, preference):
+            if context.destination_icao == "KSFO":
+                raise RuntimeError("GOOGLE_API_KEY is not set.")
+            await asyncio.sleep(0.01)
+            explained.append(context.destination_icao)
+            return AgentExplanation(explanation="Benign.", recommendations=[])
+
+        mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.generate_agent_explanation",
+            explain,
+        )
+        failing = flight_context.model_copy(update={"destination_icao": "KSFO"})
+
+        response = test_client.post(
+            "/api/should-you-fly/evaluate/batch",
+            params={"explain": True},
+            json=[
+                leg.model_dump(mode="json")
+                for leg in (failing, flight_context, flight_context)
+            ],
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body[0]["explanation"] is None
+        assert body[0]["error"] == "GOOGLE_API_KEY is not set."
+        assert [item["explanation"]["explanation"] for item in body[1:]] == [
+            "Benign."
+        ] * 2
+        assert explained == ["KSQL", "KSQL"]
+
+    def test_rejects_oversized_batches(
+        self, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        response = test_client.post(
+            "/api/should-you-fly/evaluate/batch",
+            json=[flight_context.model_dump(mode="json")] * (MAX_BATCH_LEGS + 1),
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestRules:
+    def test_returns_active_ruleset(self, test_client: TestClient) -> None:
+        response = test_client.get("/api/should-you-fly/rules")
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body["version"]
+        assert {"label", "impact", "when"} <= body["rules"][0].keys()
+
+
+class TestEvaluateSweep:
+    def test_returns_surface_and_best_points(
+        self, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        response = test_client.post(
+            "/api/should-you-fly/evaluate/sweep",
+            json={
+                "base": flight_context.model_dump(mode="json"),
+                "axes": [
+                    {"values": {"max_crosswind_knots": [10, 18, 25]}},
+                    {"values": {"pilot_total_hours": [40, 80, 200]}},
+                ],
+                "top_k": 2,
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body["shape"] == [3, 3]
+        assert len(body["scores"]) == len(body["tiers"]) == 9
+        assert [point["risk"]["score"] for point in body["best"]] == [0, 15]
+        assert body["best"][0]["values"] == {
+            "max_crosswind_knots": 10.0,
+            "pilot_total_hours": 200,
+        }
+
+    def test_rejects_unknown_field(
+        self, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        response = test_client.post(
+            "/api/should-you-fly/evaluate/sweep",
+            json={
+                "base": flight_context.model_dump(mode="json"),
+                "axes": [{"values": {"aircraft_type": ["C172"]}}],
+            },
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_rejects_huge_ranges_quickly(
+        self, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        started = time.perf_counter()
+        response = test_client.post(
+            "/api/should-you-fly/evaluate/sweep",
+            json={
+                "base": flight_context.model_dump(mode="json"),
+                "axes": [
+                    {"values": {"gusts_knots": {"start": 0, "stop": 1e9, "step": 1}}}
+                ],
+            },
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert time.perf_counter() - started < 1
+
+
+class TestHistory:
+    def test_pages_back_with_cursor(self, mocker, test_client: TestClient) -> None:
+        page = HistoryPage(
+            points=[HistoryPoint(timestamp=_HISTORY_START, score=10, tier="GO")],
+            next_cursor="older",
+        )
+        fetch = mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.fetch_history",
+            mocker.AsyncMock(return_value=page),
+        )
+
+        response = test_client.get(
+            "/api/should-you-fly/history", params={"limit": 10, "cursor": "newer"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == page.model_dump(mode="json")
+        fetch.assert_awaited_once_with(start=None, end=None, cursor="newer", limit=10)
+
+    def test_filters_by_time_range(self, mocker, test_client: TestClient) -> None:
+        fetch = mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.fetch_history",
+            mocker.AsyncMock(return_value=HistoryPage(points=[])),
+        )
+        start = _HISTORY_START + timedelta(minutes=5)
+        end = _HISTORY_START + timedelta(minutes=8)
+
+        response = test_client.get(
+            "/api/should-you-fly/history",
+            params={"start": start.isoformat(), "end": end.isoformat()},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        fetch.assert_awaited_once_with(start=start, end=end, cursor=None, limit=12)
+
+    def test_downsamples_into_buckets(self, mocker, test_client: TestClient) -> None:
+        page = HistoryPage(
+            points=[
+                HistoryPoint(
+                    timestamp=_HISTORY_START,
+                    score=4.5,
+                    min_score=0,
+                    max_score=9,
+                    count=10,
+                )
+            ]
+        )
+        fetch = mocker.patch(
+            "backend.apps.should_you_fly.rest.routes.fetch_history_buckets",
+            mocker.AsyncMock(return_value=page),
+        )
+
+        response = test_client.get(
+            "/api/should-you-fly/history", params={"bucket_seconds": 600}
+        )
+
+        assert response.json() == page.model_dump(mode="json")
+        fetch.assert_awaited_once_with(600, start=None, end=None, cursor=None, limit=12)
+
+    def test_serves_latest_page_from_shared_ring(
+        self, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        RECENT_EVALUATIONS.clear()
+        risky = flight_context.model_copy(update={"pilot_total_hours": 10})
+        scores = [
+            compute_risk(context).score
+            for context in (flight_context, risky, flight_context)
+        ]
+
+        response = test_client.get("/api/should-you-fly/history", params={"limit": 3})
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert [point["score"] for point in body["points"]] == scores
+        assert body["next_cursor"].endswith("|0")
+
+    def test_rejects_invalid_cursor(self, test_client: TestClient) -> None:
+        response = test_client.get(
+            "/api/should-you-fly/history", params={"cursor": "garbage"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestHistoryStats:
+    def test_reflects_new_evaluations(
+        self, test_client: TestClient, flight_context: FlightContext
+    ) -> None:
+        before = test_client.get("/api/should-you-fly/history/stats").json()
+        risky = flight_context.model_copy(update={"pilot_total_hours": 10})
+
+        compute_risk(risky)
+        after = test_client.get("/api/should-you-fly/history/stats")
+
+        assert after.status_code == status.HTTP_200_OK
+        body = after.json()
+        assert body["count"] == before["count"] + 1
+        assert "Pilot total hours < 50" in [
+            factor["label"] for factor in body["top_factors"]
+        ]
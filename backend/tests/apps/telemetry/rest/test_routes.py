@@ -0,0 +1,153 @@
+import io
+from pathlib import Path
+
+import polars as pl
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from backend.schemas import FlightContext
+
+
+class TestTelemetrySeries:
+    def test_returns_decimated_channels(
+        self, test_client: TestClient, telemetry_csv: Path
+    ) -> None:
+        response = test_client.get(
+            "/api/telemetry/series",
+            params={"channels": ["AOA", "MACH_IC"], "width": 50},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body["sortie"] == telemetry_csv.stem
+        assert body["time_basis"] == "row"
+        assert len(body["time"]) == 50
+        assert set(body["channels"]) == {"AOA", "MACH_IC"}
+        assert len(body["channels"]["AOA"]["max"]) == 50
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"channels": ["NOPE"]}, {"channels": ["AOA"], "start": 10, "end": 5}],
+    )
+    def test_rejects_invalid_request(
+        self, test_client: TestClient, telemetry_csv: Path, params: dict
+    ) -> None:
+        response = test_client.get("/api/telemetry/series", params=params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_unknown_sortie(self, test_client: TestClient, telemetry_csv: Path) -> None:
+        response = test_client.get(
+            "/api/telemetry/series", params={"channels": ["AOA"], "sortie": "nope"}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestSorties:
+    def test_lists_sortie_files(
+        self, test_client: TestClient, telemetry_csv: Path, monkeypatch
+    ) -> None:
+        monkeypatch.setenv("TELEMETRY_DIR", str(telemetry_csv.parent))
+
+        response = test_client.get("/api/telemetry/sorties")
+
+        assert response.status_code == status.HTTP_200_OK
+        [sortie] = response.json()
+        assert sortie["sortie"] == telemetry_csv.stem
+        assert sortie["rows"] == 600
+
+
+class TestMemoryReport:
+    def test_reports_bytes_per_column(
+        self, test_client: TestClient, telemetry_csv: Path, monkeypatch
+    ) -> None:
+        monkeypatch.setenv("TELEMETRY_LOAD_MODE", "compact")
+
+        response = test_client.get("/api/telemetry/memory")
+
+        assert response.status_code == status.HTTP_200_OK
+        report = response.json()
+        assert (report["load_mode"], report["rows"]) == ("compact", 600)
+        columns = {column["name"]: column for column in report["columns"]}
+        assert columns["AOA"] == {"name": "AOA", "dtype": "Float32", "bytes": 2400}
+        assert report["total_bytes"] == sum(c["bytes"] for c in columns.values())
+
+
+class TestTelemetryExport:
+    def test_streams_arrow_record_batches(
+        self, test_client: TestClient, telemetry_csv: Path
+    ) -> None:
+        response = test_client.get(
+            "/api/telemetry/export",
+            params={"columns": ["AOA", "MACH_IC"], "start_row": 10, "end_row": 20},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == (
+            "application/vnd.apache.arrow.stream"
+        )
+        frame = pl.read_ipc_stream(io.BytesIO(response.content))
+        assert frame.columns == ["AOA", "MACH_IC"]
+        assert frame.height == 10
+
+    def test_streams_ndjson(self, test_client: TestClient, telemetry_csv: Path) -> None:
+        response = test_client.get(
+            "/api/telemetry/export", params={"columns": ["AOA"], "format": "ndjson"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert len(response.text.splitlines()) == 600
+
+    def test_rejects_unknown_column(
+        self, test_client: TestClient, telemetry_csv: Path
+    ) -> None:
+        response = test_client.get(
+            "/api/telemetry/export", params={"columns": ["NOPE"]}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestExcursionEpisodes:
+    def test_lists_episodes(self, test_client: TestClient, telemetry_csv: Path) -> None:
+        response = test_client.get(
+            "/api/telemetry/episodes", params={"channel": "aoa", "limit": 2}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body["threshold"] == 12.0
+        assert body["num_episodes"] >= len(body["episodes"]) == 2
+
+    def test_rejects_threshold_under_the_floor(
+        self, test_client: TestClient, telemetry_csv: Path
+    ) -> None:
+        response = test_client.get(
+            "/api/telemetry/episodes", params={"channel": "aoa", "threshold": 1}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+class TestSimilarTelemetry:
+    def test_returns_nearest_segments(
+        self,
+        test_client: TestClient,
+        telemetry_csv: Path,
+        flight_context: FlightContext,
+    ) -> None:
+        response = test_client.post(
+            "/api/telemetry/similar",
+            params={"k": 3},
+            json=flight_context.model_dump(mode="json"),
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        distances = [segment["distance"] for segment in body["segments"]]
+        assert len(distances) == 3
+        assert distances == sorted(distances)
+        assert body["query"]["airspeed_kt"] is None
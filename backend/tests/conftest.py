@@ -1,10 +1,30 @@
+import os
+from collections import OrderedDict
 from collections.abc import AsyncIterator
+from pathlib import Path
 from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
 
 from backend import app
+from backend.schemas import FlightContext
+from backend.services import telemetry_tools
+from backend.testing import base_context, make_sortie_frame
+
+
+@pytest.fixture(scope="session", autouse=True)
+def evaluation_ring_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Keep the shared evaluation ring out of the host-wide default location."""
+    path = tmp_path_factory.mktemp("ring") / "evaluations.ring"
+    os.environ["EVALUATION_RING_PATH"] = str(path)
+    return path
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_evaluation_job_workers() -> None:
+    """Keep the app from polling for evaluation jobs in tables tests create."""
+    os.environ["EVALUATION_JOB_WORKERS"] = "0"
 
 
 @pytest.fixture(scope="function")
@@ -36,3 +56,22 @@ class GraphQLClient:
 def graphql_client(test_client: TestClient) -> GraphQLClient:
     """Provides a GraphQL client for testing"""
     return GraphQLClient(test_client)
+
+
+@pytest.fixture
+def flight_context() -> FlightContext:
+    """A benign daytime VFR flight that fires no risk rules."""
+    return base_context()
+
+
+@pytest.fixture
+def telemetry_csv(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """A synthetic sortie CSV wired in as the telemetry tools' data file."""
+    path = tmp_path / "AirForce_Sortie_Aeromod.csv"
+    make_sortie_frame().write_csv(path)
+    monkeypatch.setattr(telemetry_tools, "DATA_PATH", path)
+    monkeypatch.setattr(telemetry_tools, "_LOADED", OrderedDict())
+    monkeypatch.setattr(telemetry_tools, "_SUMMARIES", OrderedDict())
+    monkeypatch.setattr(telemetry_tools, "_FILE_TOTALS", OrderedDict())
+    monkeypatch.delenv("TELEMETRY_CACHE_DIR", raising=False)
+    return path
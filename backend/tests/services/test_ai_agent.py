@@ -0,0 +1,269 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, FunctionModel
+
+from backend.schemas import AgentExplanation, ExplanationProgress, FlightContext
+from backend.services import ai_agent
+from backend.services.ai_agent import generate_agent_explanation
+from backend.services.explanation_cache import ExplanationCache
+from backend.services.risk_engine import compute_risk
+
+
+def _provider(source: str, delay_s: float = 0.0, error: str | None = None):
+    calls: list[str] = []
+
+    async def explain(context, risk, progress=None) -> AgentExplanation:
+        calls.append("started")
+        try:
+            await asyncio.sleep(delay_s)
+        except asyncio.CancelledError:
+            calls.append("cancelled")
+            raise
+        if error is not None:
+            raise RuntimeError(error)
+        return AgentExplanation(
+            explanation=f"From {source}.", recommendations=[], source=source
+        )
+
+    explain.calls = calls  # type: ignore[attr-defined]
+    return explain
+
+
+@pytest.fixture
+def providers(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("YOU_COM_API_KEY", "test")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    monkeypatch.setenv("AGENT_HEDGE_DELAY_S", "0.05")
+    monkeypatch.setattr(ai_agent, "EXPLANATION_CACHE", ExplanationCache())
+
+    def install(you_com, gemini) -> None:
+        monkeypatch.setattr(ai_agent, "generate_you_com_explanation", you_com)
+        monkeypatch.setattr(ai_agent, "_run_gemini_agent", gemini)
+
+    return install
+
+
+async def _explain(context: FlightContext, preference="auto") -> AgentExplanation:
+    return await generate_agent_explanation(context, compute_risk(context), preference)
+
+
+class TestHedgedProviders:
+    async def test_fast_preferred_provider_runs_alone(
+        self, providers, flight_context: FlightContext
+    ) -> None:
+        you_com, gemini = _provider("You.com"), _provider("Gemini")
+        providers(you_com, gemini)
+
+        explanation = await _explain(flight_context)
+
+        assert explanation.source == "You.com"
+        assert gemini.calls == []
+        [attempt] = explanation.attempts
+        assert (attempt.provider, attempt.outcome) == ("You.com", "won")
+
+    async def test_slow_preferred_provider_is_hedged(
+        self, providers, flight_context: FlightContext
+    ) -> None:
+        you_com, gemini = _provider("You.com", delay_s=10), _provider("Gemini")
+        providers(you_com, gemini)
+
+        started = time.perf_counter()
+        explanation = await _explain(flight_context)
+
+        assert time.perf_counter() - started < 1
+        assert explanation.source == "Gemini"
+        assert you_com.calls == ["started", "cancelled"]
+        assert [(a.provider, a.outcome) for a in explanation.attempts] == [
+            ("You.com", "cancelled"),
+            ("Gemini", "won"),
+        ]
+        assert explanation.attempts[0].duration_ms >= 50
+
+    async def test_failure_starts_fallback_without_waiting(
+        self, providers, flight_context: FlightContext, monkeypatch
+    ) -> None:
+        monkeypatch.setenv("AGENT_HEDGE_DELAY_S", "10")
+        providers(_provider("You.com", error="HTTP 503"), _provider("Gemini"))
+
+        started = time.perf_counter()
+        explanation = await _explain(flight_context)
+
+        assert time.perf_counter() - started < 1
+        assert explanation.source == "Gemini"
+        failed, won = explanation.attempts
+        assert (failed.outcome, failed.error) == ("failed", "HTTP 503")
+        assert won.outcome == "won"
+
+    async def test_zero_delay_starts_both_at_once(
+        self, providers, flight_context: FlightContext, monkeypatch
+    ) -> None:
+        monkeypatch.setenv("AGENT_HEDGE_DELAY_S", "0")
+        you_com, gemini = _provider("You.com", delay_s=0.2), _provider("Gemini")
+        providers(you_com, gemini)
+
+        explanation = await _explain(flight_context)
+
+        assert explanation.source == "Gemini"
+        assert you_com.calls == ["started", "cancelled"]
+
+    async def test_all_providers_failing(
+        self, providers, flight_context: FlightContext
+    ) -> None:
+        providers(
+            _provider("You.com", error="timed out"), _provider("Gemini", error="quota")
+        )
+
+        with pytest.raises(RuntimeError) as raised:
+            await _explain(flight_context)
+
+        assert str(raised.value) == (
+            "You.com agent failed: timed out / Gemini agent failed: quota"
+        )
+
+    async def test_forced_provider_is_not_hedged(
+        self, providers, flight_context: FlightContext
+    ) -> None:
+        you_com, gemini = _provider("You.com", delay_s=0.2), _provider("Gemini")
+        providers(you_com, gemini)
+
+        explanation = await _explain(flight_context, "you_com")
+
+        assert explanation.source == "You.com"
+        assert gemini.calls == []
+
+    async def test_only_configured_providers_run(
+        self, providers, flight_context: FlightContext, monkeypatch
+    ) -> None:
+        monkeypatch.delenv("YOU_COM_API_KEY")
+        you_com, gemini = _provider("You.com"), _provider("Gemini")
+        providers(you_com, gemini)
+
+        explanation = await _explain(flight_context)
+
+        assert explanation.source == "Gemini"
+        assert you_com.calls == []
+
+
+class TestExplanationCaching:
+    async def test_concurrent_identical_evaluations_share_one_provider_call(
+        self, providers, flight_context: FlightContext
+    ) -> None:
+        you_com, gemini = _provider("You.com", delay_s=0.02), _provider("Gemini")
+        providers(you_com, gemini)
+
+        explanations = await asyncio.gather(
+            *(_explain(flight_context) for _ in range(4))
+        )
+        again = await _explain(flight_context)
+
+        assert you_com.calls == ["started"]
+        assert sorted(e.cache for e in explanations) == ["miss"] + ["shared"] * 3
+        assert again.cache == "hit"
+        assert again.source == "You.com"
+
+    async def test_flights_in_different_weather_do_not_share_an_explanation(
+        self, providers, flight_context: FlightContext
+    ) -> None:
+        you_com, gemini = _provider("You.com", error="down"), _provider("Gemini")
+        providers(you_com, gemini)
+        windier = flight_context.model_copy(
+            update={"max_crosswind_knots": 9, "gusts_knots": 4}
+        )
+
+        await _explain(flight_context)
+        explanation = await _explain(windier)
+
+        assert explanation.cache == "miss"
+        assert gemini.calls == ["started", "started"]
+
+    async def test_forced_providers_are_cached_apart(
+        self, providers, flight_context: FlightContext
+    ) -> None:
+        you_com, gemini = _provider("You.com"), _provider("Gemini")
+        providers(you_com, gemini)
+
+        await _explain(flight_context, "you_com")
+        explanation = await _explain(flight_context, "gemini")
+
+        assert (explanation.source, explanation.cache) == ("Gemini", "miss")
+
+
+class TestProgress:
+    async def test_router_reports_providers_starting_and_failing(
+        self, providers, flight_context: FlightContext
+    ) -> None:
+        you_com = _provider("You.com", error="timed out")
+        providers(you_com, _provider("Gemini"))
+        updates: list[ExplanationProgress] = []
+
+        await generate_agent_explanation(
+            flight_context, compute_risk(flight_context), progress=updates.append
+        )
+
+        assert [(u.kind, u.provider, u.text) for u in updates] == [
+            ("provider_started", "You.com", None),
+            ("provider_failed", "You.com", "timed out"),
+            ("provider_started", "Gemini", None),
+        ]
+
+    async def test_reused_explanations_report_where_they_came_from(
+        self, providers, flight_context: FlightContext
+    ) -> None:
+        providers(_provider("You.com", delay_s=0.02), _provider("Gemini"))
+        risk = compute_risk(flight_context)
+        first: list[ExplanationProgress] = []
+        joined: list[ExplanationProgress] = []
+        later: list[ExplanationProgress] = []
+
+        await asyncio.gather(
+            generate_agent_explanation(flight_context, risk, progress=first.append),
+            generate_agent_explanation(flight_context, risk, progress=joined.append),
+        )
+        await generate_agent_explanation(flight_context, risk, progress=later.append)
+
+        assert [u.kind for u in first] == ["provider_started"]
+        assert [(u.kind, u.provider) for u in joined] == [("shared", None)]
+        assert [(u.kind, u.provider) for u in later] == [("cached", None)]
+
+    async def test_gemini_agent_streams_text_and_tool_calls(
+        self,
+        flight_context: FlightContext,
+        telemetry_csv: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setenv("GOOGLE_API_KEY", "test")
+        monkeypatch.delenv("YOU_COM_API_KEY", raising=False)
+        monkeypatch.setattr(ai_agent, "EXPLANATION_CACHE", ExplanationCache())
+
+        answer = json.dumps(
+            {"explanation": "Benign flight.", "recommendations": ["Go."]}
+        )
+
+        async def stream(messages, info: AgentInfo):
+            if len(messages) == 1:
+                yield {0: DeltaToolCall(name="tool_analyze_wow", json_args="{}")}
+                return
+            yield answer[:20]
+            yield answer[20:]
+
+        updates: list[ExplanationProgress] = []
+        with ai_agent.agent.override(model=FunctionModel(stream_function=stream)):
+            explanation = await generate_agent_explanation(
+                flight_context,
+                compute_risk(flight_context),
+                "gemini",
+                progress=updates.append,
+            )
+
+        assert explanation.explanation == "Benign flight."
+        assert [(u.kind, u.text or u.tool) for u in updates] == [
+            ("provider_started", None),
+            ("tool_call", "tool_analyze_wow"),
+            ("tool_result", "tool_analyze_wow"),
+            ("text", answer[:20]),
+            ("text", answer[20:]),
+        ]
@@ -0,0 +1,334 @@
+import asyncio
+from uuid import UUID
+
+import pytest
+from piccolo.table import create_db_tables, drop_db_tables
+
+from backend.apps.should_you_fly.tables import EvaluationJobRecord
+from backend.schemas import AgentExplanation, FlightContext
+from backend.services import ai_agent, evaluation_jobs
+from backend.services.evaluation_jobs import (
+    EvaluationJobWorkers,
+    JobQueueFullError,
+    cancel_job,
+    fetch_job,
+    submit_evaluation_job,
+    watch_job,
+)
+from backend.services.explanation_cache import ExplanationCache
+from backend.services.risk_engine import compute_risk
+
+
+class Explainer:
+    """A fake ``generate_agent_explanation`` recording the aircraft it explained."""
+
+    def __init__(self, delay_s: float = 0.0, error: Exception | None = None) -> None:
+        self.delay_s = delay_s
+        self.error = error
+        self.aircraft: list[str] = []
+
+    async def __call__(self, context, risk, agent_source="auto", progress=None):
+        self.aircraft.append(context.aircraft_type)
+        await asyncio.sleep(self.delay_s)
+        if self.error is not None:
+            raise self.error
+        return AgentExplanation(
+            explanation=f"Scored {risk.score}.", recommendations=[], source="Gemini"
+        )
+
+
+@pytest.fixture
+async def job_table():
+    await create_db_tables(EvaluationJobRecord, if_not_exists=True)
+    yield
+    await drop_db_tables(EvaluationJobRecord)
+
+
+@pytest.fixture
+async def workers(job_table, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("EVALUATION_JOB_WORKERS", "1")
+    monkeypatch.setenv("EVALUATION_JOB_POLL_S", "0.02")
+    monkeypatch.setenv("EVALUATION_JOB_LEASE_S", "0.3")
+    workers = EvaluationJobWorkers()
+    monkeypatch.setattr(evaluation_jobs, "EVALUATION_JOBS", workers)
+    yield workers
+    await workers.stop()
+
+
+@pytest.fixture
+def explainer(monkeypatch: pytest.MonkeyPatch) -> Explainer:
+    explainer = Explainer()
+    monkeypatch.setattr(evaluation_jobs, "generate_agent_explanation", explainer)
+    return explainer
+
+
+async def _submit(context: FlightContext, priority: int = 0, **update) -> UUID:
+    context = context.model_copy(update=update)
+    job = await submit_evaluation_job(context, compute_risk(context), "auto", priority)
+    return job.id
+
+
+async def _wait_for_status(job_id: UUID, *statuses: str) -> None:
+    for _ in range(200):
+        job = await fetch_job(job_id)
+        assert job is not None
+        if job.status in statuses:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} is still {job.status}")
+
+
+class TestEvaluationJobs:
+    async def test_submitted_jobs_are_queued_with_their_risk(
+        self, workers: EvaluationJobWorkers, flight_context: FlightContext
+    ) -> None:
+        job = await submit_evaluation_job(
+            flight_context, compute_risk(flight_context), "gemini", 3
+        )
+
+        assert (job.status, job.priority, job.agent_source) == ("queued", 3, "gemini")
+        assert job.risk == compute_risk(flight_context)
+        assert job.explanation is None
+        assert await fetch_job(job.id) == job
+
+    async def test_workers_explain_queued_jobs(
+        self,
+        workers: EvaluationJobWorkers,
+        explainer: Explainer,
+        flight_context: FlightContext,
+    ) -> None:
+        workers.start()
+        job_id = await _submit(flight_context)
+
+        await _wait_for_status(job_id, "done")
+
+        job = await fetch_job(job_id)
+        assert job.explanation.explanation == f"Scored {job.risk.score}."
+        assert job.attempts == 1
+        assert workers.completed == 1
+
+    async def test_higher_priorities_are_explained_first(
+        self,
+        workers: EvaluationJobWorkers,
+        explainer: Explainer,
+        flight_context: FlightContext,
+    ) -> None:
+        low = await _submit(flight_context, priority=-1, aircraft_type="low")
+        await _submit(flight_context, aircraft_type="first")
+        await _submit(flight_context, priority=5, aircraft_type="urgent")
+        await _submit(flight_context, aircraft_type="second")
+
+        workers.start()
+        await _wait_for_status(low, "done")
+
+        assert explainer.aircraft == ["urgent", "first", "second", "low"]
+
+    async def test_failures_are_recorded_on_the_job(
+        self,
+        workers: EvaluationJobWorkers,
+        explainer: Explainer,
+        flight_context: FlightContext,
+    ) -> None:
+        explainer.error = RuntimeError("No AI providers configured")
+        workers.start()
+        job_id = await _submit(flight_context)
+
+        await _wait_for_status(job_id, "failed")
+
+        job = await fetch_job(job_id)
+        assert job.error == "No AI providers configured"
+        assert workers.failed == 1
+
+    async def test_queued_jobs_can_be_cancelled(
+        self, workers: EvaluationJobWorkers, flight_context: FlightContext
+    ) -> None:
+        job_id = await _submit(flight_context)
+
+        assert (await cancel_job(job_id)).status == "cancelled"
+        assert await workers._claim() is None
+
+    async def test_cancelling_a_running_job_stops_its_explanation(
+        self,
+        workers: EvaluationJobWorkers,
+        explainer: Explainer,
+        flight_context: FlightContext,
+    ) -> None:
+        explainer.delay_s = 10
+        workers.start()
+        job_id = await _submit(flight_context)
+        await _wait_for_status(job_id, "running")
+
+        await cancel_job(job_id)
+        await asyncio.sleep(0.05)
+
+        assert (await fetch_job(job_id)).status == "cancelled"
+        assert not workers._explaining
+
+    async def test_cancelling_a_running_job_cancels_its_provider_call(
+        self,
+        workers: EvaluationJobWorkers,
+        flight_context: FlightContext,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        # The real explanation path, through the shared explanation cache.
+        monkeypatch.setenv("YOU_COM_API_KEY", "test")
+        monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+        monkeypatch.setattr(ai_agent, "EXPLANATION_CACHE", ExplanationCache())
+        calls: list[str] = []
+
+        async def you_com(context, risk):
+            calls.append("started")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                calls.append("cancelled")
+                raise
+
+        monkeypatch.setattr(ai_agent, "generate_you_com_explanation", you_com)
+        workers.start()
+        job_id = await _submit(flight_context)
+        await _wait_for_status(job_id, "running")
+        await asyncio.sleep(0.05)
+
+        await cancel_job(job_id)
+        await asyncio.sleep(0.05)
+
+        assert calls == ["started", "cancelled"]
+        assert not ai_agent.EXPLANATION_CACHE._runs
+
+    async def test_jobs_cancelled_by_another_process_stop_at_lease_renewal(
+        self,
+        workers: EvaluationJobWorkers,
+        explainer: Explainer,
+        flight_context: FlightContext,
+    ) -> None:
+        explainer.delay_s = 10
+        workers.start()
+        job_id = await _submit(flight_context)
+        await _wait_for_status(job_id, "running")
+
+        await EvaluationJobRecord.update(
+            {EvaluationJobRecord.status: "cancelled"}
+        ).where(EvaluationJobRecord.id == job_id)
+        await asyncio.sleep(0.2)
+
+        assert not workers._explaining
+
+    async def test_finished_jobs_are_not_cancelled(
+        self,
+        workers: EvaluationJobWorkers,
+        explainer: Explainer,
+        flight_context: FlightContext,
+    ) -> None:
+        workers.start()
+        job_id = await _submit(flight_context)
+        await _wait_for_status(job_id, "done")
+
+        assert (await cancel_job(job_id)).status == "done"
+
+    async def test_unknown_jobs_are_none(self, workers: EvaluationJobWorkers) -> None:
+        unknown = UUID(int=0)
+
+        assert await fetch_job(unknown) is None
+        assert await cancel_job(unknown) is None
+
+    async def test_the_queue_is_bounded(
+        self,
+        workers: EvaluationJobWorkers,
+        flight_context: FlightContext,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setenv("EVALUATION_JOB_MAX_QUEUED", "2")
+        await _submit(flight_context)
+        await _submit(flight_context)
+
+        with pytest.raises(JobQueueFullError):
+            await _submit(flight_context)
+
+    async def test_stopping_requeues_running_jobs(
+        self,
+        workers: EvaluationJobWorkers,
+        explainer: Explainer,
+        flight_context: FlightContext,
+    ) -> None:
+        explainer.delay_s = 10
+        workers.start()
+        job_id = await _submit(flight_context)
+        await _wait_for_status(job_id, "running")
+
+        await workers.stop()
+
+        job = await fetch_job(job_id)
+        assert (job.status, job.attempts) == ("queued", 0)
+
+    async def test_jobs_of_a_dead_worker_are_claimed_again(
+        self,
+        workers: EvaluationJobWorkers,
+        explainer: Explainer,
+        flight_context: FlightContext,
+    ) -> None:
+        job_id = await _submit(flight_context)
+        # A worker claims the job, then its process dies: the lease is never
+        # renewed.
+        dead = EvaluationJobWorkers()
+        dead.worker_id = "dead:1"
+        assert (await dead._claim())[0].id == job_id
+
+        workers.start()
+        await _wait_for_status(job_id, "done")
+
+        assert (await fetch_job(job_id)).attempts == 2
+
+    async def test_jobs_interrupted_too_often_fail(
+        self,
+        workers: EvaluationJobWorkers,
+        explainer: Explainer,
+        flight_context: FlightContext,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setenv("EVALUATION_JOB_MAX_ATTEMPTS", "1")
+        job_id = await _submit(flight_context)
+        dead = EvaluationJobWorkers()
+        dead.worker_id = "dead:1"
+        await dead._claim()
+
+        workers.start()
+        await _wait_for_status(job_id, "failed")
+
+        assert explainer.aircraft == []
+        assert "interrupted" in (await fetch_job(job_id)).error
+
+    async def test_running_jobs_keep_their_lease(
+        self,
+        workers: EvaluationJobWorkers,
+        explainer: Explainer,
+        flight_context: FlightContext,
+    ) -> None:
+        explainer.delay_s = 0.6
+        workers.start()
+        job_id = await _submit(flight_context)
+        await _wait_for_status(job_id, "running")
+
+        # Two lease lengths later the job is still this worker's.
+        other = EvaluationJobWorkers()
+        other.worker_id = "other:1"
+        await asyncio.sleep(0.4)
+        assert await other._claim() is None
+        await _wait_for_status(job_id, "done")
+
+        assert (await fetch_job(job_id)).attempts == 1
+
+    async def test_watching_a_job_follows_it_until_it_is_done(
+        self,
+        workers: EvaluationJobWorkers,
+        explainer: Explainer,
+        flight_context: FlightContext,
+    ) -> None:
+        explainer.delay_s = 0.05
+        job_id = await _submit(flight_context)
+        workers.start()
+
+        statuses = [job.status async for job in watch_job(job_id)]
+
+        assert statuses[-1] == "done"
+        assert statuses == sorted(set(statuses), key=statuses.index)
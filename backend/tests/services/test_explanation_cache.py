@@ -0,0 +1,219 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from backend.schemas import AgentExplanation, FlightContext
+from backend.services.explanation_cache import (
+    ExplanationCache,
+    explanation_fingerprint,
+)
+from backend.services.risk_engine import compute_risk
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Run:
+    """A fake provider run explaining with ``"Run <n>."`` on its n-th call."""
+
+    def __init__(self, delay_s: float = 0.0, error: str | None = None) -> None:
+        self.delay_s = delay_s
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self) -> AgentExplanation:
+        self.calls += 1
+        calls = self.calls
+        await asyncio.sleep(self.delay_s)
+        if self.error is not None:
+            raise RuntimeError(self.error)
+        return AgentExplanation(
+            explanation=f"Run {calls}.", recommendations=[], source="Gemini"
+        )
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    monkeypatch.setenv("AGENT_EXPLANATION_CACHE_TTL_S", "60")
+    return Clock()
+
+
+@pytest.fixture
+def cache(clock: Clock) -> ExplanationCache:
+    return ExplanationCache(clock)
+
+
+class TestFingerprint:
+    def test_near_identical_evaluations_share_it(
+        self, flight_context: FlightContext
+    ) -> None:
+        other = flight_context.model_copy(
+            update={
+                "departure_time_utc": flight_context.departure_time_utc
+                + timedelta(minutes=30),
+                "pilot_total_hours": 900,
+                "aircraft_type": "c-172",
+            }
+        )
+
+        assert explanation_fingerprint(
+            other, compute_risk(other), ["You.com"]
+        ) == explanation_fingerprint(
+            flight_context, compute_risk(flight_context), ["You.com"]
+        )
+
+    @pytest.mark.parametrize(
+        "update",
+        [
+            {"destination_icao": "KSFO"},
+            {"conditions_night": True},
+            {"departure_visibility_sm": 1},
+        ],
+    )
+    def test_route_conditions_and_fired_factors_change_it(
+        self, flight_context: FlightContext, update: dict
+    ) -> None:
+        other = flight_context.model_copy(update=update)
+
+        assert explanation_fingerprint(
+            other, compute_risk(other), ["You.com"]
+        ) != explanation_fingerprint(
+            flight_context, compute_risk(flight_context), ["You.com"]
+        )
+
+    @pytest.mark.parametrize(
+        "update",
+        [
+            {"max_crosswind_knots": 14},
+            {"gusts_knots": 3},
+            {"departure_ceiling_ft": 9000},
+            {"freezing_level_ft": 4000},
+            {"pilot_total_hours": 900},
+        ],
+    )
+    def test_inputs_gemini_reads_change_it_when_gemini_may_answer(
+        self, flight_context: FlightContext, update: dict
+    ) -> None:
+        other = flight_context.model_copy(update=update)
+
+        assert compute_risk(other).factors == compute_risk(flight_context).factors
+        assert explanation_fingerprint(
+            other, compute_risk(other), ["You.com", "Gemini"]
+        ) != explanation_fingerprint(
+            flight_context, compute_risk(flight_context), ["You.com", "Gemini"]
+        )
+
+    def test_providers_change_it(self, flight_context: FlightContext) -> None:
+        risk = compute_risk(flight_context)
+
+        assert explanation_fingerprint(
+            flight_context, risk, ["Gemini"]
+        ) != explanation_fingerprint(flight_context, risk, ["You.com", "Gemini"])
+
+
+class TestExplanationCache:
+    async def test_repeated_requests_are_cache_hits(
+        self, cache: ExplanationCache
+    ) -> None:
+        run = Run()
+
+        first = await cache.get("a", run)
+        second = await cache.get("a", run)
+
+        assert run.calls == 1
+        assert (first.cache, second.cache) == ("miss", "hit")
+        assert second.explanation == first.explanation
+
+    async def test_concurrent_identical_requests_share_one_run(
+        self, cache: ExplanationCache
+    ) -> None:
+        run = Run(delay_s=0.05)
+
+        explanations = await asyncio.gather(*(cache.get("a", run) for _ in range(5)))
+
+        assert run.calls == 1
+        assert sorted(e.cache for e in explanations) == ["miss"] + ["shared"] * 4
+        assert (cache.misses, cache.shared) == (1, 4)
+
+    async def test_a_caller_going_away_does_not_cancel_the_shared_run(
+        self, cache: ExplanationCache
+    ) -> None:
+        run = Run(delay_s=0.05)
+        first = asyncio.create_task(cache.get("a", run))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get("a", run))
+        await asyncio.sleep(0)
+
+        first.cancel()
+
+        assert (await second).cache == "shared"
+        assert run.calls == 1
+
+    async def test_the_run_is_cancelled_once_every_caller_has_gone(
+        self, cache: ExplanationCache
+    ) -> None:
+        run = Run(delay_s=10)
+        callers = [asyncio.create_task(cache.get("a", run)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        [task] = cache._runs.values()
+
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        assert not task.cancelled()
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+        assert not cache._runs
+        assert (await cache.get("a", Run())).cache == "miss"
+
+    async def test_failures_reach_every_waiter_and_are_not_cached(
+        self, cache: ExplanationCache
+    ) -> None:
+        failing = Run(delay_s=0.05, error="provider down")
+
+        results = await asyncio.gather(
+            *(cache.get("a", failing) for _ in range(3)), return_exceptions=True
+        )
+
+        assert failing.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert (await cache.get("a", Run())).cache == "miss"
+
+    async def test_explanations_expire(
+        self, cache: ExplanationCache, clock: Clock
+    ) -> None:
+        run = Run()
+        await cache.get("a", run)
+        clock.now += 61
+
+        assert (await cache.get("a", run)).explanation == "Run 2."
+
+    async def test_least_recently_used_explanations_are_evicted(
+        self, clock: Clock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("AGENT_EXPLANATION_CACHE_SIZE", "2")
+        cache = ExplanationCache(clock)
+        run = Run()
+        for fingerprint in ("a", "b", "a", "c"):
+            await cache.get(fingerprint, run)
+
+        assert (await cache.get("a", run)).cache == "hit"
+        assert (await cache.get("b", run)).cache == "miss"
+
+    async def test_a_ttl_of_zero_disables_the_cache(self, clock: Clock) -> None:
+        cache = ExplanationCache(clock, ttl_s=0)
+        run = Run()
+
+        await cache.get("a", run)
+        explanation = await cache.get("a", run)
+
+        assert run.calls == 2
+        assert explanation.cache is None
@@ -0,0 +1,118 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+from backend.schemas import RiskFactor, RiskResult
+from backend.services.history_stats import (
+    FactorHeavyHitters,
+    HistoryStats,
+    HourlyTierMix,
+    ScoreHistogram,
+)
+
+
+def _risk(score: int, *labels: str) -> RiskResult:
+    tier = "GO" if score < 30 else "CAUTION" if score < 60 else "NO-GO"
+    return RiskResult(
+        score=score,
+        tier=tier,
+        factors=[RiskFactor(label=label, impact=10) for label in labels],
+        ruleset_version="test",
+    )
+
+
+class TestScoreHistogram:
+    def test_quantiles_are_exact(self) -> None:
+        rng = random.Random(7)
+        scores = [rng.randint(0, 100) for _ in range(1001)]
+        histogram = ScoreHistogram()
+        for score in scores:
+            histogram.add(score)
+
+        ordered = sorted(scores)
+        assert histogram.quantile(0.5) == ordered[500]
+        assert histogram.quantile(0.99) == ordered[990]
+        assert histogram.quantile(1.0) == ordered[-1]
+        assert histogram.mean == sum(scores) / len(scores)
+
+    def test_empty(self) -> None:
+        assert ScoreHistogram().quantile(0.5) is None
+
+
+class TestHourlyTierMix:
+    def test_keeps_most_recent_hours(self) -> None:
+        mix = HourlyTierMix(hours=2)
+        start = datetime(2025, 1, 1, tzinfo=UTC)
+        for hour in range(4):
+            mix.add(start + timedelta(hours=hour, minutes=5), "GO")
+
+        assert len(mix.buckets) == 2
+        assert min(mix.buckets) * 3600 == (start + timedelta(hours=2)).timestamp()
+
+
+class TestFactorHeavyHitters:
+    def test_tracks_frequent_labels_within_capacity(self) -> None:
+        hitters = FactorHeavyHitters(capacity=3)
+        stream = ["a"] * 50 + ["b"] * 30 + [f"rare-{n}" for n in range(20)] + ["a"]
+        random.Random(3).shuffle(stream)
+        for label in stream:
+            hitters.add(label)
+
+        top = hitters.top(2)
+        assert [label for label, _, _ in top] == ["a", "b"]
+        for label, count, error in top:
+            true_count = stream.count(label)
+            assert true_count <= count <= true_count + error
+
+    def test_merge_combines_counts(self) -> None:
+        left, right = FactorHeavyHitters(), FactorHeavyHitters()
+        left.add("a", 3)
+        right.add("a", 2)
+        right.add("b", 1)
+
+        left.merge(right)
+
+        assert left.top(2) == [("a", 5, 0), ("b", 1, 0)]
+
+    def test_merge_bounds_labels_evicted_from_either_side(self) -> None:
+        streams = [["a"] * 5 + ["b"] * 5 + ["c"], ["a"] * 5 + ["d"] * 2]
+        left, right = FactorHeavyHitters(capacity=2), FactorHeavyHitters(capacity=2)
+        for hitters, stream in zip((left, right), streams, strict=True):
+            for label in stream:
+                hitters.add(label)
+        assert "a" not in left.counts
+
+        left.merge(right)
+
+        assert [label for label, _, _ in left.top(2)] == ["a", "c"]
+        for label, count, error in left.top(2):
+            true_count = sum(stream.count(label) for stream in streams)
+            assert true_count <= count <= true_count + error
+
+
+class TestHistoryStats:
+    def test_merge_matches_single_stream(self) -> None:
+        now = datetime(2025, 1, 1, 12, tzinfo=UTC)
+        risks = [_risk(score, "Gusty") for score in range(0, 100, 7)]
+        combined, left, right = HistoryStats(), HistoryStats(), HistoryStats()
+        for index, risk in enumerate(risks):
+            combined.add(now, risk)
+            (left if index % 2 else right).add(now, risk)
+
+        left.merge(right)
+
+        assert left.summary() == combined.summary()
+
+    def test_summary(self) -> None:
+        now = datetime(2025, 1, 1, 12, 30, tzinfo=UTC)
+        stats = HistoryStats()
+        stats.add(now, _risk(10))
+        stats.add(now, _risk(45, "Gusty"))
+        stats.add(now, _risk(80, "Gusty", "Icing"))
+
+        summary = stats.summary()
+
+        assert summary.count == 3
+        assert summary.percentiles["p50"] == 45
+        assert summary.tier_mix_by_hour[0].hour == datetime(2025, 1, 1, 12, tzinfo=UTC)
+        assert summary.tier_mix_by_hour[0].counts == {"GO": 1, "CAUTION": 1, "NO-GO": 1}
+        assert [factor.label for factor in summary.top_factors] == ["Gusty", "Icing"]
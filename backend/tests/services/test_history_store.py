@@ -0,0 +1,216 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from piccolo.table import create_db_tables, drop_db_tables
+
+from backend.apps.should_you_fly.tables import EvaluationRecord
+from backend.schemas import FlightContext
+from backend.services import assess_risk, compute_risk
+from backend.services.history_store import (
+    EvaluationHistoryWriter,
+    InvalidCursorError,
+    _decode_cursor,
+    _encode_cursor,
+    context_hash,
+    fetch_history,
+    fetch_history_buckets,
+    recent_history,
+)
+from backend.services.shared_history import SharedRingBuffer
+
+
+@pytest.fixture
+def mock_insert(mocker):
+    return mocker.patch.object(EvaluationRecord, "insert", mocker.AsyncMock())
+
+
+def _inserted_rows(mock_insert) -> list[EvaluationRecord]:
+    return [row for call in mock_insert.await_args_list for row in call.args]
+
+
+class TestEvaluationHistoryWriter:
+    async def test_batches_inserts(
+        self, mock_insert, flight_context: FlightContext
+    ) -> None:
+        writer = EvaluationHistoryWriter(batch_size=3, flush_interval_s=0.05)
+        writer.start()
+        risk = compute_risk(flight_context)
+        now = datetime.now(UTC)
+
+        for _ in range(7):
+            writer.enqueue(now, flight_context, risk)
+        await asyncio.sleep(0.2)
+        await writer.stop()
+
+        assert [len(call.args) for call in mock_insert.await_args_list] == [3, 3, 1]
+        row = _inserted_rows(mock_insert)[0]
+        assert row.score == risk.score
+        assert row.tier == risk.tier
+        assert row.context_hash == context_hash(flight_context)
+        assert row.ruleset_version == risk.ruleset_version
+        assert writer.written == 7
+
+    async def test_stop_flushes_pending(
+        self, mock_insert, flight_context: FlightContext
+    ) -> None:
+        writer = EvaluationHistoryWriter(batch_size=100, flush_interval_s=60)
+        writer.start()
+        risk = compute_risk(flight_context)
+
+        for _ in range(5):
+            writer.enqueue(datetime.now(UTC), flight_context, risk)
+        await writer.stop()
+
+        assert len(_inserted_rows(mock_insert)) == 5
+
+    async def test_stop_writes_the_batch_being_collected(
+        self, mock_insert, flight_context: FlightContext
+    ) -> None:
+        writer = EvaluationHistoryWriter(batch_size=100, flush_interval_s=60)
+        writer.start()
+        risk = compute_risk(flight_context)
+        for _ in range(5):
+            writer.enqueue(datetime.now(UTC), flight_context, risk)
+        # The background task takes them off the queue and waits for more.
+        await asyncio.sleep(0.05)
+        assert writer._queue.empty()
+
+        await asyncio.wait_for(writer.stop(), 1)
+
+        assert len(_inserted_rows(mock_insert)) == 5
+        assert (writer.written, writer.dropped) == (5, 0)
+        assert not writer.running
+
+    async def test_persists_fast_path_assessments(
+        self, mock_insert, flight_context: FlightContext
+    ) -> None:
+        writer = EvaluationHistoryWriter(flush_interval_s=60)
+        writer.start()
+        risky = flight_context.model_copy(update={"pilot_total_hours": 10})
+        assessment = assess_risk(risky)
+
+        writer.enqueue(datetime.now(UTC), risky, assessment)
+        await writer.stop()
+
+        [row] = _inserted_rows(mock_insert)
+        assert row.factors == [
+            factor.model_dump() for factor in compute_risk(risky).factors
+        ]
+        assert row.ruleset_version == assessment.ruleset_version
+
+    async def test_drops_when_full(
+        self, mock_insert, flight_context: FlightContext
+    ) -> None:
+        writer = EvaluationHistoryWriter(max_pending=2, flush_interval_s=60)
+        writer.start()
+        risk = compute_risk(flight_context)
+
+        for _ in range(5):
+            writer.enqueue(datetime.now(UTC), flight_context, risk)
+
+        assert writer.dropped >= 2
+        await writer.stop()
+
+    def test_ignores_evaluations_when_stopped(
+        self, mock_insert, flight_context: FlightContext
+    ) -> None:
+        writer = EvaluationHistoryWriter()
+
+        writer.enqueue(datetime.now(UTC), flight_context, compute_risk(flight_context))
+
+        mock_insert.assert_not_called()
+
+
+class TestCursor:
+    def test_round_trip(self) -> None:
+        timestamp = datetime(2025, 1, 1, 12, 30, tzinfo=UTC)
+
+        assert _decode_cursor(_encode_cursor(timestamp, 42)) == (timestamp, 42)
+
+    def test_rejects_garbage(self) -> None:
+        with pytest.raises(InvalidCursorError):
+            _decode_cursor("not-a-cursor")
+
+
+@pytest.fixture
+async def evaluation_table():
+    await create_db_tables(EvaluationRecord, if_not_exists=True)
+    yield
+    await drop_db_tables(EvaluationRecord)
+
+
+class TestRecentHistoryCursor:
+    async def test_next_page_keeps_rows_sharing_the_boundary_timestamp(
+        self, mocker, evaluation_table, tmp_path: Path
+    ) -> None:
+        start = datetime(2025, 1, 1, 12, 0, tzinfo=UTC)
+        boundary = start + timedelta(minutes=1)
+        ring = SharedRingBuffer(tmp_path / "evaluations.ring", capacity=8)
+        mocker.patch("backend.services.history_store.RECENT_EVALUATIONS", ring)
+        # Scores 0-3 persisted in order; three share the boundary timestamp.
+        for score, created_at in enumerate((start, boundary, boundary, boundary)):
+            await EvaluationRecord.insert(
+                EvaluationRecord(
+                    created_at=created_at,
+                    score=score,
+                    tier="GO",
+                    factors=[],
+                    context_hash="0" * 32,
+                    ruleset_version="test",
+                )
+            )
+            ring.append(created_at, score, "GO")
+
+        page = await recent_history(limit=2)
+        older = await fetch_history(cursor=page.next_cursor)
+        ring.close()
+
+        assert [point.score for point in page.points] == [2, 3]
+        assert [point.score for point in older.points] == [0, 1]
+
+
+@pytest.fixture
+async def evaluation_records(evaluation_table):
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    await EvaluationRecord.insert(
+        *[
+            EvaluationRecord(
+                created_at=start + timedelta(minutes=minute),
+                score=minute,
+                tier="GO",
+                factors=[],
+                context_hash="0" * 32,
+                ruleset_version="test",
+            )
+            for minute in range(30)
+        ]
+    )
+    return start
+
+
+class TestFetchHistory:
+    async def test_pages_back_with_cursor(self, evaluation_records: datetime) -> None:
+        first = await fetch_history(limit=10)
+        second = await fetch_history(cursor=first.next_cursor, limit=10)
+
+        assert [point.score for point in first.points] == list(range(20, 30))
+        assert [point.score for point in second.points] == list(range(10, 20))
+
+    async def test_filters_by_time_range(self, evaluation_records: datetime) -> None:
+        page = await fetch_history(
+            start=evaluation_records + timedelta(minutes=5),
+            end=evaluation_records + timedelta(minutes=8),
+        )
+
+        assert [point.score for point in page.points] == [5, 6, 7]
+        assert page.next_cursor is None
+
+    async def test_downsamples_into_buckets(self, evaluation_records: datetime) -> None:
+        page = await fetch_history_buckets(600)
+
+        assert [point.count for point in page.points] == [10, 10, 10]
+        assert [point.score for point in page.points] == [4.5, 14.5, 24.5]
+        assert page.points[0].min_score == 0
+        assert page.points[0].max_score == 9
@@ -0,0 +1,188 @@
+import asyncio
+import json
+
+import pytest
+
+from backend.services import you_com_client
+from backend.services.http_client import SharedHttpClient
+from backend.services.risk_engine import compute_risk
+from backend.services.you_com_client import generate_you_com_explanation
+
+_PAYLOAD = json.dumps(
+    {
+        "results": {
+            "web": [
+                {
+                    "title": "Personal minimums",
+                    "url": "https://example.com/minimums",
+                    "description": "Set limits before the flight.",
+                }
+            ]
+        }
+    }
+).encode()
+
+
+class StandInServer:
+    """
+    A local HTTP/1.1 keep-alive server answering every request with a You.com
+    search payload after ``delay_s``, counting the connections it accepts.
+    """
+
+    def __init__(self, delay_s: float = 0.01) -> None:
+        self.delay_s = delay_s
+        self.connections = 0
+        self.open_connections = 0
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1/search"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        self.open_connections += 1
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                self.requests += 1
+                await asyncio.sleep(self.delay_s)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(_PAYLOAD)}\r\n\r\n".encode()
+                    + _PAYLOAD
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.open_connections -= 1
+            writer.close()
+
+
+@pytest.fixture
+async def server():
+    server = StandInServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+def http(monkeypatch: pytest.MonkeyPatch):
+    client = SharedHttpClient("TEST_UPSTREAM")
+    monkeypatch.setenv("TEST_UPSTREAM_MAX_CONNECTIONS", "4")
+    return client
+
+
+async def _wait_for(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+
+class TestSharedHttpClient:
+    async def test_concurrent_requests_share_the_pooled_connections(
+        self, server: StandInServer, http: SharedHttpClient
+    ) -> None:
+        http.start()
+        try:
+            for _ in range(5):
+                responses = await asyncio.gather(
+                    *(http.request("GET", server.url) for _ in range(10))
+                )
+                assert all(response.status_code == 200 for response in responses)
+        finally:
+            await http.stop()
+
+        assert server.requests == 50
+        # Only the first wave connects; at most one connection per pool slot.
+        assert server.connections <= 4
+        assert http.connections_opened == server.connections
+        assert http.reused == 50 - server.connections
+        uses = [response.extensions["connection_use"] for response in responses]
+        assert all(use.reused for use in uses)
+        assert all(use.handshake_ms == 0 for use in uses)
+
+    async def test_without_the_shared_client_every_request_connects(
+        self, server: StandInServer, http: SharedHttpClient
+    ) -> None:
+        responses = await asyncio.gather(
+            *(http.request("GET", server.url) for _ in range(10))
+        )
+
+        assert server.connections == 10
+        assert http.connections_opened == 10
+        assert http.reused == 0
+        use = responses[0].extensions["connection_use"]
+        assert not use.reused
+        assert use.http_version == "HTTP/1.1"
+        assert use.handshake_ms > 0
+        await _wait_for(lambda: server.open_connections == 0)
+        assert server.open_connections == 0
+
+    async def test_stop_closes_the_pooled_connections(
+        self, server: StandInServer, http: SharedHttpClient
+    ) -> None:
+        http.start()
+        await asyncio.gather(*(http.request("GET", server.url) for _ in range(4)))
+        assert server.open_connections > 0
+
+        await http.stop()
+
+        assert not http.running
+        await _wait_for(lambda: server.open_connections == 0)
+        assert server.open_connections == 0
+
+    async def test_pool_limits_come_from_the_environment(
+        self,
+        server: StandInServer,
+        http: SharedHttpClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setenv("TEST_UPSTREAM_MAX_CONNECTIONS", "1")
+        http.start()
+        try:
+            await asyncio.gather(*(http.request("GET", server.url) for _ in range(5)))
+        finally:
+            await http.stop()
+
+        assert server.connections == 1
+        assert http.reused == 4
+
+
+async def test_you_com_explanations_reuse_the_app_connection(
+    server: StandInServer, flight_context, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("YOU_COM_API_KEY", "test")
+    monkeypatch.setenv("YOU_COM_SEARCH_URL", server.url)
+    monkeypatch.setenv("YOU_COM_CACHE_TTL_S", "0")
+    monkeypatch.setattr(you_com_client, "YOU_COM_HTTP", SharedHttpClient("YOU_COM"))
+    risk = compute_risk(flight_context)
+
+    you_com_client.YOU_COM_HTTP.start()
+    try:
+        explanations = [
+            await generate_you_com_explanation(flight_context, risk) for _ in range(3)
+        ]
+    finally:
+        await you_com_client.YOU_COM_HTTP.stop()
+
+    assert server.requests == 3
+    assert server.connections == 1
+    assert explanations[-1].source == "You.com"
+    assert "Personal minimums" in explanations[-1].explanation
@@ -0,0 +1,20 @@
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+
+from backend.services.query_normalization import canonical_aircraft, time_bucket
+
+
+@pytest.mark.parametrize("spelling", ["c-172", " C172 ", "c 172", "C_17/2"])
+def test_aircraft_spellings_share_a_type(spelling: str) -> None:
+    assert canonical_aircraft(spelling) == "C172"
+
+
+def test_departures_are_floored_to_utc_buckets(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("YOU_COM_QUERY_TIME_BUCKET_H", "6")
+    local = datetime(2025, 1, 1, 13, 59, tzinfo=timezone(timedelta(hours=2)))
+
+    assert time_bucket(local) == "2025-01-01 06:00Z"
+    assert time_bucket(datetime(2025, 1, 1, 17, 0, tzinfo=UTC)) == ("2025-01-01 12:00Z")
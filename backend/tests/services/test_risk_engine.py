@@ -0,0 +1,110 @@
+import polars as pl
+import pytest
+from pydantic import ValidationError
+
+from backend.schemas import FlightContext
+from backend.services import (
+    HISTORY_STATS,
+    RECENT_EVALUATIONS,
+    assess_risk,
+    compute_risk,
+    compute_risk_batch,
+)
+from backend.services.risk_engine import tier_expr, tier_for_score
+from backend.testing import random_contexts
+
+
+class TestComputeRiskBatch:
+    def test_matches_compute_risk(self, flight_context: FlightContext) -> None:
+        contexts = random_contexts(flight_context, 2000)
+
+        batch = compute_risk_batch(contexts)
+
+        assert len(batch) == len(contexts)
+        for context, result in zip(contexts, batch, strict=True):
+            assert result.model_dump() == compute_risk(context).model_dump()
+
+    def test_handles_nan_like_compute_risk(self, flight_context: FlightContext) -> None:
+        context = flight_context.model_copy(
+            update={
+                "max_crosswind_knots": float("nan"),
+                "departure_visibility_sm": float("nan"),
+                "destination_visibility_sm": 1.0,
+            }
+        )
+
+        [result] = compute_risk_batch([context])
+
+        assert result.model_dump() == compute_risk(context).model_dump()
+
+    def test_empty_batch(self) -> None:
+        assert compute_risk_batch([]) == []
+
+    def test_does_not_record_history(self, flight_context: FlightContext) -> None:
+        before = list(RECENT_EVALUATIONS)
+
+        compute_risk_batch([flight_context] * 3)
+
+        assert list(RECENT_EVALUATIONS) == before
+
+    @pytest.mark.parametrize("size", [1, 7])
+    def test_factor_lists_are_independent(
+        self, flight_context: FlightContext, size: int
+    ) -> None:
+        risky = flight_context.model_copy(update={"pilot_total_hours": 10})
+
+        results = compute_risk_batch([risky] * size)
+        results[0].factors.clear()
+
+        assert all(result.factors for result in results[1:])
+
+
+class TestTiers:
+    def test_expression_matches_tier_for_score(self) -> None:
+        scores = pl.DataFrame({"score": range(101)})
+
+        tiers = scores.select(tier_expr(pl.col("score"))).to_series().to_list()
+
+        assert tiers == [tier_for_score(score) for score in range(101)]
+        assert (tiers[29], tiers[30], tiers[59], tiers[60]) == (
+            "GO",
+            "CAUTION",
+            "CAUTION",
+            "NO-GO",
+        )
+
+
+class TestAssessRisk:
+    def test_matches_compute_risk(self, flight_context: FlightContext) -> None:
+        for context in random_contexts(flight_context, 500):
+            assessment = assess_risk(context)
+            expected = compute_risk(context)
+
+            assert assessment.to_result() == expected
+            assert [tuple(factor) for factor in assessment.factors] == [
+                (factor.label, factor.impact) for factor in expected.factors
+            ]
+
+    def test_interns_factor_records(self, flight_context: FlightContext) -> None:
+        risky = flight_context.model_copy(update={"pilot_total_hours": 10})
+
+        first, second = assess_risk(risky), assess_risk(risky)
+
+        assert first.factors
+        assert first.factors is second.factors
+
+    def test_shared_factors_are_read_only(self, flight_context: FlightContext) -> None:
+        risky = flight_context.model_copy(update={"pilot_total_hours": 10})
+        first, second = compute_risk(risky), compute_risk(risky)
+
+        assert first.factors[0] is second.factors[0]
+        with pytest.raises(ValidationError):
+            first.factors[0].impact = 0
+
+    def test_records_history(self, flight_context: FlightContext) -> None:
+        before = HISTORY_STATS.scores.total
+
+        assessment = assess_risk(flight_context)
+
+        assert HISTORY_STATS.scores.total == before + 1
+        assert list(RECENT_EVALUATIONS)[-1][1] == assessment.score
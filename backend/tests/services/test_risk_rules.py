@@ -0,0 +1,169 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from backend.schemas import FlightContext
+from backend.services import (
+    compute_risk,
+    compute_risk_batch,
+    get_active_ruleset,
+    risk_rules,
+)
+from backend.services.risk_rules import RuleSet, activate_ruleset, load_ruleset
+from backend.testing import legacy_compute_risk, random_contexts
+
+
+@pytest.fixture(autouse=True)
+def reset_ruleset():
+    risk_rules._reset_active_ruleset()
+    yield
+    risk_rules._reset_active_ruleset()
+
+
+def _write_rules(path: Path, version: str, impact: int) -> None:
+    path.write_text(
+        json.dumps(
+            {
+                "version": version,
+                "rules": [
+                    {
+                        "label": "Low time pilot",
+                        "impact": impact,
+                        "when": [
+                            {"field": "pilot_total_hours", "op": "<", "value": 100}
+                        ],
+                    }
+                ],
+            }
+        )
+    )
+
+
+class TestDefaultRuleSet:
+    def test_matches_hand_written_rules(self, flight_context: FlightContext) -> None:
+        for context in random_contexts(flight_context, 2000):
+            result = compute_risk(context)
+            score, factors = legacy_compute_risk(context)
+
+            assert result.score == score
+            assert result.factors == factors
+
+    def test_reports_version(self, flight_context: FlightContext) -> None:
+        version = load_ruleset(risk_rules.DEFAULT_RULES_PATH).version
+
+        assert compute_risk(flight_context).ruleset_version == version
+        assert compute_risk_batch([flight_context])[0].ruleset_version == version
+
+
+class TestCompiledRuleSet:
+    def test_group_fires_first_matching_rule_only(
+        self, flight_context: FlightContext
+    ) -> None:
+        rules = RuleSet.model_validate(
+            {
+                "version": "test",
+                "rules": [
+                    {
+                        "label": "Gusty",
+                        "impact": 10,
+                        "group": "wind",
+                        "when": [{"field": "gusts_knots", "op": ">", "value": 20}],
+                    },
+                    {
+                        "label": "Breezy",
+                        "impact": 5,
+                        "group": "wind",
+                        "when": [{"field": "gusts_knots", "op": ">", "value": 10}],
+                    },
+                ],
+            }
+        )
+        activate_ruleset(rules)
+        contexts = [
+            flight_context.model_copy(update={"gusts_knots": gusts})
+            for gusts in (5, 15, 25)
+        ]
+
+        results = [compute_risk(context) for context in contexts]
+
+        assert [result.score for result in results] == [0, 5, 10]
+        assert [result.model_dump() for result in results] == [
+            result.model_dump() for result in compute_risk_batch(contexts)
+        ]
+
+    @pytest.mark.parametrize("op", ["<", ">=", "==", "!="])
+    def test_nan_matches_no_comparison(
+        self, flight_context: FlightContext, op: str
+    ) -> None:
+        rules = RuleSet.model_validate(
+            {
+                "version": "test",
+                "rules": [
+                    {
+                        "label": "Crosswind",
+                        "impact": 10,
+                        "when": [
+                            {"field": "max_crosswind_knots", "op": op, "value": 5}
+                        ],
+                    }
+                ],
+            }
+        )
+        activate_ruleset(rules)
+        context = flight_context.model_copy(
+            update={"max_crosswind_knots": float("nan")}
+        )
+
+        result = compute_risk(context)
+
+        assert result.score == 0
+        assert compute_risk_batch([context])[0].model_dump() == result.model_dump()
+
+    def test_rejects_unknown_field(self) -> None:
+        with pytest.raises(ValueError, match="field"):
+            RuleSet.model_validate(
+                {
+                    "version": "bad",
+                    "rules": [
+                        {
+                            "label": "Injected",
+                            "impact": 1,
+                            "when": [{"field": "__class__", "op": "<", "value": 1}],
+                        }
+                    ],
+                }
+            )
+
+
+class TestHotReload:
+    def test_swaps_table_when_file_changes(
+        self, monkeypatch, tmp_path: Path, flight_context: FlightContext
+    ) -> None:
+        path = tmp_path / "rules.json"
+        _write_rules(path, "v1", 10)
+        monkeypatch.setenv("RISK_RULES_PATH", str(path))
+
+        assert compute_risk(flight_context).ruleset_version == "v1"
+
+        _write_rules(path, "v2-longer", 20)
+        monkeypatch.setattr(risk_rules._state, "next_check", 0.0)
+        result = compute_risk(
+            flight_context.model_copy(update={"pilot_total_hours": 5})
+        )
+
+        assert result.ruleset_version == "v2-longer"
+        assert result.score == 20
+
+    def test_keeps_previous_table_on_invalid_file(
+        self, monkeypatch, tmp_path: Path, flight_context: FlightContext
+    ) -> None:
+        path = tmp_path / "rules.json"
+        _write_rules(path, "v1", 10)
+        monkeypatch.setenv("RISK_RULES_PATH", str(path))
+        assert get_active_ruleset().version == "v1"
+
+        path.write_text('{"version": "broken", "rules": []}')
+        monkeypatch.setattr(risk_rules._state, "next_check", 0.0)
+
+        assert get_active_ruleset().version == "v1"
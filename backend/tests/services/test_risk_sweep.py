@@ -0,0 +1,137 @@
+import itertools
+import time
+from datetime import timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from backend.schemas import FlightContext, SweepRequest
+from backend.services import compute_risk, sweep_risk
+
+
+class TestSweepRisk:
+    def test_surface_matches_compute_risk(self, flight_context: FlightContext) -> None:
+        hours = [
+            flight_context.departure_time_utc + timedelta(hours=h) for h in range(4)
+        ]
+        request = SweepRequest.model_validate(
+            {
+                "base": flight_context,
+                "axes": [
+                    {
+                        "name": "forecast",
+                        "values": {
+                            "departure_time_utc": hours,
+                            "departure_visibility_sm": [1, 2.5, 5, 10],
+                            "departure_ceiling_ft": [500, 900, 1500, 3000],
+                            "max_crosswind_knots": [25, 18, 12, 8],
+                        },
+                    },
+                    {
+                        "values": {
+                            "planned_takeoff_weight_kg": {
+                                "start": 900,
+                                "stop": 1100,
+                                "step": 100,
+                            }
+                        }
+                    },
+                ],
+                "top_k": 3,
+            }
+        )
+
+        result = sweep_risk(request)
+
+        assert result.axes == ["forecast", "planned_takeoff_weight_kg"]
+        assert result.shape == [4, 3]
+        expected = []
+        for hour, weight in itertools.product(range(4), [900.0, 1000.0, 1100.0]):
+            forecast = request.axes[0].values
+            context = flight_context.model_copy(
+                update={
+                    "departure_visibility_sm": forecast["departure_visibility_sm"][
+                        hour
+                    ],
+                    "departure_ceiling_ft": forecast["departure_ceiling_ft"][hour],
+                    "max_crosswind_knots": forecast["max_crosswind_knots"][hour],
+                    "planned_takeoff_weight_kg": weight,
+                }
+            )
+            expected.append(compute_risk(context))
+        assert result.scores == [risk.score for risk in expected]
+        assert result.tiers == [risk.tier for risk in expected]
+
+        assert [point.risk.score for point in result.best] == sorted(result.scores)[:3]
+        for point in result.best:
+            assert point.risk == expected[point.index]
+            assert point.coordinates == [point.index // 3, point.index % 3]
+            assert point.values["departure_time_utc"] == hours[point.coordinates[0]]
+
+    def test_rejects_mismatched_axis_lengths(
+        self, flight_context: FlightContext
+    ) -> None:
+        with pytest.raises(ValidationError, match="same length"):
+            SweepRequest.model_validate(
+                {
+                    "base": flight_context,
+                    "axes": [
+                        {
+                            "values": {
+                                "gusts_knots": [10, 20],
+                                "max_crosswind_knots": [5],
+                            }
+                        }
+                    ],
+                }
+            )
+
+    def test_rejects_field_on_two_axes(self, flight_context: FlightContext) -> None:
+        with pytest.raises(ValidationError, match="only one sweep axis"):
+            SweepRequest.model_validate(
+                {
+                    "base": flight_context,
+                    "axes": [
+                        {"values": {"gusts_knots": [10]}},
+                        {"values": {"gusts_knots": [20]}},
+                    ],
+                }
+            )
+
+    def test_rejects_oversized_grid(self, flight_context: FlightContext) -> None:
+        axis = {"values": {"gusts_knots": {"start": 0, "stop": 9999, "step": 1}}}
+        with pytest.raises(ValidationError, match="limited to"):
+            SweepRequest.model_validate(
+                {
+                    "base": flight_context,
+                    "axes": [
+                        axis,
+                        {"values": {"max_crosswind_knots": [1.0] * 101}},
+                    ],
+                }
+            )
+
+    def test_rejects_oversized_ranges_before_expanding_them(
+        self, flight_context: FlightContext
+    ) -> None:
+        billion = {"gusts_knots": {"start": 0, "stop": 1e9, "step": 1}}
+        wide = {"max_crosswind_knots": {"start": 0, "stop": 1e5, "step": 1}}
+        narrow = {"icing_risk_0_1": {"start": 0, "stop": 1, "step": 1e-5}}
+        started = time.perf_counter()
+
+        for axes in ([billion], [wide, narrow]):
+            with pytest.raises(ValidationError, match="limited to"):
+                SweepRequest.model_validate(
+                    {"base": flight_context, "axes": [{"values": v} for v in axes]}
+                )
+
+        assert time.perf_counter() - started < 1
+
+    def test_rejects_fractional_int_field(self, flight_context: FlightContext) -> None:
+        with pytest.raises(ValidationError):
+            SweepRequest.model_validate(
+                {
+                    "base": flight_context,
+                    "axes": [{"values": {"departure_ceiling_ft": [999.5]}}],
+                }
+            )
@@ -0,0 +1,113 @@
+import multiprocessing
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from backend.services.history_store import recent_history
+from backend.services.shared_history import SharedRingBuffer
+
+START = datetime(2025, 1, 1, 12, 0, tzinfo=UTC)
+
+
+@pytest.fixture
+def ring(tmp_path: Path):
+    ring = SharedRingBuffer(tmp_path / "evaluations.ring", capacity=4)
+    yield ring
+    ring.close()
+
+
+def _append_many(path: str, offset: int, count: int) -> None:
+    ring = SharedRingBuffer(Path(path), capacity=64, slots=2)
+    for index in range(count):
+        ring.append(START + timedelta(seconds=offset + index), offset + index, "GO")
+    ring.close()
+
+
+class TestSharedRingBuffer:
+    def test_keeps_most_recent_records_in_order(self, ring: SharedRingBuffer) -> None:
+        for index in range(6):
+            ring.append(START + timedelta(seconds=index), index * 10, "CAUTION")
+
+        assert len(ring) == 4
+        assert [score for _, score in ring] == [20, 30, 40, 50]
+        assert ring.snapshot(2) == [
+            (START + timedelta(seconds=4), 40, "CAUTION"),
+            (START + timedelta(seconds=5), 50, "CAUTION"),
+        ]
+
+    def test_round_trips_microseconds_and_tiers(self, ring: SharedRingBuffer) -> None:
+        timestamp = datetime(2025, 6, 30, 23, 59, 59, 999_999, tzinfo=UTC)
+        for tier in ("GO", "CAUTION", "NO-GO"):
+            ring.append(timestamp, 99, tier)
+
+        assert ring.snapshot() == [
+            (timestamp, 99, "GO"),
+            (timestamp, 99, "CAUTION"),
+            (timestamp, 99, "NO-GO"),
+        ]
+
+    def test_reopening_keeps_records_and_capacity(self, tmp_path: Path) -> None:
+        first = SharedRingBuffer(tmp_path / "evaluations.ring", capacity=8)
+        first.append(START, 42, "CAUTION")
+        first.close()
+
+        second = SharedRingBuffer(tmp_path / "evaluations.ring", capacity=16)
+
+        assert second.capacity == 8
+        assert second.snapshot() == [(START, 42, "CAUTION")]
+        second.close()
+
+    def test_clear(self, ring: SharedRingBuffer) -> None:
+        ring.append(START, 1, "GO")
+        ring.clear()
+
+        assert len(ring) == 0
+        assert list(ring) == []
+
+    def test_shared_across_processes_and_reclaims_slots(self, tmp_path: Path) -> None:
+        path = tmp_path / "evaluations.ring"
+        context = multiprocessing.get_context("spawn")
+        workers = [
+            context.Process(target=_append_many, args=(str(path), offset, 20))
+            for offset in (0, 100)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+            assert worker.exitcode == 0
+
+        ring = SharedRingBuffer(path, capacity=64, slots=2)
+        assert sorted(score for _, score in ring) == [*range(20), *range(100, 120)]
+
+        # Both slots belong to exited workers, so this process takes one over.
+        ring.append(START + timedelta(hours=1), 7, "GO")
+        assert len(ring) == 41
+        assert ring.snapshot(1) == [(START + timedelta(hours=1), 7, "GO")]
+        ring.close()
+
+
+class TestRecentHistory:
+    async def test_returns_none_until_ring_fills_a_page(self, mocker, ring) -> None:
+        mocker.patch("backend.services.history_store.RECENT_EVALUATIONS", ring)
+        ring.append(START, 5, "GO")
+
+        assert await recent_history(limit=2) is None
+
+    async def test_page_continues_into_database_history(self, mocker, ring) -> None:
+        mocker.patch("backend.services.history_store.RECENT_EVALUATIONS", ring)
+        boundary_id = mocker.patch(
+            "backend.services.history_store._boundary_id", return_value=7
+        )
+        for minute in (0, 1, 1, 2):
+            ring.append(START + timedelta(minutes=minute), minute, "GO")
+
+        page = await recent_history(limit=3)
+
+        assert page is not None
+        assert [point.score for point in page.points] == [1, 1, 2]
+        boundary = START + timedelta(minutes=1)
+        assert page.next_cursor == f"{boundary.isoformat()}|7"
+        # Both points at the boundary timestamp were shown.
+        boundary_id.assert_awaited_once_with(boundary, 2)
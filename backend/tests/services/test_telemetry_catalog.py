@@ -0,0 +1,209 @@
+import asyncio
+import os
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from backend.services import telemetry_catalog, telemetry_tools
+from backend.services.telemetry_catalog import SortieCatalog, UnknownSortieError
+from backend.services.telemetry_tools import ALL_SORTIES, analyze_wow
+from backend.testing import make_sortie_frame
+
+
+def _write_sortie(path: Path, rows: int = 60, **columns) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    make_sortie_frame(rows).with_columns(**columns).write_csv(path)
+
+
+def _touch(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def sortie_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Two sorties of one airframe in its own directory, plus a legacy file."""
+    root = tmp_path / "sorties"
+    _write_sortie(
+        root / "F16-0042" / "2024-05-01_am.csv", TIME=pl.int_range(pl.len()) * 0.5
+    )
+    _write_sortie(root / "F16-0042" / "20240502.csv", rows=120)
+    _write_sortie(root / "legacy.csv", AIRFRAME=pl.lit("C130-7"))
+    monkeypatch.setenv("TELEMETRY_DIR", str(root))
+    monkeypatch.delenv("TELEMETRY_CACHE_DIR", raising=False)
+    monkeypatch.setattr(telemetry_catalog, "TELEMETRY_CATALOG", SortieCatalog())
+    monkeypatch.setattr(telemetry_tools, "_LOADED", OrderedDict())
+    monkeypatch.setattr(telemetry_tools, "_SUMMARIES", OrderedDict())
+    return root
+
+
+def _count_ingests(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    ingested: list[str] = []
+    ingest = telemetry_catalog.ingest_sortie
+
+    def counting(root: str, path: str):
+        ingested.append(Path(path).name)
+        return ingest(root, path)
+
+    monkeypatch.setattr(telemetry_catalog, "ingest_sortie", counting)
+    return ingested
+
+
+class TestSortieCatalog:
+    def test_registers_sorties_with_metadata(self, sortie_dir: Path) -> None:
+        morning, second, legacy = telemetry_catalog.TELEMETRY_CATALOG.sorties()
+
+        assert morning.sortie == "F16-0042/2024-05-01_am"
+        assert (morning.airframe, morning.date) == ("F16-0042", date(2024, 5, 1))
+        assert (morning.rows, morning.duration_s) == (60, pytest.approx(29.5))
+        assert second.sortie == "F16-0042/20240502"
+        assert (second.date, second.rows, second.duration_s) == (
+            date(2024, 5, 2),
+            120,
+            None,
+        )
+        assert (legacy.sortie, legacy.airframe, legacy.date) == (
+            "legacy",
+            "C130-7",
+            None,
+        )
+        # Ingestion converted every file, so analyzers only memory-map them.
+        assert len(list(sortie_dir.rglob(".telemetry-cache/*.arrow"))) == 3
+
+    def test_only_new_and_changed_files_are_ingested(
+        self, sortie_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        catalog = telemetry_catalog.TELEMETRY_CATALOG
+        ingested = _count_ingests(monkeypatch)
+        catalog.refresh()
+        assert len(ingested) == 3
+
+        ingested.clear()
+        _write_sortie(sortie_dir / "legacy.csv", rows=30, AIRFRAME=pl.lit("C130-7"))
+        _touch(sortie_dir / "legacy.csv")
+        (sortie_dir / "F16-0042" / "20240502.csv").unlink()
+        _write_sortie(sortie_dir / "F16-0099" / "2024-06-01.csv")
+
+        sorties = {info.sortie: info for info in catalog.refresh()}
+
+        assert sorted(ingested) == ["2024-06-01.csv", "legacy.csv"]
+        assert sorted(sorties) == [
+            "F16-0042/2024-05-01_am",
+            "F16-0099/2024-06-01",
+            "legacy",
+        ]
+        assert sorties["legacy"].rows == 30
+
+    def test_lookups_read_the_last_scan_until_it_is_stale(
+        self, sortie_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        catalog = SortieCatalog()
+        assert len(catalog.sorties()) == 3
+        _write_sortie(sortie_dir / "F16-0099" / "2024-06-01.csv")
+
+        assert len(catalog.select(ALL_SORTIES)) == 3
+
+        catalog.rescan_s = 0
+        assert len(catalog.select(ALL_SORTIES)) == 4
+
+    async def test_started_catalog_rescans_in_the_background(
+        self, sortie_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TELEMETRY_CATALOG_RESCAN_S", "0.05")
+        catalog = SortieCatalog()
+        catalog.start()
+        try:
+            await asyncio.sleep(0.2)
+            assert len(catalog.sorties()) == 3
+            _write_sortie(sortie_dir / "F16-0099" / "2024-06-01.csv")
+
+            # Picked up without a lookup.
+            await asyncio.sleep(0.3)
+            assert "F16-0099/2024-06-01" in catalog._sorties
+        finally:
+            await catalog.stop()
+        assert not catalog.running
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_unreadable_files_are_skipped_until_they_change(
+        self, sortie_dir: Path, monkeypatch: pytest.MonkeyPatch, workers: int
+    ) -> None:
+        broken = sortie_dir / "F16-0042" / "2024-05-03.csv"
+        broken.write_text("TIME,AOA\n1,2,3,4,5\n")
+        catalog = SortieCatalog()
+
+        assert len(catalog.refresh(workers=workers)) == 3
+
+        ingested = _count_ingests(monkeypatch)
+        catalog.refresh(workers=1)
+        assert ingested == []
+
+        _write_sortie(broken)
+        _touch(broken)
+        assert "F16-0042/2024-05-03" in {
+            info.sortie for info in catalog.refresh(workers=1)
+        }
+        assert ingested == ["2024-05-03.csv"]
+
+    def test_parallel_ingest_matches_serial(self, sortie_dir: Path) -> None:
+        serial = SortieCatalog().refresh(workers=1)
+        for sidecar in sortie_dir.rglob(".telemetry-cache/*.arrow"):
+            sidecar.unlink()
+
+        parallel = SortieCatalog().refresh(workers=2)
+
+        assert parallel == serial
+        assert len(list(sortie_dir.rglob(".telemetry-cache/*.arrow"))) == 3
+
+    def test_unknown_sortie(self, sortie_dir: Path) -> None:
+        with pytest.raises(UnknownSortieError, match="F16-0042/nope"):
+            telemetry_catalog.TELEMETRY_CATALOG.get("F16-0042/nope")
+
+    def test_empty_directory(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setenv("TELEMETRY_DIR", str(tmp_path / "none"))
+
+        assert SortieCatalog().sorties() == []
+        with pytest.raises(FileNotFoundError):
+            SortieCatalog().select(ALL_SORTIES)
+
+
+class TestSortieSelector:
+    @pytest.mark.parametrize("engine", ["eager", "streaming"])
+    def test_one_sortie(self, sortie_dir: Path, engine: str) -> None:
+        summary = analyze_wow(engine, sorties="F16-0042/2024-05-01_am")
+
+        [sortie] = summary.sorties
+        assert sortie.sortie == "F16-0042/2024-05-01_am"
+        assert summary.time_basis == "TIME"
+        assert sortie.takeoff_times == [5.0]
+
+    def test_set_of_sorties(self, sortie_dir: Path) -> None:
+        summary = analyze_wow(sorties={"legacy", "F16-0042/20240502"})
+
+        assert [sortie.sortie for sortie in summary.sorties] == [
+            "F16-0042/20240502",
+            "legacy",
+        ]
+        assert summary.num_takeoff_like_transitions == 2
+        assert summary.num_landing_like_transitions == 2
+
+    def test_all_sorties(self, sortie_dir: Path) -> None:
+        summary = analyze_wow(sorties=ALL_SORTIES)
+
+        assert len(summary.sorties) == 3
+        assert summary.num_takeoff_like_transitions == 3
+
+    def test_changed_sortie_invalidates_its_selections(self, sortie_dir: Path) -> None:
+        assert len(analyze_wow(sorties=ALL_SORTIES).sorties) == 3
+
+        _write_sortie(sortie_dir / "F16-0099" / "2024-06-01.csv")
+        telemetry_catalog.TELEMETRY_CATALOG.refresh()
+
+        assert len(analyze_wow(sorties=ALL_SORTIES).sorties) == 4
+
+    def test_unknown_sortie(self, sortie_dir: Path) -> None:
+        with pytest.raises(UnknownSortieError):
+            analyze_wow(sorties=["legacy", "missing"])
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from backend.services import telemetry_episodes
+from backend.services.telemetry_episodes import (
+    InvalidEpisodeQueryError,
+    find_episodes,
+)
+from backend.services.telemetry_tools import analyze_performance
+from backend.testing import make_sortie_frame
+
+_ROWS = 100
+
+
+def _excursions(**columns) -> pl.DataFrame:
+    """
+    Level flight with AOA excursions over rows 10-14 (EVENT 2 at row 12), row
+    20 and rows 30-39 (dipping to 11° at row 35), and one negative sideslip
+    excursion over rows 50-59.
+    """
+    row = pl.int_range(pl.len())
+    aoa = (
+        pl.when(row.is_between(10, 14))
+        .then(13.0)
+        .when(row == 20)
+        .then(15.0)
+        .when(row == 35)
+        .then(11.0)
+        .when(row.is_between(30, 39))
+        .then(20.0 + row - 30)
+        .otherwise(2.0)
+    )
+    return make_sortie_frame(_ROWS).with_columns(
+        **{
+            "AOA": aoa,
+            "AOSS": pl.when(row.is_between(50, 59)).then(-12.0).otherwise(1.0),
+            "EVENT": pl.when(row == 12).then(2),
+            **columns,
+        }
+    )
+
+
+@pytest.fixture
+def excursions_csv(telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    _excursions().write_csv(telemetry_csv)
+    monkeypatch.setattr(telemetry_episodes, "_INDEXES", OrderedDict())
+    return telemetry_csv
+
+
+class TestEpisodeIndex:
+    def test_runs_over_default_threshold(self, excursions_csv: Path) -> None:
+        result = find_episodes("aoa")
+
+        assert (result.threshold, result.time_basis) == (12.0, "row")
+        assert result.num_episodes == 4
+        assert result.total_duration == 5 + 1 + 5 + 4
+        first, spike, before_dip, after_dip = result.episodes
+        assert (first.start, first.end, first.duration) == (10, 15, 5)
+        assert (first.peak, first.event, first.samples) == (13.0, 2, 5)
+        assert (spike.start, spike.samples, spike.event) == (20, 1, None)
+        assert (before_dip.start, before_dip.end) == (30, 35)
+        assert (after_dip.peak, after_dip.peak_time) == (29.0, 39)
+
+    def test_custom_threshold(self, excursions_csv: Path) -> None:
+        [dip_included] = find_episodes("aoa", threshold=10.5, start=25).episodes
+        assert (dip_included.start, dip_included.end) == (30, 40)
+
+        assert find_episodes("aoa", threshold=14).num_episodes == 3
+
+    def test_memoizes_a_bounded_number_of_thresholds(
+        self, excursions_csv: Path
+    ) -> None:
+        for step in range(100):
+            find_episodes("aoa", threshold=8 + step / 10)
+
+        [index] = telemetry_episodes._INDEXES.values()
+        assert len(index._episodes) == telemetry_episodes._EPISODE_CACHE_SIZE
+        assert find_episodes("aoa", threshold=14).num_episodes == 3
+
+    def test_time_range_selects_overlapping_episodes(
+        self, excursions_csv: Path
+    ) -> None:
+        result = find_episodes("aoa", start=14, end=32)
+
+        assert [episode.start for episode in result.episodes] == [10, 20, 30]
+
+    def test_sideslip_is_absolute(self, excursions_csv: Path) -> None:
+        [episode] = find_episodes("sideslip").episodes
+
+        assert (episode.start, episode.duration, episode.peak) == (50, 10, 12.0)
+
+    def test_rejects_thresholds_under_the_index_floor(
+        self, excursions_csv: Path
+    ) -> None:
+        with pytest.raises(InvalidEpisodeQueryError):
+            find_episodes("aoa", threshold=3)
+
+    def test_episodes_do_not_span_sorties(self, telemetry_csv: Path) -> None:
+        frame = _excursions(
+            SORTIE_ID=pl.when(pl.int_range(pl.len()) < 13).then(1).otherwise(2),
+            TIME=pl.int_range(pl.len()) * 0.5,
+        )
+        frame.write_csv(telemetry_csv)
+
+        result = find_episodes("aoa", limit=2)
+
+        assert result.time_basis == "TIME"
+        assert [
+            (episode.sortie, episode.start, episode.end) for episode in result.episodes
+        ] == [("1", 5.0, 6.0), ("2", 6.5, 7.5)]
+
+    @pytest.mark.parametrize("engine", ["eager", "streaming"])
+    def test_engines_agree(self, excursions_csv: Path, engine: str) -> None:
+        result = find_episodes("aoa", threshold=10.5, engine=engine)
+
+        assert [episode.samples for episode in result.episodes] == [5, 1, 10]
+
+    def test_rebuilt_when_the_file_changes(self, excursions_csv: Path) -> None:
+        assert find_episodes("sideslip").num_episodes == 1
+
+        _excursions(AOSS=pl.lit(1.0)).write_csv(excursions_csv)
+
+        assert find_episodes("sideslip").num_episodes == 0
+
+    def test_appended_rows_extend_the_index(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        frame = _excursions()
+        frame.head(33).write_csv(telemetry_csv)
+        [*_, cut_off] = find_episodes("aoa").episodes
+        assert (cut_off.start, cut_off.end) == (30, 33)
+
+        with telemetry_csv.open("a") as file:
+            frame.slice(33).write_csv(file, include_header=False)
+
+        def no_rebuild(*args, **kwargs):
+            raise AssertionError("Index rebuilt for appended rows")
+
+        monkeypatch.setattr(telemetry_episodes.EpisodeIndex, "build", no_rebuild)
+        result = find_episodes("aoa", threshold=10.5)
+
+        assert [(e.start, e.end) for e in result.episodes] == [
+            (10, 15),
+            (20, 21),
+            (30, 40),
+        ]
+        assert find_episodes("sideslip").num_episodes == 1
+
+
+def test_performance_summary_counts_episodes(excursions_csv: Path) -> None:
+    summary = analyze_performance()
+
+    assert summary.num_high_aoa_events == 15
+    assert summary.num_high_aoa_episodes == 4
+    assert summary.num_high_sideslip_events == 10
+    assert summary.num_high_sideslip_episodes == 1
@@ -0,0 +1,64 @@
+import io
+import json
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from backend.services.telemetry_export import (
+    InvalidExportRequestError,
+    export_telemetry,
+    telemetry_slice,
+)
+from backend.testing import make_sortie_frame
+
+
+def _read_arrow(chunks) -> pl.DataFrame:
+    return pl.read_ipc_stream(io.BytesIO(b"".join(chunks)))
+
+
+class TestTelemetrySlice:
+    def test_selects_columns_and_rows(self, telemetry_csv: Path) -> None:
+        frame = telemetry_slice(["AOA", "NOSE_WOW"], start_row=100, end_row=250)
+
+        expected = make_sortie_frame().select("AOA", "NOSE_WOW").slice(100, 150)
+        assert frame.equals(expected)
+
+    def test_clamps_end_to_the_data(self, telemetry_csv: Path) -> None:
+        assert telemetry_slice(start_row=550, end_row=10_000).height == 50
+        assert telemetry_slice(start_row=700).height == 0
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"columns": ["AOA", "NOPE"]},
+            {"start_row": -1},
+            {"start_row": 20, "end_row": 10},
+        ],
+    )
+    def test_rejects_invalid_requests(self, telemetry_csv: Path, kwargs) -> None:
+        with pytest.raises(InvalidExportRequestError):
+            telemetry_slice(**kwargs)
+
+
+class TestExportTelemetry:
+    def test_arrow_stream_round_trips_in_batches(self) -> None:
+        frame = make_sortie_frame(1_000)
+
+        chunks = list(export_telemetry(frame, batch_rows=64))
+
+        # One piece per batch, then the end-of-stream marker.
+        assert len(chunks) == 17
+        assert _read_arrow(chunks).equals(frame)
+
+    def test_empty_slice_keeps_the_schema(self) -> None:
+        frame = make_sortie_frame(10).clear()
+
+        assert _read_arrow(export_telemetry(frame)).schema == frame.schema
+
+    def test_ndjson(self) -> None:
+        frame = make_sortie_frame(100).select("AOA", "EVENT")
+
+        lines = b"".join(export_telemetry(frame, "ndjson", batch_rows=30)).splitlines()
+
+        assert [json.loads(line) for line in lines] == frame.to_dicts()
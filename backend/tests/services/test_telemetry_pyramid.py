@@ -0,0 +1,127 @@
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from backend.services import telemetry_pyramid
+from backend.services.telemetry_pyramid import (
+    InvalidChartRequestError,
+    TelemetryPyramid,
+    telemetry_chart,
+)
+from backend.testing import make_sortie_frame
+
+_ROWS = 40_000
+_SPIKE_ROW = 12_345
+
+
+@pytest.fixture
+def pyramid() -> TelemetryPyramid:
+    """A long sortie sampled every 0.1 s with one AOA spike."""
+    frame = make_sortie_frame(_ROWS).with_columns(
+        TIME=pl.int_range(pl.len()) * 0.1,
+        AOA=pl.when(pl.int_range(pl.len()) == _SPIKE_ROW)
+        .then(99.0)
+        .otherwise(pl.col("AOA")),
+    )
+    return TelemetryPyramid.build("long", frame, lambda: frame)
+
+
+@pytest.fixture(autouse=True)
+def empty_pyramid_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(telemetry_pyramid, "_PYRAMIDS", OrderedDict())
+
+
+class TestTelemetryPyramid:
+    def test_whole_sortie_keeps_extremes(self, pyramid: TelemetryPyramid) -> None:
+        raw = make_sortie_frame(_ROWS)
+
+        chart = pyramid.chart(["AOA", "AIRSPEED_IC"], width=200)
+
+        assert chart.time_basis == "TIME"
+        assert chart.bucket_rows > 1
+        assert len(chart.time) == 200
+        aoa, airspeed = chart.channels["AOA"], chart.channels["AIRSPEED_IC"]
+        assert max(aoa.max) == 99.0
+        spike_pixel = aoa.max.index(99.0)
+        assert chart.time[spike_pixel] <= _SPIKE_ROW * 0.1
+        assert spike_pixel == int(_SPIKE_ROW / (_ROWS - 1) * 200)
+        assert min(airspeed.min) == raw.get_column("AIRSPEED_IC").min()
+        assert max(airspeed.max) == raw.get_column("AIRSPEED_IC").max()
+        for low, mean, high in zip(aoa.min, aoa.mean, aoa.max, strict=True):
+            assert low <= mean <= high
+
+    def test_zoomed_range_uses_finer_level(self, pyramid: TelemetryPyramid) -> None:
+        coarse = pyramid.chart(["AOA"], width=100)
+        fine = pyramid.chart(["AOA"], start=1000.0, end=1500.0, width=100)
+
+        assert fine.bucket_rows < coarse.bucket_rows
+        assert 99.0 in fine.channels["AOA"].max
+        assert fine.start == 1000.0
+        assert all(1000.0 <= time <= 1500.0 for time in fine.time)
+
+    def test_small_range_returns_raw_samples(self, pyramid: TelemetryPyramid) -> None:
+        chart = pyramid.chart(["AOA"], start=1234.0, end=1235.0, width=100)
+
+        assert chart.bucket_rows == 1
+        assert chart.time == pytest.approx([1234.0 + i * 0.1 for i in range(11)])
+        aoa = chart.channels["AOA"]
+        assert aoa.min == aoa.max == aoa.mean
+        assert aoa.max[5] == 99.0
+
+    def test_keeps_only_the_levels(self, pyramid: TelemetryPyramid) -> None:
+        assert pyramid._raw is None
+
+    def test_raw_samples_by_row(self) -> None:
+        frame = make_sortie_frame(_ROWS)
+        pyramid = TelemetryPyramid.build("rows", frame, lambda: frame)
+
+        chart = pyramid.chart(["AOA"], start=20_000.0, end=20_005.0)
+
+        assert chart.time == [20_000.0 + row for row in range(6)]
+        assert chart.channels["AOA"].max == (
+            frame.get_column("AOA").slice(20_000, 6).to_list()
+        )
+
+    def test_raw_samples_of_rows_out_of_time_order(self) -> None:
+        frame = make_sortie_frame(_ROWS).with_columns(TIME=pl.int_range(pl.len()) * 0.1)
+        shuffled = frame.sample(fraction=1.0, shuffle=True, seed=7)
+        pyramid = TelemetryPyramid.build("shuffled", shuffled, lambda: shuffled)
+
+        chart = pyramid.chart(["AOA"], start=1234.0, end=1235.0)
+
+        assert chart.time == pytest.approx([1234.0 + i * 0.1 for i in range(11)])
+        assert chart.channels["AOA"].max == (
+            frame.get_column("AOA").slice(12_340, 11).to_list()
+        )
+
+    def test_rejects_invalid_requests(self, pyramid: TelemetryPyramid) -> None:
+        with pytest.raises(InvalidChartRequestError, match="NOPE"):
+            pyramid.chart(["AOA", "NOPE"])
+        with pytest.raises(InvalidChartRequestError):
+            pyramid.chart([])
+        with pytest.raises(InvalidChartRequestError):
+            pyramid.chart(["AOA"], start=10.0, end=5.0)
+
+
+class TestPyramidCache:
+    def test_built_once_per_file_version(self, telemetry_csv: Path) -> None:
+        pyramid = telemetry_pyramid.telemetry_pyramid()
+        assert telemetry_pyramid.telemetry_pyramid() is pyramid
+        assert pyramid.time_basis == "row"
+
+        make_sortie_frame(900).write_csv(telemetry_csv)
+        stat = telemetry_csv.stat()
+        os.utime(telemetry_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        rebuilt = telemetry_pyramid.telemetry_pyramid()
+        assert rebuilt is not pyramid
+        assert telemetry_chart(["AOA"], width=1000).time[-1] == 899
+
+    def test_missing_file(self, telemetry_csv: Path) -> None:
+        telemetry_csv.unlink()
+
+        with pytest.raises(FileNotFoundError):
+            telemetry_chart(["AOA"])
@@ -0,0 +1,91 @@
+import math
+from collections import OrderedDict
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from backend.schemas import FlightContext, TelemetryConditions
+from backend.services import telemetry_similarity
+from backend.services.telemetry_similarity import (
+    WINDOW_ROWS,
+    InvalidSimilarityQueryError,
+    find_similar_segments,
+    flight_conditions,
+)
+from backend.testing import make_sortie_frame
+
+
+@pytest.fixture
+def windows_csv(telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Ten windows flown at a steady sideslip of 0°, 1°, ... 9°."""
+    window = pl.int_range(pl.len()) // WINDOW_ROWS
+    make_sortie_frame(10 * WINDOW_ROWS).with_columns(
+        AOSS=window.cast(pl.Float64)
+    ).write_csv(telemetry_csv)
+    monkeypatch.setattr(telemetry_similarity, "_INDEXES", OrderedDict())
+    return telemetry_csv
+
+
+class TestFindSimilarSegments:
+    def test_nearest_windows_first(self, windows_csv: Path) -> None:
+        result = find_similar_segments(TelemetryConditions(abs_aoss_deg=3.2), k=3)
+
+        assert result.time_basis == "row"
+        assert [segment.start for segment in result.segments] == [
+            3 * WINDOW_ROWS,
+            4 * WINDOW_ROWS,
+            2 * WINDOW_ROWS,
+        ]
+        nearest = result.segments[0]
+        assert nearest.end == 4 * WINDOW_ROWS - 1
+        assert nearest.conditions.abs_aoss_deg == 3.0
+        assert nearest.conditions.aoss_std_deg == 0.0
+        spread = pl.Series(range(10), dtype=pl.Float64).std()
+        assert nearest.distance == pytest.approx(0.2 / spread)
+
+    def test_unset_conditions_are_ignored(self, windows_csv: Path) -> None:
+        airspeed = TelemetryConditions(airspeed_kt=10.0)
+
+        result = find_similar_segments(airspeed, k=20)
+
+        # Only the ground windows taxi at 10 kt.
+        assert result.segments[0].ground_fraction == 1.0
+        assert result.segments[0].distance == 0.0
+        assert len(result.segments) == 10
+
+    def test_requires_a_condition(self, windows_csv: Path) -> None:
+        with pytest.raises(InvalidSimilarityQueryError):
+            find_similar_segments(TelemetryConditions())
+
+    def test_windows_do_not_span_sorties(self, telemetry_csv: Path) -> None:
+        make_sortie_frame(200).with_columns(
+            SORTIE_ID=pl.when(pl.int_range(pl.len()) < 100).then(1).otherwise(2)
+        ).write_csv(telemetry_csv)
+
+        result = find_similar_segments(TelemetryConditions(temperature_c=15), k=10)
+
+        assert sorted(
+            (segment.sortie, segment.start, segment.end) for segment in result.segments
+        ) == [
+            ("1", 0, 63),
+            ("1", 64, 99),
+            ("2", 100, 127),
+            ("2", 128, 191),
+            ("2", 192, 199),
+        ]
+
+
+def test_flight_conditions(flight_context: FlightContext) -> None:
+    context = flight_context.model_copy(
+        update={"max_crosswind_knots": 15, "gusts_knots": 0, "freezing_level_ft": None}
+    )
+
+    conditions = flight_conditions(context)
+
+    assert conditions.abs_aoss_deg == pytest.approx(math.degrees(math.atan(0.1)))
+    assert conditions.aoss_std_deg == 0.0
+    assert conditions.temperature_c is None
+    assert flight_conditions(
+        context.model_copy(update={"freezing_level_ft": 5000})
+    ).temperature_c == pytest.approx(9.9)
@@ -0,0 +1,581 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from backend.services import telemetry_tools
+from backend.services.telemetry_tools import (
+    analyze_performance,
+    analyze_weather_env,
+    analyze_weight_fuel,
+    analyze_wow,
+    sidecar_path,
+)
+from backend.testing import make_sortie_frame
+
+
+def _sidecars(csv: Path) -> list[Path]:
+    return sorted((csv.parent / ".telemetry-cache").glob("*.arrow"))
+
+
+def _analyze_all(engine=None) -> list:
+    return [
+        analyze_weather_env(engine),
+        analyze_weight_fuel(engine),
+        analyze_wow(engine),
+        analyze_performance(engine),
+    ]
+
+
+def _assert_summaries_match(actual: list, expected: list, rel=None) -> None:
+    for left, right in zip(actual, expected, strict=True):
+        assert type(left) is type(right)
+        _assert_close(left.model_dump(), right.model_dump(), rel=rel)
+
+
+def _assert_close(actual, expected, path: str = "", rel=None) -> None:
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys(), path
+        for name, value in expected.items():
+            _assert_close(actual[name], value, f"{path}.{name}", rel)
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), path
+        for index, (left, right) in enumerate(zip(actual, expected, strict=True)):
+            _assert_close(left, right, f"{path}[{index}]", rel)
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=rel, abs=rel), path
+    else:
+        assert actual == expected, path
+
+
+class TestSidecarCache:
+    def test_first_load_writes_sidecar(self, telemetry_csv: Path) -> None:
+        df = telemetry_tools._load_dataframe()
+
+        stat = telemetry_csv.stat()
+        sidecar = sidecar_path(telemetry_csv, (stat.st_size, stat.st_mtime_ns))
+        assert _sidecars(telemetry_csv) == [sidecar]
+        assert pl.read_ipc(sidecar).equals(df)
+
+    def test_later_loads_skip_csv_parsing(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        expected = _analyze_all()
+        # A fresh process: nothing cached in memory, the CSV must not be parsed.
+        monkeypatch.setattr(telemetry_tools, "_LOADED", OrderedDict())
+        monkeypatch.setattr(telemetry_tools, "_SUMMARIES", OrderedDict())
+
+        def no_csv(*args, **kwargs):
+            raise AssertionError("CSV parsed despite a valid sidecar")
+
+        monkeypatch.setattr(telemetry_tools.pl, "read_csv", no_csv)
+
+        assert _analyze_all() == expected
+
+    def test_changed_csv_replaces_sidecar(self, telemetry_csv: Path) -> None:
+        telemetry_tools._load_dataframe()
+        [old] = _sidecars(telemetry_csv)
+
+        frame = pl.read_csv(telemetry_csv).head(100)
+        frame.write_csv(telemetry_csv)
+        stat = telemetry_csv.stat()
+        os.utime(telemetry_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert telemetry_tools._load_dataframe().height == 100
+        [new] = _sidecars(telemetry_csv)
+        assert new != old
+
+    def test_unwritable_cache_dir_still_loads(
+        self,
+        telemetry_csv: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        blocker = tmp_path / "not-a-directory"
+        blocker.write_text("")
+        monkeypatch.setenv("TELEMETRY_CACHE_DIR", str(blocker / "cache"))
+
+        assert telemetry_tools._load_dataframe().height == 600
+
+    def test_shared_cache_dir_keeps_same_named_sorties_apart(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TELEMETRY_CACHE_DIR", str(tmp_path / "cache"))
+        first, second = tmp_path / "a" / "sortie1.csv", tmp_path / "b" / "sortie1.csv"
+        for path, rows in ((first, 60), (second, 90)):
+            path.parent.mkdir()
+            make_sortie_frame(rows).write_csv(path)
+        keys = [telemetry_tools._data_key(path) for path in (first, second)]
+
+        for path, key in zip((first, second), keys, strict=True):
+            telemetry_tools.load_sortie_file(path, key)
+
+        sidecars = [
+            sidecar_path(path, key[1:])
+            for path, key in zip((first, second), keys, strict=True)
+        ]
+        assert sidecars[0] != sidecars[1]
+        assert sorted((tmp_path / "cache").glob("*.arrow")) == sorted(sidecars)
+        assert [pl.read_ipc(sidecar).height for sidecar in sidecars] == [60, 90]
+
+    def test_corrupt_sidecar_is_rebuilt(self, telemetry_csv: Path) -> None:
+        telemetry_tools._load_dataframe()
+        [sidecar] = _sidecars(telemetry_csv)
+        sidecar.write_bytes(b"not arrow")
+        telemetry_tools._LOADED.clear()
+
+        assert telemetry_tools._load_dataframe().height == 600
+        assert pl.read_ipc(sidecar).height == 600
+
+    def test_missing_csv(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setattr(telemetry_tools, "DATA_PATH", tmp_path / "missing.csv")
+        monkeypatch.setattr(telemetry_tools, "_LOADED", OrderedDict())
+
+        with pytest.raises(FileNotFoundError):
+            telemetry_tools._load_dataframe()
+
+
+class TestLoadedSorties:
+    def _write(self, tmp_path: Path, name: str) -> Path:
+        path = tmp_path / f"{name}.csv"
+        make_sortie_frame().write_csv(path)
+        return path
+
+    def test_several_sorties_stay_loaded(
+        self, telemetry_csv: Path, tmp_path: Path
+    ) -> None:
+        first = telemetry_tools._load_sortie()
+        other = telemetry_tools._load_sortie(self._write(tmp_path, "other"))
+
+        assert telemetry_tools._load_sortie() is first
+        assert telemetry_tools._load_sortie(Path(other.key[0])) is other
+
+    def test_least_recent_sorties_leave_past_the_budget(
+        self, telemetry_csv: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        one_sortie = telemetry_tools._load_dataframe().estimated_size()
+        monkeypatch.setenv("TELEMETRY_LOADED_MB", str(2.5 * one_sortie / 2**20))
+        paths = [self._write(tmp_path, f"sortie{index}") for index in range(3)]
+
+        for path in paths:
+            telemetry_tools._load_dataframe(path)
+
+        assert list(telemetry_tools._LOADED) == [str(path) for path in paths[1:]]
+
+
+class TestStreamingEngine:
+    @pytest.mark.parametrize("with_sidecar", [False, True])
+    def test_matches_eager(self, telemetry_csv: Path, with_sidecar: bool) -> None:
+        if with_sidecar:
+            telemetry_tools._load_dataframe()
+            telemetry_tools._LOADED.clear()
+
+        streaming = _analyze_all("streaming")
+        telemetry_tools._SUMMARIES.clear()
+
+        _assert_summaries_match(streaming, _analyze_all("eager"))
+
+    def test_streaming_does_not_materialize_frame(self, telemetry_csv: Path) -> None:
+        _analyze_all("streaming")
+
+        assert not telemetry_tools._LOADED
+
+    def test_selected_by_environment(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TELEMETRY_ENGINE", "streaming")
+        monkeypatch.setenv("TELEMETRY_MEMORY_BUDGET_MB", "1")
+
+        summaries = _analyze_all()
+
+        assert not telemetry_tools._LOADED
+        telemetry_tools._SUMMARIES.clear()
+        _assert_summaries_match(summaries, _analyze_all("eager"))
+
+    def test_rejects_unknown_engine(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TELEMETRY_ENGINE", "gpu")
+
+        with pytest.raises(ValueError, match="TELEMETRY_ENGINE"):
+            analyze_wow()
+
+
+class TestSummaryCache:
+    def test_all_summaries_share_one_pass(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        passes = []
+        aggregate = telemetry_tools._aggregate_telemetry
+
+        def counting(engine, sources):
+            passes.append(engine)
+            return aggregate(engine, sources)
+
+        monkeypatch.setattr(telemetry_tools, "_aggregate_telemetry", counting)
+
+        first = _analyze_all()
+        second = _analyze_all("streaming")
+
+        assert passes == ["eager"]
+        assert second == first
+
+    def test_changed_csv_is_recomputed(self, telemetry_csv: Path) -> None:
+        assert analyze_wow().num_landing_like_transitions == 1
+
+        make_sortie_frame().head(300).write_csv(telemetry_csv)
+        stat = telemetry_csv.stat()
+        os.utime(telemetry_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        summary = analyze_wow()
+        assert summary.num_landing_like_transitions == 0
+        assert summary.ground_fraction == pytest.approx(100 / 300)
+
+    def test_callers_get_their_own_copy(self, telemetry_csv: Path) -> None:
+        analyze_weather_env().risk_notes.append("edited by a caller")
+
+        assert "edited by a caller" not in analyze_weather_env().risk_notes
+
+    def test_missing_csv(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setattr(telemetry_tools, "DATA_PATH", tmp_path / "missing.csv")
+
+        with pytest.raises(FileNotFoundError):
+            telemetry_tools.telemetry_summaries()
+
+
+class TestSingleFlight:
+    def test_concurrent_first_loads_share_one_parse(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        loads = []
+        load = telemetry_tools.load_sortie_file
+        all_waiting = threading.Barrier(8)
+
+        def counting(path, key):
+            loads.append(path)
+            return load(path, key)
+
+        def first_load(_):
+            all_waiting.wait()
+            return telemetry_tools._load_dataframe()
+
+        monkeypatch.setattr(telemetry_tools, "load_sortie_file", counting)
+        with ThreadPoolExecutor(8) as pool:
+            frames = list(pool.map(first_load, range(8)))
+
+        assert len(loads) == 1
+        assert all(frame is frames[0] for frame in frames)
+
+    def test_concurrent_first_summaries_share_one_pass(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        passes = []
+        aggregate = telemetry_tools._aggregate_telemetry
+        all_waiting = threading.Barrier(8)
+
+        def counting(engine, sources):
+            passes.append(engine)
+            return aggregate(engine, sources)
+
+        def first_summary(_):
+            all_waiting.wait()
+            return telemetry_tools.telemetry_summaries()
+
+        monkeypatch.setattr(telemetry_tools, "_aggregate_telemetry", counting)
+        with ThreadPoolExecutor(8) as pool:
+            summaries = list(pool.map(first_summary, range(8)))
+
+        assert passes == ["eager"]
+        assert all(summary is summaries[0] for summary in summaries)
+
+    def test_only_callers_of_the_same_key_wait(self) -> None:
+        flights = telemetry_tools.SingleFlight()
+
+        def enter(key: str) -> threading.Thread:
+            def run() -> None:
+                with flights(key):
+                    pass
+
+            thread = threading.Thread(target=run)
+            thread.start()
+            return thread
+
+        with flights("a"):
+            other_key, same_key = enter("b"), enter("a")
+            other_key.join(timeout=5)
+            same_key.join(timeout=0.1)
+            assert not other_key.is_alive()
+            assert same_key.is_alive()
+        same_key.join(timeout=5)
+
+        assert not same_key.is_alive()
+        assert flights._flights == {}
+
+
+def _write_lines(path: Path, frame: pl.DataFrame, start: int, end: int) -> None:
+    """Write bytes ``start:end`` of ``frame`` as CSV to ``path``, appending."""
+    with path.open("ab" if start else "wb") as file:
+        file.write(frame.write_csv().encode()[start:end])
+
+
+def _line_offset(frame: pl.DataFrame, rows: int) -> int:
+    """Byte offset of data row ``rows`` in ``frame`` written as CSV."""
+    return len(frame.head(rows).write_csv().encode())
+
+
+class TestTailFollowing:
+    def _reload_forbidden(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def no_reload(*args, **kwargs):
+            raise AssertionError("Whole file reloaded for appended rows")
+
+        monkeypatch.setattr(telemetry_tools, "load_sortie_file", no_reload)
+
+    def _fresh(self, path: Path) -> pl.DataFrame:
+        return pl.read_csv(path, **telemetry_tools._CSV_READ_KWARGS)
+
+    def test_appended_rows_are_parsed_on_their_own(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        frame = make_sortie_frame()
+        _write_lines(telemetry_csv, frame, 0, _line_offset(frame, 400))
+        assert telemetry_tools._load_dataframe().height == 400
+
+        self._reload_forbidden(monkeypatch)
+        _write_lines(telemetry_csv, frame, _line_offset(frame, 400), None)
+
+        assert telemetry_tools._load_dataframe().equals(self._fresh(telemetry_csv))
+
+    def test_row_being_written_is_parsed_again(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        frame = make_sortie_frame()
+        cut = _line_offset(frame, 400) + 10
+        _write_lines(telemetry_csv, frame, 0, cut)
+        assert telemetry_tools._load_dataframe().height == 401
+
+        self._reload_forbidden(monkeypatch)
+        _write_lines(telemetry_csv, frame, cut, cut + 20)
+        assert telemetry_tools._load_dataframe().height == 401
+        _write_lines(telemetry_csv, frame, cut + 20, None)
+
+        assert telemetry_tools._load_dataframe().equals(self._fresh(telemetry_csv))
+
+    def test_rewritten_file_is_reloaded(self, telemetry_csv: Path) -> None:
+        frame = make_sortie_frame()
+        _write_lines(telemetry_csv, frame, 0, _line_offset(frame, 400))
+        telemetry_tools._load_dataframe()
+
+        rewritten = frame.with_columns(pl.col("AOA") + 1)
+        rewritten.write_csv(telemetry_csv)
+
+        assert telemetry_tools._load_dataframe().equals(self._fresh(telemetry_csv))
+
+    def test_summaries_fold_in_appended_rows(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        frame = make_sortie_frame()
+        _write_lines(telemetry_csv, frame, 0, _line_offset(frame, 450))
+        _analyze_all()
+        reduced: list[int] = []
+        reduce_batch = telemetry_tools._reduce_batch
+
+        def counting(batch, *args):
+            reduced.append(batch.height)
+            return reduce_batch(batch, *args)
+
+        monkeypatch.setattr(telemetry_tools, "_reduce_batch", counting)
+        _write_lines(telemetry_csv, frame, _line_offset(frame, 450), None)
+
+        summaries = _analyze_all()
+
+        assert reduced == [150]
+        assert summaries[2].sorties[0].landing_times == [500.0]
+        telemetry_tools._LOADED.clear()
+        telemetry_tools._SUMMARIES.clear()
+        telemetry_tools._FILE_TOTALS.clear()
+        _assert_summaries_match(summaries, _analyze_all())
+
+
+class TestCompactLoadMode:
+    @pytest.fixture(autouse=True)
+    def compact(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TELEMETRY_LOAD_MODE", "compact")
+
+    def test_keeps_required_columns_downcast(self, telemetry_csv: Path) -> None:
+        make_sortie_frame().with_columns(
+            UNUSED=pl.lit(1.0), SORTIE_ID=pl.lit("a"), TIME=pl.int_range(600) * 0.5
+        ).write_csv(telemetry_csv)
+
+        schema = telemetry_tools._load_dataframe().schema
+
+        assert "UNUSED" not in schema
+        assert "ADC_AMBIENT_AIR_TEMP" not in schema
+        assert (schema["AOA"], schema["NOSE_WOW"], schema["EVENT"]) == (
+            pl.Float32,
+            pl.UInt8,
+            pl.Int8,
+        )
+        assert (schema["SORTIE_ID"], schema["TIME"]) == (pl.Categorical, pl.Float64)
+
+    def test_summaries_match_full_mode(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        compact = _analyze_all()
+        monkeypatch.setenv("TELEMETRY_LOAD_MODE", "full")
+        full = _analyze_all()
+
+        # Cached apart: the full summaries are not the compact ones.
+        assert len(telemetry_tools._SUMMARIES) == 2
+        assert full != compact
+        _assert_summaries_match(compact, full, rel=1e-5)
+
+    def test_reads_only_the_kept_columns(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        make_sortie_frame().with_columns(UNUSED=pl.lit("x")).write_csv(telemetry_csv)
+        scanned = []
+        scan = telemetry_tools._scan_telemetry
+
+        def recording(path):
+            lazy = scan(path)
+            scanned.append(lazy)
+            return lazy
+
+        def no_csv(*args, **kwargs):
+            raise AssertionError("whole CSV parsed")
+
+        monkeypatch.setattr(telemetry_tools, "_scan_telemetry", recording)
+        monkeypatch.setattr(telemetry_tools.pl, "read_csv", no_csv)
+
+        frame = telemetry_tools._load_dataframe()
+
+        assert "UNUSED" not in frame.columns
+        [lazy] = scanned
+        assert "UNUSED" in lazy.collect_schema()
+
+    def test_uses_less_memory_than_full_mode(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        compact = telemetry_tools.telemetry_memory_report()
+        monkeypatch.setenv("TELEMETRY_LOAD_MODE", "full")
+        full = telemetry_tools.telemetry_memory_report()
+
+        assert (compact.load_mode, full.load_mode) == ("compact", "full")
+        assert compact.file_columns == full.file_columns == len(full.columns)
+        assert compact.total_bytes * 2.5 < full.total_bytes
+
+    def test_appended_rows_are_compacted(self, telemetry_csv: Path) -> None:
+        frame = make_sortie_frame().with_columns(
+            EVENT=pl.when(pl.int_range(600) == 500).then(1000).otherwise(0)
+        )
+        _write_lines(telemetry_csv, frame, 0, _line_offset(frame, 400))
+        assert telemetry_tools._load_dataframe().schema["EVENT"] == pl.Int8
+
+        _write_lines(telemetry_csv, frame, _line_offset(frame, 400), None)
+        loaded = telemetry_tools._load_dataframe()
+
+        assert loaded.height == 600
+        assert loaded.schema["EVENT"] == pl.Int16
+        assert loaded.get_column("EVENT").max() == 1000
+
+    def test_rejects_unknown_mode(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TELEMETRY_LOAD_MODE", "tiny")
+
+        with pytest.raises(ValueError, match="TELEMETRY_LOAD_MODE"):
+            telemetry_tools._load_dataframe()
+
+
+class TestAnalyzers:
+    def test_wow_counts_one_sortie(self, telemetry_csv: Path) -> None:
+        summary = analyze_wow()
+
+        assert summary.num_takeoff_like_transitions == 1
+        assert summary.num_landing_like_transitions == 1
+        assert summary.ground_fraction == pytest.approx(200 / 600)
+
+    @pytest.mark.parametrize("engine", ["eager", "streaming"])
+    def test_wow_counts_touch_and_goes(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, engine: str
+    ) -> None:
+        pattern = [1, 1, 0, 0, 1, 0, 1, 1, 0, None, 0, 1]
+        path = tmp_path / "pattern.csv"
+        make_sortie_frame(len(pattern)).with_columns(
+            pl.Series("ADC_AIR_GND_WOW", pattern),
+            pl.lit(0).alias("LT_GEAR_WOW"),
+            pl.lit(0).alias("RT_GEAR_WOW"),
+            pl.lit(0).alias("NOSE_WOW"),
+        ).write_csv(path)
+        monkeypatch.setattr(telemetry_tools, "DATA_PATH", path)
+        monkeypatch.setattr(telemetry_tools, "_LOADED", OrderedDict())
+        monkeypatch.setattr(telemetry_tools, "_SUMMARIES", OrderedDict())
+        # Transitions that straddle streaming batches must still be counted.
+        monkeypatch.setattr(telemetry_tools, "_chunk_rows", lambda columns: 5)
+
+        summary = analyze_wow(engine)
+
+        assert summary.num_takeoff_like_transitions == 3
+        assert summary.num_landing_like_transitions == 3
+        assert summary.ground_fraction == pytest.approx(6 / 12)
+        assert summary.time_basis == "row"
+        [sortie] = summary.sorties
+        assert sortie.sortie == "pattern"
+        assert sortie.takeoff_times == [2, 5, 8]
+        assert sortie.landing_times == [4, 6, 11]
+        assert [(s.on_ground, s.start, s.end) for s in sortie.segments] == [
+            (True, 0, 1),
+            (False, 2, 3),
+            (True, 4, 4),
+            (False, 5, 5),
+            (True, 6, 7),
+            (False, 8, 10),
+            (True, 11, 11),
+        ]
+        assert sortie.ground_time == 6
+        assert sortie.airborne_time == 6
+
+    @pytest.mark.parametrize("engine", ["eager", "streaming"])
+    def test_wow_breaks_down_sorties(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, engine: str
+    ) -> None:
+        # Sortie A ends airborne (truncated recording), B is a full sortie.
+        sortie_a = (
+            make_sortie_frame(60)
+            .head(45)
+            .with_columns(
+                pl.lit("A").alias("SORTIE_ID"),
+                (pl.int_range(pl.len()) * 0.5).alias("TIME"),
+            )
+        )
+        sortie_b = make_sortie_frame(60).with_columns(
+            pl.lit("B").alias("SORTIE_ID"),
+            (1000 + pl.int_range(pl.len()) * 0.5).alias("TIME"),
+        )
+        path = tmp_path / "fleet.csv"
+        pl.concat([sortie_a, sortie_b]).write_csv(path)
+        monkeypatch.setattr(telemetry_tools, "DATA_PATH", path)
+        monkeypatch.setattr(telemetry_tools, "_LOADED", OrderedDict())
+        monkeypatch.setattr(telemetry_tools, "_SUMMARIES", OrderedDict())
+        monkeypatch.setattr(telemetry_tools, "_chunk_rows", lambda columns: 7)
+
+        summary = analyze_wow(engine)
+
+        # B starting on the ground is not a landing of A.
+        assert summary.num_takeoff_like_transitions == 2
+        assert summary.num_landing_like_transitions == 1
+        assert summary.time_basis == "TIME"
+        a, b = summary.sorties
+        assert (a.sortie, a.takeoff_times, a.landing_times) == ("A", [5.0], [])
+        assert (b.sortie, b.takeoff_times, b.landing_times) == ("B", [1005.0], [1025.0])
+        assert b.ground_time == pytest.approx(5 + 4.5)
+        assert b.airborne_time == pytest.approx(20)
+        assert b.ground_fraction == pytest.approx(20 / 60)
+        assert b.num_segments == len(b.segments) == 3
+
+    def test_performance_events(self, telemetry_csv: Path) -> None:
+        assert analyze_performance().event_values_present == [0, 1, 2]
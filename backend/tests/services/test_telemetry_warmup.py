@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+from backend.services import telemetry_tools
+from backend.services.telemetry_warmup import TelemetryWarmup, telemetry_is_warm
+
+
+class TestTelemetryWarmup:
+    async def test_background_warmup(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TELEMETRY_WARMUP", "background")
+        warmup = TelemetryWarmup()
+        assert warmup.state == "cold"
+
+        await warmup.start()
+        assert warmup.state == "warming"
+        await warmup._task
+
+        assert warmup.state == "warm"
+        assert telemetry_tools._LOADED
+        await warmup.stop()
+
+    async def test_blocking_warmup(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TELEMETRY_WARMUP", "blocking")
+        warmup = TelemetryWarmup()
+
+        await warmup.start()
+
+        assert warmup.state == "warm"
+        assert telemetry_is_warm()
+
+    async def test_off_by_default(
+        self, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv("TELEMETRY_WARMUP", raising=False)
+        warmup = TelemetryWarmup()
+
+        await warmup.start()
+
+        assert not warmup.running
+        assert warmup.state == "cold"
+
+    async def test_missing_data_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TELEMETRY_WARMUP", "blocking")
+        monkeypatch.setattr(telemetry_tools, "DATA_PATH", tmp_path / "missing.csv")
+        warmup = TelemetryWarmup()
+
+        await warmup.start()
+
+        assert warmup.state == "unavailable"
+
+    def test_rejects_unknown_mode(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TELEMETRY_WARMUP", "sometimes")
+
+        with pytest.raises(ValueError, match="TELEMETRY_WARMUP"):
+            TelemetryWarmup().start().send(None)
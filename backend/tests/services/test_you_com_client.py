@@ -0,0 +1,258 @@
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+import pytest
+
+from backend.schemas import FlightContext, RiskFactor, RiskResult
+from backend.services import you_com_client
+from backend.services.risk_engine import compute_risk
+from backend.services.you_com_client import (
+    SearchCache,
+    _build_query,
+    generate_you_com_explanation,
+)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Search:
+    """A fake You.com search returning ``[{"title": "<n>"}]`` on its n-th call."""
+
+    def __init__(self, delay_s: float = 0.0, error: str | None = None) -> None:
+        self.delay_s = delay_s
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self) -> list[dict]:
+        self.calls += 1
+        calls = self.calls
+        await asyncio.sleep(self.delay_s)
+        if self.error is not None:
+            raise RuntimeError(self.error)
+        return [{"title": str(calls)}]
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    monkeypatch.setenv("YOU_COM_CACHE_TTL_S", "60")
+    monkeypatch.setenv("YOU_COM_CACHE_STALE_S", "600")
+    monkeypatch.delenv("YOU_COM_CACHE_PATH", raising=False)
+    return Clock()
+
+
+@pytest.fixture
+def cache(clock: Clock) -> SearchCache:
+    return SearchCache(clock)
+
+
+class TestQueryNormalization:
+    def test_near_identical_flights_share_a_query(
+        self, flight_context: FlightContext
+    ) -> None:
+        risk = compute_risk(flight_context)
+        later = flight_context.model_copy(
+            update={
+                "departure_time_utc": flight_context.departure_time_utc
+                + timedelta(minutes=95),
+                "aircraft_type": " c-172 ",
+                "departure_icao": "kpao",
+            }
+        )
+
+        assert _build_query(later, risk) == _build_query(flight_context, risk)
+
+    def test_departures_in_other_time_buckets_do_not(
+        self, flight_context: FlightContext, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        risk = compute_risk(flight_context)
+        later = flight_context.model_copy(
+            update={
+                "departure_time_utc": flight_context.departure_time_utc
+                + timedelta(hours=1)
+            }
+        )
+        assert _build_query(later, risk) == _build_query(flight_context, risk)
+
+        monkeypatch.setenv("YOU_COM_QUERY_TIME_BUCKET_H", "1")
+        assert _build_query(later, risk) != _build_query(flight_context, risk)
+
+    def test_factor_order_and_exact_score_do_not_matter(
+        self, flight_context: FlightContext
+    ) -> None:
+        factors = [
+            RiskFactor(label="Gusty winds", impact=10),
+            RiskFactor(label="Night", impact=20),
+            RiskFactor(label="Icing", impact=15),
+            RiskFactor(label="Low time", impact=5),
+        ]
+        risk = RiskResult(
+            score=45, tier="CAUTION", factors=factors, ruleset_version="test"
+        )
+        reordered = RiskResult(
+            score=47, tier="CAUTION", factors=factors[::-1], ruleset_version="test"
+        )
+
+        query = _build_query(flight_context, risk)
+
+        assert query == _build_query(flight_context, reordered)
+        assert "Factors: Gusty winds, Icing, Night." in query
+        assert "C172" in query
+        assert "2025-01-01 18:00Z" in query
+
+
+class TestSearchCache:
+    async def test_fresh_results_are_served_from_the_cache(
+        self, cache: SearchCache
+    ) -> None:
+        search = Search()
+
+        first = await cache.get("query", search)
+        second = await cache.get("query", search)
+
+        assert first == second == [{"title": "1"}]
+        assert search.calls == 1
+        assert (cache.misses, cache.hits) == (1, 1)
+
+    async def test_stale_results_are_served_while_refreshing(
+        self, cache: SearchCache, clock: Clock
+    ) -> None:
+        search = Search(delay_s=0.05)
+        await cache.get("query", search)
+        clock.now += 61
+
+        stale = await cache.get("query", search)
+
+        assert stale == [{"title": "1"}]
+        assert cache.stale_hits == 1
+        await asyncio.sleep(0.1)
+        assert await cache.get("query", search) == [{"title": "2"}]
+        assert search.calls == 2
+
+    async def test_expired_results_are_searched_again(
+        self, cache: SearchCache, clock: Clock
+    ) -> None:
+        search = Search()
+        await cache.get("query", search)
+        clock.now += 661
+
+        assert await cache.get("query", search) == [{"title": "2"}]
+        assert cache.misses == 2
+
+    async def test_a_failed_refresh_keeps_the_stale_results(
+        self, cache: SearchCache, clock: Clock
+    ) -> None:
+        await cache.get("query", Search())
+        clock.now += 61
+
+        await cache.get("query", Search(error="upstream down"))
+        await asyncio.sleep(0.01)
+
+        assert await cache.get("query", Search(delay_s=1)) == [{"title": "1"}]
+        await cache.stop()
+
+    async def test_concurrent_misses_share_one_search(self, cache: SearchCache) -> None:
+        search = Search(delay_s=0.05)
+
+        results = await asyncio.gather(*(cache.get("query", search) for _ in range(5)))
+
+        assert search.calls == 1
+        assert all(result == [{"title": "1"}] for result in results)
+
+    async def test_least_recently_used_queries_are_evicted(
+        self, cache: SearchCache, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("YOU_COM_CACHE_SIZE", "2")
+        search = Search()
+        await cache.get("a", search)
+        await cache.get("b", search)
+        await cache.get("a", search)
+        await cache.get("c", search)
+
+        await cache.get("a", search)
+        assert search.calls == 3
+        await cache.get("b", search)
+        assert search.calls == 4
+
+    async def test_a_ttl_of_zero_disables_the_cache(
+        self, cache: SearchCache, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("YOU_COM_CACHE_TTL_S", "0")
+        search = Search()
+
+        await cache.get("query", search)
+        await cache.get("query", search)
+
+        assert search.calls == 2
+
+    async def test_persisted_results_survive_a_restart(
+        self, clock: Clock, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("YOU_COM_CACHE_PATH", str(tmp_path / "cache.json"))
+        await SearchCache(clock).get("query", Search())
+
+        restarted = SearchCache(clock)
+        search = Search()
+
+        assert await restarted.get("query", search) == [{"title": "1"}]
+        assert search.calls == 0
+
+    async def test_an_unreadable_cache_file_is_ignored(
+        self, cache: SearchCache, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        path = tmp_path / "cache.json"
+        path.write_text("{not json")
+        monkeypatch.setenv("YOU_COM_CACHE_PATH", str(path))
+
+        assert await cache.get("query", Search()) == [{"title": "1"}]
+
+    async def test_stop_cancels_background_refreshes(
+        self, cache: SearchCache, clock: Clock
+    ) -> None:
+        await cache.get("query", Search())
+        clock.now += 61
+        search = Search(delay_s=10)
+        await cache.get("query", search)
+        await asyncio.sleep(0)
+
+        await cache.stop()
+
+        assert search.calls == 1
+        assert await cache.get("query", Search()) == [{"title": "1"}]
+
+
+async def test_near_identical_evaluations_share_one_search(
+    flight_context: FlightContext, clock: Clock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    requests: list[httpx.URL] = []
+
+    async def request(method: str, url: str, **kwargs) -> httpx.Response:
+        requests.append(httpx.URL(url, params=kwargs["params"]))
+        return httpx.Response(
+            200,
+            json={"results": {"web": [{"title": "Personal minimums"}]}},
+            request=httpx.Request(method, url),
+        )
+
+    monkeypatch.setenv("YOU_COM_API_KEY", "test")
+    monkeypatch.setattr(you_com_client.YOU_COM_HTTP, "request", request)
+    monkeypatch.setattr(you_com_client, "YOU_COM_CACHE", SearchCache(clock))
+    later = flight_context.model_copy(
+        update={
+            "departure_time_utc": flight_context.departure_time_utc
+            + timedelta(minutes=20)
+        }
+    )
+
+    for context in (flight_context, later):
+        explanation = await generate_you_com_explanation(context, compute_risk(context))
+
+    assert len(requests) == 1
+    assert "Personal minimums" in explanation.explanation
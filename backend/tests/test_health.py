@@ -1,8 +1,38 @@
+from pathlib import Path
+
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 
+import backend
+from backend.services.telemetry_warmup import TelemetryWarmup, warm_telemetry
+
 
 def test_health_check(test_client: TestClient) -> None:
     response = test_client.get("/health")
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == {"status": "ok"}
+
+
+def test_ready_once_telemetry_is_warm(
+    test_client: TestClient, telemetry_csv: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(backend, "TELEMETRY_WARMUP", TelemetryWarmup())
+    warm_telemetry()
+
+    response = test_client.get("/ready")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": "ready", "telemetry": "warm"}
+
+
+def test_not_ready_while_warming(
+    test_client: TestClient, mocker, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    mocker.patch.object(TelemetryWarmup, "running", True)
+    monkeypatch.setattr(backend, "TELEMETRY_WARMUP", TelemetryWarmup())
+
+    response = test_client.get("/ready")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json() == {"status": "warming", "telemetry": "warming"}
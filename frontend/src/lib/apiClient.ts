@@ -38,16 +38,42 @@ export interface RiskResult {
   score: number;
   tier: RiskTier;
   factors: RiskFactor[];
+  ruleset_version: string;
 }
 
 export type AgentExplanationSource = "You.com" | "Gemini";
 export type AgentPreference = "auto" | "gemini" | "you_com";
 
+export type ExplanationCacheStatus = "miss" | "hit" | "shared";
+
+export interface ProviderAttempt {
+  provider: AgentExplanationSource;
+  outcome: "won" | "failed" | "cancelled";
+  duration_ms: number;
+  error?: string | null;
+}
+
 export interface AgentExplanation {
   explanation: string;
   recommendations: string[];
   telemetry_findings?: string[] | null;
   source: AgentExplanationSource;
+  attempts?: ProviderAttempt[] | null;
+  cache?: ExplanationCacheStatus | null;
+}
+
+export interface ExplanationProgress {
+  kind:
+    | "provider_started"
+    | "provider_failed"
+    | "text"
+    | "tool_call"
+    | "tool_result"
+    | "cached"
+    | "shared";
+  provider?: AgentExplanationSource | null;
+  text?: string | null;
+  tool?: string | null;
 }
 
 export interface FlightEvaluation {
@@ -55,9 +81,38 @@ export interface FlightEvaluation {
   explanation: AgentExplanation;
 }
 
+export type EvaluationJobStatus =
+  | "queued"
+  | "running"
+  | "done"
+  | "failed"
+  | "cancelled";
+
+export interface EvaluationJob {
+  id: string;
+  status: EvaluationJobStatus;
+  priority: number;
+  agent_source: AgentPreference;
+  created_at: string;
+  updated_at: string;
+  risk: RiskResult;
+  explanation?: AgentExplanation | null;
+  error?: string | null;
+  attempts: number;
+}
+
 export interface EvaluationHistoryPoint {
   timestamp: string;
   score: number;
+  tier?: RiskTier | null;
+  min_score?: number | null;
+  max_score?: number | null;
+  count?: number | null;
+}
+
+export interface EvaluationHistoryPage {
+  points: EvaluationHistoryPoint[];
+  next_cursor: string | null;
 }
 
 export interface FlightContext {
@@ -153,8 +208,100 @@ export async function evaluateFlight(
   return handleResponse<FlightEvaluation>(response);
 }
 
+export interface EvaluationStreamHandlers {
+  onRisk: (risk: RiskResult) => void;
+  onProgress?: (progress: ExplanationProgress) => void;
+}
+
+export async function streamFlightEvaluation(
+  context: FlightContext,
+  handlers: EvaluationStreamHandlers,
+  agentPreference: AgentPreference = "auto",
+): Promise<AgentExplanation> {
+  const apiBaseUrl = getApiBaseUrl().replace(/\/$/, "");
+  const url = new URL(`${apiBaseUrl}/api/should-you-fly/evaluate/stream`);
+  url.searchParams.set("agent_source", agentPreference);
+
+  const response = await fetch(url.toString(), {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      Accept: "text/event-stream",
+    },
+    body: JSON.stringify(context),
+  });
+  if (!response.ok || !response.body) {
+    return handleResponse<AgentExplanation>(response);
+  }
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    let end: number;
+    while ((end = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      const event = block.match(/^event: (.*)$/m)?.[1];
+      const data = JSON.parse(block.match(/^data: (.*)$/m)?.[1] ?? "null");
+      if (event === "risk") handlers.onRisk(data as RiskResult);
+      else if (event === "progress")
+        handlers.onProgress?.(data as ExplanationProgress);
+      else if (event === "explanation") return data as AgentExplanation;
+      else if (event === "error")
+        throw new ApiError(String(data.detail), response.status, data);
+    }
+  }
+  throw new ApiError("Evaluation stream ended early", response.status);
+}
+
+export async function submitFlightEvaluation(
+  context: FlightContext,
+  agentPreference: AgentPreference = "auto",
+  priority = 0,
+): Promise<EvaluationJob> {
+  const apiBaseUrl = getApiBaseUrl().replace(/\/$/, "");
+  const url = new URL(`${apiBaseUrl}/api/should-you-fly/evaluate`);
+  url.searchParams.set("agent_source", agentPreference);
+  url.searchParams.set("background", "true");
+  url.searchParams.set("priority", String(priority));
+
+  const response = await fetch(url.toString(), {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify(context),
+  });
+  return handleResponse<EvaluationJob>(response);
+}
+
+export async function getEvaluationJob(jobId: string): Promise<EvaluationJob> {
+  const apiBaseUrl = getApiBaseUrl().replace(/\/$/, "");
+  const response = await fetch(
+    `${apiBaseUrl}/api/should-you-fly/jobs/${jobId}`,
+  );
+  return handleResponse<EvaluationJob>(response);
+}
+
+export async function cancelEvaluationJob(
+  jobId: string,
+): Promise<EvaluationJob> {
+  const apiBaseUrl = getApiBaseUrl().replace(/\/$/, "");
+  const response = await fetch(
+    `${apiBaseUrl}/api/should-you-fly/jobs/${jobId}`,
+    {
+      method: "DELETE",
+    },
+  );
+  return handleResponse<EvaluationJob>(response);
+}
+
 export async function getEvaluationHistory(): Promise<EvaluationHistoryPoint[]> {
   const apiBaseUrl = getApiBaseUrl().replace(/\/$/, "");
   const response = await fetch(`${apiBaseUrl}/api/should-you-fly/history`);
-  return handleResponse<EvaluationHistoryPoint[]>(response);
+  const page = await handleResponse<EvaluationHistoryPage>(response);
+  return page.points;
 }